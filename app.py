@@ -1,14 +1,32 @@
 # app.py
+import importlib
+
 import streamlit as st
 
 from modulos.auth.login import login_screen
 from modulos.auth.rbac import get_user, clear_user
-from modulos.admin.panel import admin_panel
-from modulos.promotora.grupos import promotora_panel
-from modulos.directiva.panel import directiva_panel 
+from modulos.config.arranque import arrancar
+from modulos.config.resiliencia import BaseDatosNoDisponible, ConsultaExcedida
 
 st.set_page_config(page_title="SGI GAPC", layout="wide")
 
+# Conexiones, bcrypt y catálogos en segundo plano (una vez por proceso; si
+# se arrancó con "python -m modulos.config.arranque servir" ya está en curso)
+arrancar()
+
+# Panel de cada rol: (módulo, función). Se importa solo cuando ya se sabe
+# el rol, para que la pantalla de login no cargue los tres paneles.
+_PANELES = {
+    "ADMINISTRADOR": ("modulos.admin.panel", "admin_panel"),
+    "PROMOTORA": ("modulos.promotora.grupos", "promotora_panel"),
+    "DIRECTIVA": ("modulos.directiva.panel", "directiva_panel"),
+}
+
+
+def _cargar_panel(rol: str):
+    modulo, funcion = _PANELES[rol]
+    return getattr(importlib.import_module(modulo), funcion)
+
 
 def router():
     user = get_user()
@@ -29,15 +47,18 @@ def router():
 
     rol = (user.get("Rol") or "").upper().strip()
 
-    if rol == "ADMINISTRADOR":
-        admin_panel()
-    elif rol == "PROMOTORA":
-        promotora_panel()
-    elif rol == "DIRECTIVA":
-        directiva_panel()
+    if rol in _PANELES:
+        _cargar_panel(rol)()
     else:
         st.error(f"Rol desconocido: {rol}")
 
 
 if __name__ == "__main__":
-    router()
+    try:
+        router()
+    except BaseDatosNoDisponible as e:
+        # BD caída o breaker abierto: mensaje claro en vez de la traza
+        st.error(str(e))
+    except ConsultaExcedida as e:
+        # Consulta cancelada por tiempo (p. ej. cartera de un distrito enorme)
+        st.warning(str(e))
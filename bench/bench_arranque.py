@@ -0,0 +1,94 @@
+# bench/bench_arranque.py
+#
+# Mide el arranque en frío: cuánto tarda un intérprete nuevo en importar lo
+# que necesita cada pantalla (login, panel de cada rol, una sección pesada
+# de la directiva) y si con eso ya se cargó pandas.
+# Cada medición corre en un proceso aparte para que no se reutilicen
+# módulos ya importados; se informa la mediana de varias repeticiones.
+#
+# Uso (desde la raíz del repo):
+#   python -m bench.bench_arranque
+#   python -m bench.bench_arranque --repeticiones 10
+#   python -m bench.bench_arranque --detalle directiva   # -X importtime
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_OBJETIVOS = {
+    "login": ["modulos.auth.login", "modulos.auth.rbac", "modulos.config.resiliencia"],
+    "admin": ["modulos.admin.panel"],
+    "promotora": ["modulos.promotora.grupos"],
+    "directiva": ["modulos.directiva.panel"],
+    "directiva+prestamos": ["modulos.directiva.panel", "modulos.directiva.prestamos"],
+    "directiva+reportes": ["modulos.directiva.panel", "modulos.directiva.reportes"],
+    "solo pandas": ["pandas"],
+}
+
+_CODIGO = """
+import sys, time
+inicio = time.perf_counter()
+for modulo in {modulos!r}:
+    __import__(modulo)
+print(time.perf_counter() - inicio, int("pandas" in sys.modules), len(sys.modules))
+"""
+
+
+def _medir(modulos: list[str], repeticiones: int) -> tuple[float, bool, int]:
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", _CODIGO.format(modulos=modulos)],
+            cwd=_RAIZ,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        segundos, con_pandas, total = salida.stdout.split()
+        tiempos.append(float(segundos))
+    return statistics.median(tiempos), con_pandas == "1", int(total)
+
+
+def _detalle(modulos: list[str], cuantos: int = 20) -> None:
+    """Los imports más lentos (tiempo acumulado) según python -X importtime."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"for m in {modulos!r}: __import__(m)"],
+        cwd=_RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    filas = []
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        _, acumulado, nombre = (p.strip() for p in linea.split(":", 1)[1].split("|"))
+        if acumulado.isdigit():
+            filas.append((int(acumulado), nombre))
+    for acumulado, nombre in sorted(filas, reverse=True)[:cuantos]:
+        print(f"{acumulado / 1000:9.1f} ms  {nombre}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de import en frío por pantalla.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--detalle", choices=list(_OBJETIVOS.keys()))
+    args = parser.parse_args(argv)
+
+    if args.detalle:
+        _detalle(_OBJETIVOS[args.detalle])
+        return
+
+    for nombre, modulos in _OBJETIVOS.items():
+        segundos, con_pandas, total = _medir(modulos, args.repeticiones)
+        print(
+            f"{nombre:<22} {segundos * 1000:8.1f} ms  módulos={total:>5}  "
+            f"pandas={'sí' if con_pandas else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
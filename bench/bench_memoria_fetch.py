@@ -0,0 +1,61 @@
+# bench/bench_memoria_fetch.py
+#
+# Compara el pico de memoria de Python al leer una consulta grande con
+# fetch_all (lista de dicts), iter_rows (dict por fila, en streaming),
+# iter_lotes (tuplas por lotes, en streaming) y fetch_columnas (listas por
+# columna, con DECIMAL ya convertido a float).
+#
+# Uso (desde la raíz del repo):
+#   python -m bench.bench_memoria_fetch
+#   python -m bench.bench_memoria_fetch --sql "SELECT * FROM pagos_prestamo"
+import argparse
+import time
+import tracemalloc
+
+from modulos.config.conexion import fetch_all, fetch_columnas, iter_lotes, iter_rows
+
+_SQL_POR_DEFECTO = "SELECT * FROM ahorros_miembros"
+
+
+def _medir(nombre: str, consumir):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    filas = consumir()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<12} filas={filas:>9}  pico={pico / 1024 / 1024:8.2f} MiB  tiempo={segundos:6.2f} s")
+
+
+def _con_fetch_all(sql):
+    filas = fetch_all(sql)
+    return len(filas)
+
+
+def _con_iter_rows(sql):
+    return sum(1 for _ in iter_rows(sql))
+
+
+def _con_iter_lotes(sql):
+    return sum(len(filas) for _, filas in iter_lotes(sql))
+
+
+def _con_fetch_columnas(sql):
+    columnas = fetch_columnas(sql)
+    return len(next(iter(columnas.values()), []))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pico de memoria: fetch_all vs streaming.")
+    parser.add_argument("--sql", default=_SQL_POR_DEFECTO)
+    args = parser.parse_args(argv)
+
+    print(f"Consulta: {args.sql}")
+    _medir("fetch_all", lambda: _con_fetch_all(args.sql))
+    _medir("iter_rows", lambda: _con_iter_rows(args.sql))
+    _medir("iter_lotes", lambda: _con_iter_lotes(args.sql))
+    _medir("columnas", lambda: _con_fetch_columnas(args.sql))
+
+
+if __name__ == "__main__":
+    main()
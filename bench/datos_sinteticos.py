@@ -0,0 +1,293 @@
+# bench/datos_sinteticos.py
+#
+# Llena la base configurada (normalmente el SQLite local) con datos
+# sintéticos reproducibles: distritos, promotoras, grupos con reglamento,
+# directiva, miembros, reuniones, asistencia, multas, ahorros, préstamos
+# con su calendario de pagos y la caja de cada reunión.
+#
+# Uso (desde la raíz del repo):
+#   GAPC_DB_BACKEND=sqlite python -m bench.datos_sinteticos --grupos 50
+#
+# Usuarios creados (contraseña --clave, por defecto "gapc123"):
+#   administrador 000000000, promotoras 10000NNNd, directivas 20NNNNNNd
+#   (d = último dígito del número, ver _dui)
+import argparse
+import calendar
+import datetime as dt
+import random
+
+import bcrypt
+
+from modulos.config.conexion import insert_en_lote, transaccion
+from modulos.directiva.comun import CARGOS, SEXOS
+
+# Ids de rol del esquema (sql/esquema_sqlite.sql)
+_ROLES = {"ADMINISTRADOR": 1, "PROMOTORA": 2, "DIRECTIVA": 3}
+
+_NOMBRES = ["Ana", "María", "Rosa", "Carmen", "Juana", "Marta", "Elena", "Sofía",
+            "José", "Luis", "Pedro", "Carlos", "Miguel", "Jorge", "Mario", "Raúl"]
+_APELLIDOS = ["López", "Martínez", "Hernández", "García", "Pérez", "Ramírez",
+              "Flores", "Cruz", "Rivera", "Gómez", "Díaz", "Reyes"]
+# Los mismos valores que acepta el formulario de miembros: las primeras
+# socias ocupan la directiva (Presidenta, Secretaria, Tesorera) y el resto
+# son asociadas; la mayoría de socias de los grupos son mujeres.
+_CARGOS_DIRECTIVA = CARGOS[:3]
+_CARGO_SOCIA = CARGOS[-1]
+_PESOS_SEXO = [6, 2, 0]
+
+
+def _sumar_meses(fecha: dt.date, meses: int) -> dt.date:
+    year = fecha.year + (fecha.month - 1 + meses) // 12
+    month = (fecha.month - 1 + meses) % 12 + 1
+    day = min(fecha.day, calendar.monthrange(year, month)[1])
+    return dt.date(year, month, day)
+
+
+def _dui(numero: int) -> str:
+    # 9 dígitos sin guion, como los guarda la app (ver normalizar_dui)
+    return f"{numero:08d}{numero % 10}"
+
+
+class _Ids:
+    """Asigna Ids explícitos a partir del máximo actual de cada tabla."""
+
+    def __init__(self, cur):
+        self._cur = cur
+        self._siguiente: dict[str, int] = {}
+
+    def nuevo(self, tabla: str, columna: str) -> int:
+        if tabla not in self._siguiente:
+            self._cur.execute(f"SELECT COALESCE(MAX({columna}), 0) AS m FROM {tabla}")
+            self._siguiente[tabla] = int(self._cur.fetchone()["m"]) + 1
+        valor = self._siguiente[tabla]
+        self._siguiente[tabla] += 1
+        return valor
+
+
+def _generar_grupo(cur, ids: _Ids, rnd: random.Random, id_distrito: int, promotora: dict,
+                   n_grupo: int, miembros_por_grupo: int, n_reuniones: int, clave_hash: str):
+    filas = {t: [] for t in (
+        "Usuario", "directiva", "reglamento_grupo", "miembros", "reuniones_grupo",
+        "asistencia_miembro", "multas_miembro", "ahorros_miembros",
+        "prestamos_miembro", "pagos_prestamo", "caja_reunion",
+    )}
+
+    inicio = dt.date.today() - dt.timedelta(days=14 * n_reuniones)
+    id_grupo = ids.nuevo("grupos", "Id_grupo")
+    insert_en_lote(
+        cur, "grupos",
+        ["Id_grupo", "Nombre", "Id_distrito", "Estado", "Creado_en", "DUIs_promotoras", "Id_promotora"],
+        [(id_grupo, f"Grupo {n_grupo:04d}", id_distrito, "ACTIVO", inicio,
+          promotora["DUI"], promotora["Id_promotora"])],
+    )
+
+    multa = 0.25
+    ahorro_minimo = 1.0
+    tasa_mensual = 0.05
+    filas["reglamento_grupo"].append((
+        ids.nuevo("reglamento_grupo", "Id_reglamento"), id_grupo, f"Comunidad {n_grupo:04d}",
+        inicio, "Sábado", "15:00", "Casa comunal", "Quincenal", multa, ahorro_minimo,
+        "Hasta 3 veces el ahorro", inicio, _sumar_meses(inicio, 12), "Fondo social",
+        tasa_mensual * 10, 200.0, 6,
+    ))
+
+    # Directiva: un usuario DIRECTIVA por grupo
+    dui_dir = _dui(20_000_000 + id_grupo)
+    nombre_dir = f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}"
+    filas["Usuario"].append((ids.nuevo("Usuario", "Id_usuario"), nombre_dir, dui_dir,
+                             clave_hash, _ROLES["DIRECTIVA"]))
+    filas["directiva"].append((ids.nuevo("directiva", "Id_directiva"), nombre_dir, dui_dir,
+                               id_grupo, inicio))
+
+    miembros = []
+    for i in range(miembros_por_grupo):
+        mid = ids.nuevo("miembros", "Id_miembro")
+        cargo = _CARGOS_DIRECTIVA[i] if i < len(_CARGOS_DIRECTIVA) else _CARGO_SOCIA
+        nombre = f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}"
+        filas["miembros"].append((mid, id_grupo, nombre, _dui(30_000_000 + mid), cargo,
+                                  rnd.choices(SEXOS, weights=_PESOS_SEXO)[0]))
+        miembros.append(mid)
+
+    reuniones = []
+    for n in range(1, n_reuniones + 1):
+        rid = ids.nuevo("reuniones_grupo", "Id_reunion")
+        fecha = inicio + dt.timedelta(days=14 * (n - 1))
+        filas["reuniones_grupo"].append((rid, id_grupo, fecha, n, f"Reunión ordinaria {n}"))
+        reuniones.append((rid, fecha))
+
+    # Movimientos por fecha de reunión, para armar la caja al final
+    mov = {f: {"multas": 0.0, "ahorro": 0.0, "otras": 0.0, "retiros": 0.0,
+               "pagos": 0.0, "desembolsos": 0.0} for _, f in reuniones}
+    saldos = {mid: ahorro_minimo for mid in miembros}
+    hoy = dt.date.today()
+
+    for idx, (rid, fecha) in enumerate(reuniones):
+        for mid in miembros:
+            presente = rnd.random() < 0.9
+            filas["asistencia_miembro"].append(
+                (ids.nuevo("asistencia_miembro", "Id_asistencia"), rid, mid, int(presente))
+            )
+            if not presente:
+                # La multa se paga en la reunión siguiente (si la hay)
+                pagada = idx + 1 < len(reuniones) and rnd.random() < 0.8
+                fecha_pago = reuniones[idx + 1][1] if pagada else None
+                filas["multas_miembro"].append((ids.nuevo("multas_miembro", "Id_multa"),
+                                                id_grupo, mid, fecha, multa, int(pagada), fecha_pago))
+                if pagada:
+                    mov[fecha_pago]["multas"] += multa
+
+            ahorro = round(rnd.choice([0.0, 1.0, 2.0, 5.0]), 2) if presente else 0.0
+            otras = round(rnd.choice([0.0, 0.0, 0.5]), 2)
+            retiros = 1.0 if saldos[mid] > 10 and rnd.random() < 0.05 else 0.0
+            saldo_final = round(saldos[mid] + ahorro + otras - retiros, 2)
+            filas["ahorros_miembros"].append((
+                ids.nuevo("ahorros_miembros", "Id_ahorro"), id_grupo, rid, mid,
+                saldos[mid], ahorro, otras, retiros, saldo_final,
+            ))
+            saldos[mid] = saldo_final
+            mov[fecha]["ahorro"] += ahorro
+            mov[fecha]["otras"] += otras
+            mov[fecha]["retiros"] += retiros
+
+    # Préstamos: cuotas en las reuniones siguientes, con algunos atrasos
+    for mid in rnd.sample(miembros, k=max(1, len(miembros) // 3)):
+        idx = rnd.randrange(0, max(1, len(reuniones) - 2))
+        fecha_prestamo = reuniones[idx][1]
+        meses = rnd.choice([2, 3, 4, 6])
+        monto = float(rnd.choice([20, 30, 50, 75, 100]))
+        interes_total = round(monto * tasa_mensual * meses, 2)
+        total_pagar = round(monto + interes_total, 2)
+        cap_cuota = round(monto / meses, 2)
+        int_cuota = round(interes_total / meses, 2)
+        id_prestamo = ids.nuevo("prestamos_miembro", "Id_prestamo")
+        mov[fecha_prestamo]["desembolsos"] += monto
+
+        pagado = 0.0
+        ultimo_pago = None
+        vencidas = 0
+        for n in range(1, meses + 1):
+            fecha_cuota = reuniones[idx + 2 * n][1] if idx + 2 * n < len(reuniones) \
+                else _sumar_meses(fecha_prestamo, n)
+            paga = fecha_cuota in mov and rnd.random() < 0.85
+            cap_pag, int_pag = (cap_cuota, int_cuota) if paga else (0.0, 0.0)
+            filas["pagos_prestamo"].append((
+                ids.nuevo("pagos_prestamo", "Id_pago"), id_prestamo, n, fecha_cuota,
+                cap_cuota, int_cuota, cap_pag, int_pag,
+            ))
+            if paga:
+                pagado += cap_pag + int_pag
+                ultimo_pago = fecha_cuota
+                mov[fecha_cuota]["pagos"] += cap_pag + int_pag
+            elif fecha_cuota < hoy:
+                vencidas += 1
+
+        filas["prestamos_miembro"].append((
+            id_prestamo, id_grupo, mid, fecha_prestamo, reuniones[min(idx + 2, len(reuniones) - 1)][1],
+            meses, monto, tasa_mensual, monto, interes_total, total_pagar,
+            round(total_pagar - pagado, 2), vencidas, ultimo_pago,
+        ))
+
+    # Caja encadenada por reunión
+    saldo = 0.0
+    for rid, fecha in reuniones:
+        m = mov[fecha]
+        entradas = round(m["multas"] + m["ahorro"] + m["otras"] + m["pagos"], 2)
+        salidas = round(m["retiros"] + m["desembolsos"], 2)
+        cierre = round(saldo + entradas - salidas, 2)
+        filas["caja_reunion"].append((
+            ids.nuevo("caja_reunion", "Id_caja"), id_grupo, rid, saldo,
+            m["multas"], m["ahorro"], m["otras"], m["pagos"], 0.0, entradas,
+            m["retiros"], m["desembolsos"], 0.0, salidas, cierre,
+        ))
+        saldo = cierre
+
+    columnas = {
+        "Usuario": ["Id_usuario", "Nombre", "DUI", "Contraseña", "Id_rol"],
+        "directiva": ["Id_directiva", "Nombre", "DUI", "Id_grupo", "Creado_en"],
+        "reglamento_grupo": [
+            "Id_reglamento", "Id_grupo", "Nombre_comunidad", "Fecha_formacion", "Reunion_dia",
+            "Reunion_hora", "Reunion_lugar", "Reunion_frecuencia", "Monto_multa",
+            "Ahorro_minimo", "Condiciones_prestamo", "Fecha_inicio_ciclo", "Fecha_fin_ciclo",
+            "Meta_social", "Interes_por_10", "Prestamo_maximo", "Plazo_maximo_meses",
+        ],
+        "miembros": ["Id_miembro", "Id_grupo", "Nombre", "DUI", "Cargo", "Sexo"],
+        "reuniones_grupo": ["Id_reunion", "Id_grupo", "Fecha", "Numero_reunion", "Tema"],
+        "asistencia_miembro": ["Id_asistencia", "Id_reunion", "Id_miembro", "Presente"],
+        "multas_miembro": ["Id_multa", "Id_grupo", "Id_miembro", "Fecha_multa", "Monto",
+                           "Pagada", "Fecha_pago"],
+        "ahorros_miembros": ["Id_ahorro", "Id_grupo", "Id_reunion", "Id_miembro", "Saldo_inicial",
+                             "Ahorro", "Otras_actividades", "Retiros", "Saldo_final"],
+        "prestamos_miembro": [
+            "Id_prestamo", "Id_grupo", "Id_miembro", "Fecha_prestamo", "Fecha_primer_pago",
+            "Meses_plazo", "Monto", "Tasa_mensual", "Capital_total", "Interes_total",
+            "Total_pagar", "Saldo_pendiente", "Cuotas_vencidas", "Ultimo_pago",
+        ],
+        "pagos_prestamo": ["Id_pago", "Id_prestamo", "Numero_cuota", "Fecha_programada",
+                           "Capital_programado", "Interes_programado", "Capital_pagado",
+                           "Interes_pagado"],
+        "caja_reunion": [
+            "Id_caja", "Id_grupo", "Id_reunion", "Saldo_apertura", "Multas", "Ahorros",
+            "Otras_actividades", "Pagos_prestamos", "Otros_ingresos", "Total_entradas",
+            "Retiros_ahorros", "Desembolsos_prestamos", "Otros_gastos", "Total_salidas",
+            "Saldo_cierre",
+        ],
+    }
+    # Lotes de 500 filas para no pasar el límite de parámetros por sentencia
+    for tabla, lista in filas.items():
+        for i in range(0, len(lista), 500):
+            insert_en_lote(cur, tabla, columnas[tabla], lista[i:i + 500])
+
+
+def generar(distritos: int, grupos: int, miembros: int, reuniones: int,
+            clave: str = "gapc123", semilla: int = 42) -> None:
+    """Genera el conjunto completo en una sola transacción."""
+    rnd = random.Random(semilla)
+    clave_hash = bcrypt.hashpw(clave.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    with transaccion() as cur:
+        ids = _Ids(cur)
+
+        cur.execute("SELECT Id_usuario FROM Usuario WHERE DUI = %s", (_dui(0),))
+        if not cur.fetchall():
+            insert_en_lote(cur, "Usuario", ["Id_usuario", "Nombre", "DUI", "Contraseña", "Id_rol"],
+                           [(ids.nuevo("Usuario", "Id_usuario"), "Administración", _dui(0),
+                             clave_hash, _ROLES["ADMINISTRADOR"])])
+
+        n_grupo = 0
+        for d in range(distritos):
+            id_distrito = ids.nuevo("distritos", "Id_distrito")
+            insert_en_lote(cur, "distritos", ["Id_distrito", "Nombre"],
+                           [(id_distrito, f"Distrito {id_distrito}")])
+
+            id_promotora = ids.nuevo("promotora", "Id_promotora")
+            promotora = {"Id_promotora": id_promotora, "DUI": _dui(10_000_000 + id_promotora)}
+            nombre = f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}"
+            insert_en_lote(cur, "promotora", ["Id_promotora", "Nombre", "DUI"],
+                           [(id_promotora, nombre, promotora["DUI"])])
+            insert_en_lote(cur, "Usuario", ["Id_usuario", "Nombre", "DUI", "Contraseña", "Id_rol"],
+                           [(ids.nuevo("Usuario", "Id_usuario"), nombre, promotora["DUI"],
+                             clave_hash, _ROLES["PROMOTORA"])])
+
+            # Reparte los grupos entre los distritos
+            for _ in range(grupos // distritos + (1 if d < grupos % distritos else 0)):
+                n_grupo += 1
+                _generar_grupo(cur, ids, rnd, id_distrito, promotora, n_grupo,
+                               miembros, reuniones, clave_hash)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para pruebas de carga.")
+    parser.add_argument("--distritos", type=int, default=3)
+    parser.add_argument("--grupos", type=int, default=30, help="Total de grupos")
+    parser.add_argument("--miembros", type=int, default=25, help="Miembros por grupo")
+    parser.add_argument("--reuniones", type=int, default=24, help="Reuniones por grupo")
+    parser.add_argument("--clave", default="gapc123", help="Contraseña de los usuarios creados")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    generar(args.distritos, args.grupos, args.miembros, args.reuniones, args.clave, args.semilla)
+    print(f"Listo: {args.grupos} grupos en {args.distritos} distritos.")
+
+
+if __name__ == "__main__":
+    main()
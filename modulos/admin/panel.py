@@ -1,10 +1,21 @@
 # modulos/admin/panel.py
 
 import streamlit as st
-import pandas as pd  # 👈 Para armar los DataFrames de las gráficas
 
-from modulos.config.conexion import fetch_all, fetch_one, execute
+from modulos.config.consultas import uno, todos, ejecutar
+from modulos.config import catalogos
 from modulos.auth.rbac import require_auth, has_role
+from modulos.auth.perfil import invalidar_perfiles
+from modulos.config.resiliencia import ConsultaExcedida
+from modulos.reportes.ciclos import ciclo_actual, cierres_de_grupo
+from modulos.reportes.exportar import seccion_exportar
+from modulos.reportes.motor import reporte_caja
+from modulos.reportes.cartera import (
+    cartera_en_riesgo,
+    mostrar_cartera,
+    mostrar_cartera_por_grupo,
+    total_de_grupos,
+)
 
 
 # ==========================
@@ -16,6 +27,7 @@ def _obtener_ciclos_disponibles_para_grupo(id_grupo: int):
     Devuelve una lista de ciclos disponibles para el grupo, combinando:
     - Cierres de ciclo ya registrados en 'cierres_ciclo'
     - Ciclo actual definido en reglamento_grupo (si tiene fechas)
+    Los datos salen del catálogo de ciclos compartido (sin consultas por grupo).
     Cada elemento es:
     {
         "label": str,
@@ -27,22 +39,7 @@ def _obtener_ciclos_disponibles_para_grupo(id_grupo: int):
     ciclos = []
 
     # 1) Cierres de ciclo históricos
-    cierres = fetch_all(
-        """
-        SELECT 
-            Id_cierre,
-            Fecha_cierre,
-            Fecha_inicio_ciclo,
-            Fecha_fin_ciclo,
-            Total_ahorro_grupo
-        FROM cierres_ciclo
-        WHERE Id_grupo = %s
-        ORDER BY Fecha_fin_ciclo DESC, Fecha_cierre DESC
-        """,
-        (id_grupo,),
-    )
-
-    for c in cierres or []:
+    for c in cierres_de_grupo(id_grupo):
         fi = c["Fecha_inicio_ciclo"]
         ff = c["Fecha_fin_ciclo"]
         fc = c["Fecha_cierre"]
@@ -61,75 +58,28 @@ def _obtener_ciclos_disponibles_para_grupo(id_grupo: int):
         )
 
     # 2) Ciclo actual desde reglamento
-    reglamento = fetch_one(
-        """
-        SELECT Fecha_inicio_ciclo, Fecha_fin_ciclo
-        FROM reglamento_grupo
-        WHERE Id_grupo = %s
-        LIMIT 1
-        """,
-        (id_grupo,),
-    )
-    if reglamento:
-        fi = reglamento.get("Fecha_inicio_ciclo")
-        ff = reglamento.get("Fecha_fin_ciclo")
-        if fi and ff:
-            label = f"Ciclo actual (según reglamento): del {fi} al {ff}"
-            ciclos.append(
-                {
-                    "label": label,
-                    "fecha_inicio": fi,
-                    "fecha_fin": ff,
-                    "tipo": "actual",
-                }
-            )
+    actual = ciclo_actual(id_grupo)
+    if actual:
+        fi = actual["Fecha_inicio_ciclo"]
+        ff = actual["Fecha_fin_ciclo"]
+        label = f"Ciclo actual (según reglamento): del {fi} al {ff}"
+        ciclos.append(
+            {
+                "label": label,
+                "fecha_inicio": fi,
+                "fecha_fin": ff,
+                "tipo": "actual",
+            }
+        )
 
     return ciclos
 
 
-def _obtener_movimientos_caja_por_ciclo(id_grupo: int, fecha_ini, fecha_fin):
-    """
-    Devuelve las filas de caja_reunion del grupo, unidas a reuniones_grupo
-    para obtener la fecha de la reunión, filtradas entre fecha_ini y fecha_fin.
-    Cada fila incluye:
-      - Fecha
-      - Multas, Ahorros, Otras_actividades, Pagos_prestamos, Otros_ingresos
-      - Retiros_ahorros, Desembolsos_prestamos, Otros_gastos
-    """
-    filas = fetch_all(
-        """
-        SELECT 
-            rg.Fecha,
-            cr.Multas,
-            cr.Ahorros,
-            cr.Otras_actividades,
-            cr.Pagos_prestamos,
-            cr.Otros_ingresos,
-            cr.Retiros_ahorros,
-            cr.Desembolsos_prestamos,
-            cr.Otros_gastos
-        FROM caja_reunion cr
-        JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
-        WHERE cr.Id_grupo = %s
-          AND rg.Fecha BETWEEN %s AND %s
-        ORDER BY rg.Fecha ASC
-        """,
-        (id_grupo, fecha_ini, fecha_fin),
-    )
-    return filas or []
-
-
 def _seccion_reportes_admin():
     st.subheader("Reportes de grupos por distrito")
 
     # 1) Seleccionar distrito
-    distritos = fetch_all(
-        """
-        SELECT Id_distrito, Nombre
-        FROM distritos
-        ORDER BY Nombre ASC
-        """
-    )
+    distritos = catalogos.distritos()
     if not distritos:
         st.info("No hay distritos registrados. Primero crea distritos.")
         return
@@ -148,16 +98,18 @@ def _seccion_reportes_admin():
 
     id_distrito = dist_sel["Id_distrito"]
 
+    with st.expander("Cartera en riesgo del distrito"):
+        # Las consultas corren solo si se pide (el expander cerrado igual se ejecuta)
+        if st.checkbox("Calcular cartera en riesgo", key="cartera_admin_ver"):
+            por_grupo = cartera_en_riesgo("distrito", id_distrito, por_grupo=True)
+            mostrar_cartera(
+                total_de_grupos(por_grupo),
+                titulo=f"Cartera en riesgo — {dist_sel['Nombre']}",
+            )
+            mostrar_cartera_por_grupo(por_grupo)
+
     # 2) Seleccionar grupo dentro del distrito
-    grupos = fetch_all(
-        """
-        SELECT Id_grupo, Nombre
-        FROM grupos
-        WHERE Id_distrito = %s
-        ORDER BY Nombre ASC
-        """,
-        (id_distrito,),
-    )
+    grupos = todos("grupos_de_distrito", (id_distrito,))
 
     if not grupos:
         st.info(
@@ -215,60 +167,19 @@ def _seccion_reportes_admin():
         f"Mostrando información de caja para el periodo **{fi}** a **{ff}**."
     )
 
-    # 4) Obtener movimientos de caja para ese ciclo
-    movimientos = _obtener_movimientos_caja_por_ciclo(id_grupo, fi, ff)
-    if not movimientos:
+    # 4) Serie de caja del ciclo (ingresos, egresos y saldo acumulado ya calculados)
+    try:
+        df = reporte_caja(id_grupo, fi, ff)
+    except ConsultaExcedida as e:
+        st.warning(str(e))
+        return
+    if df.empty:
         st.info(
             "No se encontraron registros de caja para este grupo en el rango seleccionado. "
             "Verifica que la directiva haya registrado la caja en cada reunión."
         )
         return
 
-    # 5) Preparar datos para las gráficas
-    fechas = []
-    ingresos = []
-    egresos = []
-    saldos_acum = []
-
-    saldo_acumulado = 0.0
-
-    for fila in movimientos:
-        f = fila["Fecha"]
-        # Por si viene como datetime, lo convertimos a .date()
-        try:
-            fecha_simple = f.date() if hasattr(f, "date") else f
-        except Exception:
-            fecha_simple = f
-
-        multas = float(fila.get("Multas") or 0.0)
-        ahorros = float(fila.get("Ahorros") or 0.0)
-        otras_act = float(fila.get("Otras_actividades") or 0.0)
-        pagos_prest = float(fila.get("Pagos_prestamos") or 0.0)
-        otros_ing = float(fila.get("Otros_ingresos") or 0.0)
-
-        retiros = float(fila.get("Retiros_ahorros") or 0.0)
-        desembolsos = float(fila.get("Desembolsos_prestamos") or 0.0)
-        otros_gastos = float(fila.get("Otros_gastos") or 0.0)
-
-        ingreso = multas + ahorros + otras_act + pagos_prest + otros_ing
-        egreso = retiros + desembolsos + otros_gastos
-
-        saldo_acumulado += ingreso - egreso
-
-        fechas.append(fecha_simple)
-        ingresos.append(ingreso)
-        egresos.append(egreso)
-        saldos_acum.append(saldo_acumulado)
-
-    df = pd.DataFrame(
-        {
-            "Fecha": fechas,
-            "Ingresos": ingresos,
-            "Egresos": egresos,
-            "Saldo_acumulado": saldos_acum,
-        }
-    )
-
     st.markdown("### Gráfico de ingresos del grupo (por reunión en el ciclo)")
     st.line_chart(df, x="Fecha", y="Ingresos")
 
@@ -288,13 +199,7 @@ def _crud_distritos():
 
     # ------- Listado -------
     try:
-        distritos = fetch_all(
-            """
-            SELECT Id_distrito, Nombre
-            FROM distritos
-            ORDER BY Id_distrito ASC
-            """
-        )
+        distritos = catalogos.distritos_por_id()
     except Exception as e:
         st.error(
             "Error al consultar la tabla 'distritos'. "
@@ -322,10 +227,8 @@ def _crud_distritos():
             st.warning("Ingrese un nombre válido.")
         else:
             try:
-                execute(
-                    "INSERT INTO distritos (Nombre) VALUES (%s)",
-                    (nombre.strip(),),
-                )
+                ejecutar("distrito_crear", (nombre.strip(),))
+                catalogos.invalidar_catalogos()
                 st.success("Distrito creado correctamente.")
                 st.rerun()
             except Exception as e:
@@ -358,7 +261,8 @@ def _crud_distritos():
             st.warning("Debes marcar la casilla de confirmación.")
         else:
             try:
-                execute("DELETE FROM distritos WHERE Id_distrito = %s", (id_sel,))
+                ejecutar("distrito_eliminar", (id_sel,))
+                catalogos.invalidar_catalogos()
                 st.success("Distrito eliminado correctamente.")
                 st.rerun()
             except Exception as e:
@@ -375,18 +279,7 @@ def _sync_promotora_from_usuario(uid: int):
     Si el usuario tiene rol PROMOTORA, asegura que exista la fila
     correspondiente en la tabla 'promotora'.
     """
-    usuario = fetch_one(
-        """
-        SELECT u.Id_usuario,
-               u.Nombre,
-               u.DUI,
-               r.`Tipo de rol` AS RolNombre
-        FROM Usuario u
-        JOIN rol r ON r.Id_rol = u.Id_rol
-        WHERE u.Id_usuario = %s
-        """,
-        (uid,),
-    )
+    usuario = uno("usuario_con_rol", (uid,))
 
     if not usuario:
         return
@@ -397,18 +290,12 @@ def _sync_promotora_from_usuario(uid: int):
         return
 
     # ¿Ya existe en promotora?
-    existe = fetch_one(
-        "SELECT Id_promotora FROM promotora WHERE DUI = %s LIMIT 1",
-        (usuario["DUI"],),
-    )
+    existe = uno("promotora_por_dui", (usuario["DUI"],))
     if existe:
         return
 
     # Crear registro en promotora
-    execute(
-        "INSERT INTO promotora (Nombre, DUI) VALUES (%s, %s)",
-        (usuario["Nombre"], usuario["DUI"]),
-    )
+    ejecutar("promotora_crear", (usuario["Nombre"], usuario["DUI"]))
 
 
 # ==========================
@@ -419,18 +306,7 @@ def _crud_usuarios():
     st.subheader("Usuarios")
 
     # ------- Listado -------
-    usuarios = fetch_all(
-        """
-        SELECT u.Id_usuario,
-               u.Nombre,
-               u.DUI,
-               r.`Tipo de rol` AS Rol,
-               u.Id_rol
-        FROM Usuario u
-        JOIN rol r ON r.Id_rol = u.Id_rol
-        ORDER BY u.Id_usuario ASC
-        """
-    )
+    usuarios = todos("usuarios")
 
     st.write("### Lista de usuarios")
     if usuarios:
@@ -442,7 +318,7 @@ def _crud_usuarios():
     st.write("---")
     st.write("### Crear usuario")
 
-    roles = fetch_all("SELECT Id_rol, `Tipo de rol` FROM rol ORDER BY Id_rol")
+    roles = catalogos.roles()
     mapa_roles = {r["`Tipo de rol`"] if "`Tipo de rol`" in r else r["Tipo de rol"]: r["Id_rol"] for r in roles} if roles else {}
 
     # Normalizamos claves del diccionario para evitar problema del nombre del campo
@@ -472,17 +348,15 @@ def _crud_usuarios():
         else:
             id_rol = mapa_roles[rol_nombre]
             try:
-                uid = execute(
-                    """
-                    INSERT INTO Usuario (Nombre, DUI, Contraseña, Id_rol)
-                    VALUES (%s, %s, %s, %s)
-                    """,
+                uid = ejecutar(
+                    "usuario_crear",
                     (nombre.strip(), dui.strip(), contr.strip(), id_rol),
                     return_last_id=True,
                 )
 
                 # Si el usuario es PROMOTORA, lo sincronizamos en la tabla promotora
                 _sync_promotora_from_usuario(uid)
+                invalidar_perfiles()
 
                 st.success(f"Usuario creado correctamente (Id_usuario={uid}).")
                 st.rerun()
@@ -515,7 +389,8 @@ def _crud_usuarios():
             st.warning("Debes marcar la casilla de confirmación.")
         else:
             try:
-                execute("DELETE FROM Usuario WHERE Id_usuario = %s", (uid_sel,))
+                ejecutar("usuario_eliminar", (uid_sel,))
+                invalidar_perfiles()
                 st.success("Usuario eliminado.")
                 st.rerun()
             except Exception as e:
@@ -532,7 +407,7 @@ def _crud_usuarios():
 def admin_panel():
     st.title("Panel de Administración — SGI GAPC")
 
-    pestañas = st.tabs(["Distritos", "Usuarios", "Reportes"])
+    pestañas = st.tabs(["Distritos", "Usuarios", "Reportes", "Exportar"])
 
     with pestañas[0]:
         _crud_distritos()
@@ -542,3 +417,6 @@ def admin_panel():
 
     with pestañas[2]:
         _seccion_reportes_admin()
+
+    with pestañas[3]:
+        seccion_exportar()
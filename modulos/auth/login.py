@@ -3,6 +3,7 @@ import streamlit as st
 import bcrypt
 from modulos.config.conexion import fetch_one
 from modulos.auth.rbac import set_user
+from modulos.auth.perfil import resolver_perfil
 
 
 def _check_password(plain: str, hashed_or_plain_from_db: str) -> bool:
@@ -49,13 +50,15 @@ def login_screen():
             return
 
         # Guardamos lo que necesitamos en sesión
-        set_user({
+        info = {
             "Id_usuario": user["Id_usuario"],
             "Nombre": user["Nombre"],
             "DUI": user["DUI"],
             "id_rol": user["Id_rol"],
             "Rol": (user["RolNombre"] or "").upper().strip(),  # ADMINISTRADOR / PROMOTORA / DIRECTIVA
-        })
+        }
+        # Perfil del rol (promotora / directiva) resuelto una sola vez por sesión
+        set_user(info, perfil=resolver_perfil(info))
 
         st.success("Ingreso exitoso.")
         st.rerun()
@@ -0,0 +1,69 @@
+# modulos/auth/perfil.py
+from modulos.config.consultas import uno, todos
+from modulos.config.cache import invalidar, sello_vigente
+from modulos.auth.rbac import get_user, set_user, ETIQUETA_PERFILES
+
+# Respaldo por si otro servidor cambió los datos (las versiones son por proceso)
+_PERFIL_TTL_SEG = 300
+
+
+def invalidar_perfiles() -> None:
+    """
+    Obliga a volver a resolver el perfil en todas las sesiones.
+    Se llama al crear/eliminar usuarios, directivas o grupos.
+    """
+    invalidar(ETIQUETA_PERFILES)
+
+
+def resolver_perfil(user: dict) -> dict | None:
+    """
+    Consulta la fila propia del rol del usuario:
+    - PROMOTORA: fila de 'promotora' (Id_promotora, Nombre, DUI)
+    - DIRECTIVA: todas sus filas de 'directiva' (una por grupo que dirige),
+      en la clave 'Grupos' con Id_directiva, Id_grupo y Nombre_grupo
+    Para otros roles devuelve None.
+    """
+    rol = (user.get("Rol") or "").upper().strip()
+    dui = (user.get("DUI") or "").strip()
+    if not dui:
+        return None
+
+    if rol == "PROMOTORA":
+        return uno("promotora_por_dui", (dui,))
+
+    if rol == "DIRECTIVA":
+        filas = todos("directivas_por_dui", (dui,))
+        if not filas:
+            return None
+        return {
+            "Nombre": filas[0]["Nombre"],
+            "DUI": filas[0]["DUI"],
+            "Grupos": [
+                {
+                    "Id_directiva": f["Id_directiva"],
+                    "Id_grupo": f["Id_grupo"],
+                    "Nombre_grupo": f["Nombre_grupo"],
+                }
+                for f in filas
+            ],
+        }
+
+    return None
+
+
+def perfil_actual() -> dict | None:
+    """
+    Devuelve el perfil guardado en sesión si su sello sigue vigente.
+    Si fue invalidado (o nunca se resolvió) lo vuelve a consultar y lo guarda.
+    """
+    user = get_user()
+    if not user:
+        return None
+
+    perfil = user.get("Perfil")
+    if perfil is not None and sello_vigente(user.get("Perfil_sello"), _PERFIL_TTL_SEG):
+        return perfil
+
+    perfil = resolver_perfil(user)
+    set_user(user, perfil=perfil)
+    return perfil
@@ -1,9 +1,14 @@
 # modulos/auth/rbac.py
 import streamlit as st
 
+from modulos.config.cache import sello
+
 # Clave única donde guardamos el usuario en la sesión de Streamlit
 _SESSION_KEY = "user"
 
+# Etiqueta de cache que se invalida cuando cambian los datos del perfil
+ETIQUETA_PERFILES = "perfiles"
+
 
 # ========== Sesión ==========
 def get_user() -> dict | None:
@@ -11,8 +16,19 @@ def get_user() -> dict | None:
     return st.session_state.get(_SESSION_KEY)
 
 
-def set_user(info: dict) -> None:
-    """Guarda/actualiza el usuario en la sesión."""
+def set_user(info: dict, perfil: dict | None = None) -> None:
+    """
+    Guarda/actualiza el usuario en la sesión.
+    Si se pasa 'perfil' (fila de promotora/directiva), se guarda junto con
+    un sello de versión para no volver a consultarlo en cada rerun.
+    """
+    info = dict(info)
+    if perfil is not None:
+        info["Perfil"] = perfil
+        info["Perfil_sello"] = sello(ETIQUETA_PERFILES)
+    else:
+        info.pop("Perfil", None)
+        info.pop("Perfil_sello", None)
     st.session_state[_SESSION_KEY] = info
 
 
@@ -0,0 +1,257 @@
+# modulos/config/arranque.py
+#
+# Calentamiento del servidor al arrancar. Tras un deploy, los primeros
+# usuarios de cada proceso pagaban la conexión TCP/TLS con MySQL, la
+# primera verificación bcrypt y las consultas de catálogos en frío.
+# calentar() hace todo eso antes de recibir tráfico:
+#   1. conexiones: abre GAPC_ARRANQUE_CONEXIONES conexiones del pool (y de
+#      la réplica, si hay) y comprueba cada una con SELECT 1
+#   2. bcrypt:     carga la librería y hace una verificación de prueba
+#   3. catalogos:  carga distritos, roles y el catálogo de ciclos en la
+#      cache compartida
+# El resultado (listo, tiempos por paso, error) queda en
+# metricas.estados()["arranque"], en metricas.resumen()["arranque.<paso>"]
+# y en un archivo JSON (GAPC_ARRANQUE_ARCHIVO) que lee el health-check.
+#
+# Uso (desde la raíz del repo):
+#   python -m modulos.config.arranque servir [opciones de streamlit]
+#       calienta en segundo plano y arranca Streamlit en el mismo proceso
+#   python -m modulos.config.arranque esperar --timeout 120
+#       health-check: termina con 0 cuando el servidor está listo, 1 si no
+#   python -m modulos.config.arranque
+#       calienta en este proceso e imprime los tiempos (prueba de conexión)
+# Con "streamlit run app.py" el calentamiento empieza en la primera visita.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from modulos.config.metricas import fijar_estado, registrar
+
+CONEXIONES = int(os.getenv("GAPC_ARRANQUE_CONEXIONES", "4"))
+ARCHIVO_ESTADO = os.getenv(
+    "GAPC_ARRANQUE_ARCHIVO", os.path.join(tempfile.gettempdir(), "gapc_arranque.json")
+)
+
+_lock = threading.Lock()
+_hilo: threading.Thread | None = None
+_estado = {"listo": False, "terminado": False, "error": None, "pasos": {}}
+
+
+# -------------------------------------------------------------------
+# PASOS
+# -------------------------------------------------------------------
+def _probar(cnx) -> None:
+    cur = cnx.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchall()
+    finally:
+        cur.close()
+
+
+def _paso_conexiones(cantidad: int) -> None:
+    """
+    Abre 'cantidad' conexiones a la vez (sin pasar del tamaño del pool) para
+    que queden establecidas y comprobadas; al cerrarlas vuelven al pool.
+    """
+    from modulos.config.conexion import _POOL_TAMANO, _cerrar, _conectar, _hay_replica
+
+    destinos = [False, True] if _hay_replica() else [False]
+    for replica in destinos:
+        conexiones = []
+        try:
+            for _ in range(max(1, min(cantidad, _POOL_TAMANO))):
+                conexiones.append(_conectar(replica=replica))
+            for cnx in conexiones:
+                _probar(cnx)
+        finally:
+            for cnx in conexiones:
+                _cerrar(cnx)
+
+
+def _paso_bcrypt() -> None:
+    import bcrypt
+
+    # Costo mínimo: lo que se quiere es cargar la librería, no medir el hash
+    prueba = bcrypt.hashpw(b"gapc", bcrypt.gensalt(rounds=4))
+    bcrypt.checkpw(b"gapc", prueba)
+
+
+def _paso_catalogos() -> None:
+    from modulos.config import catalogos
+    from modulos.reportes.ciclos import catalogo_ciclos
+
+    catalogos.distritos()
+    catalogos.roles()
+    catalogo_ciclos()
+
+
+# -------------------------------------------------------------------
+# ESTADO
+# -------------------------------------------------------------------
+def _guardar_estado(archivo: str | None) -> None:
+    """Escribe el estado en el archivo del health-check (reemplazo atómico)."""
+    if not archivo:
+        return
+    with _lock:
+        datos = {**_estado, "pasos": dict(_estado["pasos"]), "pid": os.getpid()}
+    temporal = f"{archivo}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f)
+        os.replace(temporal, archivo)
+    except OSError:
+        # Sin archivo el servidor funciona igual; solo el health-check no lo verá
+        pass
+
+
+def estado_arranque() -> dict:
+    """Copia del estado: listo, terminado, error y milisegundos por paso."""
+    with _lock:
+        return {**_estado, "pasos": dict(_estado["pasos"])}
+
+
+def calentar(conexiones: int | None = None, archivo: str | None = ARCHIVO_ESTADO) -> dict:
+    """
+    Ejecuta los pasos de calentamiento en orden y devuelve estado_arranque().
+    Si un paso falla se siguen los demás, pero el proceso no queda "listo".
+    """
+    with _lock:
+        _estado.update(listo=False, terminado=False, error=None, pasos={})
+    fijar_estado("arranque", "calentando")
+    _guardar_estado(archivo)
+
+    pasos = {
+        "conexiones": lambda: _paso_conexiones(CONEXIONES if conexiones is None else conexiones),
+        "bcrypt": _paso_bcrypt,
+        "catalogos": _paso_catalogos,
+    }
+    errores = []
+    for nombre, paso in pasos.items():
+        inicio = time.perf_counter()
+        fallo = False
+        try:
+            paso()
+        except Exception as e:
+            fallo = True
+            errores.append(f"{nombre}: {e}")
+        segundos = time.perf_counter() - inicio
+        registrar(f"arranque.{nombre}", segundos, error=fallo)
+        with _lock:
+            _estado["pasos"][nombre] = round(segundos * 1000, 1)
+
+    with _lock:
+        _estado.update(listo=not errores, terminado=True, error="; ".join(errores) or None)
+    fijar_estado("arranque", "listo" if not errores else "error")
+    _guardar_estado(archivo)
+    return estado_arranque()
+
+
+def arrancar(conexiones: int | None = None) -> None:
+    """
+    Lanza calentar() en un hilo de fondo, una sola vez por proceso.
+    Seguro de llamar en cada ejecución del script de Streamlit.
+    """
+    global _hilo
+    with _lock:
+        if _hilo is not None:
+            return
+        _hilo = threading.Thread(
+            target=calentar, args=(conexiones,), name="gapc-arranque", daemon=True
+        )
+    _hilo.start()
+
+
+# -------------------------------------------------------------------
+# HEALTH-CHECK
+# -------------------------------------------------------------------
+def _proceso_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _leer_estado(archivo: str) -> dict | None:
+    try:
+        with open(archivo, encoding="utf-8") as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Un archivo de un proceso que ya terminó (deploy anterior) no cuenta
+    pid = datos.get("pid")
+    if not isinstance(pid, int) or pid <= 0 or not _proceso_vivo(pid):
+        return None
+    return datos
+
+
+def esperar(timeout: float = 120.0, archivo: str = ARCHIVO_ESTADO, intervalo: float = 0.5) -> dict | None:
+    """
+    Espera a que el servidor termine de calentar. Devuelve su estado (con
+    listo True o False) o None si no terminó dentro de 'timeout' segundos.
+    """
+    limite = time.monotonic() + timeout
+    while True:
+        datos = _leer_estado(archivo)
+        if datos and datos.get("terminado"):
+            return datos
+        if time.monotonic() >= limite:
+            return None
+        time.sleep(intervalo)
+
+
+def _imprimir(datos: dict) -> None:
+    for nombre, ms in datos["pasos"].items():
+        print(f"{nombre:<12} {ms:9.1f} ms")
+    print("listo" if datos["listo"] else f"error: {datos['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calentamiento y health-check del servidor.")
+    sub = parser.add_subparsers(dest="comando")
+    p_esperar = sub.add_parser("esperar", help="espera a que el servidor esté listo")
+    p_esperar.add_argument("--timeout", type=float, default=120.0)
+    p_esperar.add_argument("--archivo", default=ARCHIVO_ESTADO)
+    # Lo que sigue a "servir" pasa tal cual a streamlit (--server.port, ...)
+    sub.add_parser("servir", help="calienta y arranca streamlit run app.py")
+    parser.add_argument("--conexiones", type=int, default=None)
+    args, opciones = parser.parse_known_args(argv)
+    if opciones and args.comando != "servir":
+        parser.error(f"argumentos no reconocidos: {' '.join(opciones)}")
+
+    if args.comando == "esperar":
+        datos = esperar(args.timeout, args.archivo)
+        if datos is None:
+            print(f"el servidor no terminó de calentar en {args.timeout:g} s")
+            sys.exit(1)
+        _imprimir(datos)
+        sys.exit(0 if datos["listo"] else 1)
+
+    if args.comando == "servir":
+        from streamlit.web import cli as stcli
+
+        # Con "python -m" este archivo corre como __main__: el hilo se lanza
+        # desde el módulo importado, el mismo que usará app.py
+        from modulos.config import arranque
+
+        arranque.arrancar(args.conexiones)
+        raiz = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        sys.argv = ["streamlit", "run", os.path.join(raiz, "app.py"), *opciones]
+        stcli.main()
+        return
+
+    # Sin comando: calentar aquí mismo (no escribe el archivo del servidor)
+    datos = calentar(args.conexiones, archivo=None)
+    _imprimir(datos)
+    sys.exit(0 if datos["listo"] else 1)
+
+
+if __name__ == "__main__":
+    main()
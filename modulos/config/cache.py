@@ -0,0 +1,135 @@
+# modulos/config/cache.py
+import threading
+import time
+
+import streamlit as st
+
+# -------------------------------------------------------------------
+# VERSIONES POR ETIQUETA
+# Cada escritura que cambia datos cacheados "sube" la versión de sus
+# etiquetas. Lo guardado con una versión anterior deja de ser válido.
+# Las versiones viven en memoria del proceso, así que una sesión ve al
+# instante lo que invalida otra sesión del mismo servidor.
+# -------------------------------------------------------------------
+_lock = threading.Lock()
+_versiones: dict[str, int] = {}
+# Momento (time.monotonic) de la última invalidación de cada etiqueta
+_invalidado_en: dict[str, float] = {}
+
+
+def version(*etiquetas: str) -> tuple[int, ...]:
+    """Devuelve la versión actual de cada etiqueta (0 si nunca se invalidó)."""
+    with _lock:
+        return tuple(_versiones.get(e, 0) for e in etiquetas)
+
+
+def invalidar(*etiquetas: str) -> None:
+    """Marca como obsoleto todo lo cacheado bajo estas etiquetas."""
+    ahora = time.monotonic()
+    with _lock:
+        for e in etiquetas:
+            _versiones[e] = _versiones.get(e, 0) + 1
+            _invalidado_en[e] = ahora
+
+
+def usar_replica(*etiquetas: str) -> bool:
+    """
+    False si alguna etiqueta se invalidó hace menos de lo que la réplica
+    puede estar atrasada (REPLICA_MAX_RETRASO_SEG): la réplica podría no
+    tener todavía esa escritura, y lo leído de ella quedaría cacheado con la
+    versión nueva. En ese caso hay que recargar desde la primaria.
+    """
+    from modulos.config.conexion import REPLICA_MAX_RETRASO_SEG
+
+    ahora = time.monotonic()
+    with _lock:
+        return all(
+            ahora - _invalidado_en[e] > REPLICA_MAX_RETRASO_SEG
+            for e in etiquetas
+            if e in _invalidado_en
+        )
+
+
+def sello(*etiquetas: str) -> dict:
+    """Sello de versión para guardar junto a un valor cacheado."""
+    return {
+        "etiquetas": etiquetas,
+        "versiones": version(*etiquetas),
+        "creado": time.time(),
+    }
+
+
+def sello_vigente(s: dict | None, ttl: float | None = None) -> bool:
+    """
+    True si el sello sigue vigente: ninguna de sus etiquetas fue invalidada
+    y (si se indica ttl en segundos) todavía no ha expirado.
+    """
+    if not s:
+        return False
+    if version(*s["etiquetas"]) != s["versiones"]:
+        return False
+    if ttl is not None and time.time() - s["creado"] > ttl:
+        return False
+    return True
+
+
+# -------------------------------------------------------------------
+# CACHE POR SESIÓN (st.session_state)
+# -------------------------------------------------------------------
+_SESSION_KEY = "_cache"
+_FALTA = object()
+
+
+def obtener_sesion(clave: str, ttl: float | None = None, default=None):
+    """Devuelve el valor cacheado en la sesión o default si no existe o caducó."""
+    entrada = st.session_state.get(_SESSION_KEY, {}).get(clave)
+    if entrada and sello_vigente(entrada["sello"], ttl):
+        return entrada["valor"]
+    return default
+
+
+def guardar_sesion(clave: str, valor, *etiquetas: str) -> None:
+    """Guarda un valor en la cache de la sesión, sellado con sus etiquetas."""
+    st.session_state.setdefault(_SESSION_KEY, {})[clave] = {
+        "valor": valor,
+        "sello": sello(*etiquetas),
+    }
+
+
+def memo_sesion(clave: str, etiquetas: tuple[str, ...], cargar, ttl: float | None = None):
+    """
+    Devuelve el valor cacheado en la sesión; si no hay uno vigente,
+    llama a cargar(), lo guarda y lo devuelve.
+    """
+    valor = obtener_sesion(clave, ttl, default=_FALTA)
+    if valor is _FALTA:
+        valor = cargar()
+        guardar_sesion(clave, valor, *etiquetas)
+    return valor
+
+
+# -------------------------------------------------------------------
+# CACHE COMPARTIDA (todo el proceso, todas las sesiones)
+# Para datos de referencia o catálogos que sirven a todos los usuarios.
+# Los valores devueltos se comparten: no deben modificarse.
+# -------------------------------------------------------------------
+_compartida: dict[str, dict] = {}
+
+
+def memo_compartido(clave: str, etiquetas: tuple[str, ...], cargar, ttl: float | None = None):
+    """
+    Igual que memo_sesion, pero el valor se comparte entre todas las sesiones
+    del proceso.
+    """
+    with _lock:
+        entrada = _compartida.get(clave)
+    if entrada and sello_vigente(entrada["sello"], ttl):
+        return entrada["valor"]
+
+    # El sello se toma antes de cargar: si alguien invalida durante la carga,
+    # el valor nuevo ya nace vencido y se vuelve a cargar en la próxima llamada.
+    s = sello(*etiquetas)
+    valor = cargar()
+    with _lock:
+        _compartida[clave] = {"valor": valor, "sello": s}
+    return valor
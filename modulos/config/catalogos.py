@@ -0,0 +1,37 @@
+# modulos/config/catalogos.py
+#
+# Datos de referencia que casi no cambian (distritos y roles), en la cache
+# compartida del proceso: una sola consulta sirve a todas las sesiones.
+# Las filas devueltas se comparten; no deben modificarse.
+from modulos.config.cache import memo_compartido, invalidar
+from modulos.config.consultas import todos
+
+# Etiqueta que se invalida al crear o eliminar un distrito
+ETIQUETA_CATALOGOS = "catalogos"
+
+# Respaldo por si otro servidor cambió los distritos (las versiones son por proceso)
+_CATALOGOS_TTL_SEG = 600
+
+
+def invalidar_catalogos() -> None:
+    """Llamar después de crear o eliminar un distrito."""
+    invalidar(ETIQUETA_CATALOGOS)
+
+
+def distritos() -> list[dict]:
+    """Distritos ordenados por nombre."""
+    return memo_compartido(
+        "distritos", (ETIQUETA_CATALOGOS,), lambda: todos("distritos"), ttl=_CATALOGOS_TTL_SEG
+    )
+
+
+def distritos_por_id() -> list[dict]:
+    """Los mismos distritos, ordenados por Id_distrito."""
+    return sorted(distritos(), key=lambda d: d["Id_distrito"])
+
+
+def roles() -> list[dict]:
+    """Roles de usuario (tabla rol), ordenados por Id_rol."""
+    return memo_compartido(
+        "roles", (ETIQUETA_CATALOGOS,), lambda: todos("roles"), ttl=_CATALOGOS_TTL_SEG
+    )
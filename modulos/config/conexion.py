@@ -1,97 +1,818 @@
 # modulos/config/conexion.py
-import mysql.connector
-from mysql.connector import Error
-from contextlib import contextmanager
+import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from decimal import Decimal
+from functools import partial
+
+from dotenv import load_dotenv
+
+from modulos.config.metricas import medir, contar
+from modulos.config.resiliencia import (
+    BaseDatosNoDisponible,
+    Breaker,
+    ConsultaExcedida,
+    es_transitorio,
+    protegido,
+)
+
+# Variables de entorno (o archivo .env en la raíz del proyecto)
+load_dotenv()
+
+# -------------------------------------------------------------------
+# MOTOR DE BD: GAPC_DB_BACKEND=mysql (por defecto) o sqlite
+# sqlite usa un archivo local con el esquema de sql/esquema_sqlite.sql,
+# para desarrollo y pruebas de carga sin red.
+# -------------------------------------------------------------------
+BACKEND = os.getenv("GAPC_DB_BACKEND", "mysql").strip().lower()
+SQLITE_RUTA = os.getenv("GAPC_SQLITE_RUTA", "gapc_local.db")
 
 # -------------------------------------------------------------------
 # CONFIGURACIÓN REAL DE TU BD EN CLEVER CLOUD
+# (cada valor se puede reemplazar con su variable GAPC_DB_*)
 # -------------------------------------------------------------------
 DB_CONFIG = {
-    "host":     "bddu6yel2ww6hx27qwg0-mysql.services.clever-cloud.com",
-    "user":     "uvkxd9piyuwt9e3d",
-    "password": "NVcd1m955q5Qrzei5rFt",
-    "database": "bddu6yel2ww6hx27qwg0",
-    "port":     3306,
+    "host":     os.getenv("GAPC_DB_HOST", "bddu6yel2ww6hx27qwg0-mysql.services.clever-cloud.com"),
+    "user":     os.getenv("GAPC_DB_USER", "uvkxd9piyuwt9e3d"),
+    "password": os.getenv("GAPC_DB_PASSWORD", "NVcd1m955q5Qrzei5rFt"),
+    "database": os.getenv("GAPC_DB_NAME", "bddu6yel2ww6hx27qwg0"),
+    "port":     os.getenv("GAPC_DB_PORT", 3306),
 }
 
 
-def _get_params():
+# -------------------------------------------------------------------
+# RÉPLICA DE LECTURA (opcional)
+# Si se define GAPC_DB_REPLICA_HOST (o GAPC_SQLITE_REPLICA_RUTA con sqlite),
+# las lecturas marcadas replica=True (reportes y exportaciones) van a la
+# réplica mientras su retraso no pase de GAPC_REPLICA_MAX_RETRASO_SEG.
+# Si está atrasada o no responde, se leen de la primaria.
+# Escrituras y pantallas transaccionales (caja, ahorros...) usan siempre la primaria.
+# -------------------------------------------------------------------
+REPLICA_CONFIG = (
+    {
+        **DB_CONFIG,
+        "host":     os.getenv("GAPC_DB_REPLICA_HOST"),
+        "port":     os.getenv("GAPC_DB_REPLICA_PORT", DB_CONFIG["port"]),
+        "user":     os.getenv("GAPC_DB_REPLICA_USER", DB_CONFIG["user"]),
+        "password": os.getenv("GAPC_DB_REPLICA_PASSWORD", DB_CONFIG["password"]),
+    }
+    if os.getenv("GAPC_DB_REPLICA_HOST")
+    else None
+)
+SQLITE_REPLICA_RUTA = os.getenv("GAPC_SQLITE_REPLICA_RUTA")
+REPLICA_MAX_RETRASO_SEG = float(os.getenv("GAPC_REPLICA_MAX_RETRASO_SEG", "30"))
+
+# Cada cuánto se vuelve a medir el retraso de la réplica
+_REPLICA_REVISION_SEG = 10
+
+
+def _get_params(config: dict | None = None):
     """Devuelve los parámetros correctos para mysql.connector."""
-    params = DB_CONFIG.copy()
+    params = (config or DB_CONFIG).copy()
     params["port"] = int(params.get("port", 3306))
     return params
 
 
+def _hay_replica() -> bool:
+    if BACKEND == "sqlite":
+        return bool(SQLITE_REPLICA_RUTA)
+    return REPLICA_CONFIG is not None
+
+
+# -------------------------------------------------------------------
+# POOL DE CONEXIONES (MySQL)
+# Uno por destino ("gapc" primaria, "gapc_replica" réplica), creado la
+# primera vez que se usa y compartido en todo el proceso.
+# Si el pool está agotado se abre una conexión directa, como antes.
+# mysql.connector se importa aquí para que el motor sqlite no lo necesite.
+# Sin reset de sesión al devolver la conexión (borraría los statements
+# preparados); _cerrar() termina antes cualquier transacción abierta.
+# -------------------------------------------------------------------
+_POOL_TAMANO = 8
+_pools: dict = {}
+_pool_lock = threading.Lock()
+_sqlite_listos: set[str] = set()
+
+
+def _obtener_pool(nombre: str = "gapc", config: dict | None = None):
+    if nombre not in _pools:
+        with _pool_lock:
+            if nombre not in _pools:
+                from mysql.connector import pooling
+
+                _pools[nombre] = pooling.MySQLConnectionPool(
+                    pool_name=nombre,
+                    pool_size=_POOL_TAMANO,
+                    pool_reset_session=False,
+                    **_get_params(config),
+                )
+    return _pools[nombre]
+
+
+def _conectar_sqlite(ruta: str):
+    from modulos.config import sqlite_local
+
+    if ruta not in _sqlite_listos:
+        with _pool_lock:
+            if ruta not in _sqlite_listos:
+                sqlite_local.inicializar(ruta)
+                _sqlite_listos.add(ruta)
+    return sqlite_local.ConexionSQLite(ruta)
+
+
+def _conectar(replica: bool = False):
+    with medir("conexion_replica" if replica else "conexion"):
+        if BACKEND == "sqlite":
+            return _conectar_sqlite(SQLITE_REPLICA_RUTA if replica else SQLITE_RUTA)
+
+        import mysql.connector
+        from mysql.connector import pooling
+
+        nombre, config = ("gapc_replica", REPLICA_CONFIG) if replica else ("gapc", DB_CONFIG)
+        try:
+            return _obtener_pool(nombre, config).get_connection()
+        except pooling.PoolError:
+            return mysql.connector.connect(**_get_params(config))
+
+
+# Estado de la réplica: se revisa como máximo cada _REPLICA_REVISION_SEG
+_replica_estado = {"usable": False, "revisado": 0.0}
+
+
+def _retraso_replica(cnx) -> float | None:
+    """
+    Segundos de retraso de la réplica, o None si la replicación está
+    detenida. Una instancia sin replicación configurada (copia local para
+    pruebas) y SQLite cuentan como al día.
+    """
+    if BACKEND == "sqlite":
+        return 0.0
+    cur = cnx.cursor(dictionary=True)
+    try:
+        try:
+            cur.execute("SHOW REPLICA STATUS")
+        except Exception:
+            cur.execute("SHOW SLAVE STATUS")
+        fila = cur.fetchone()
+    finally:
+        cur.close()
+    if not fila:
+        return 0.0
+    retraso = fila.get("Seconds_Behind_Source", fila.get("Seconds_Behind_Master"))
+    return None if retraso is None else float(retraso)
+
+
+def _conectar_replica():
+    """
+    Conexión a la réplica si hay una configurada, está al día y responde;
+    si no, None (el llamador usa la primaria).
+    """
+    if not _hay_replica():
+        return None
+
+    ahora = time.monotonic()
+    revisar = ahora - _replica_estado["revisado"] >= _REPLICA_REVISION_SEG
+    if not revisar and not _replica_estado["usable"]:
+        return None
+
+    try:
+        cnx = _conectar(replica=True)
+    except Exception:
+        _replica_estado.update(usable=False, revisado=ahora)
+        return None
+
+    if revisar:
+        try:
+            retraso = _retraso_replica(cnx)
+        except Exception:
+            retraso = None
+        usable = retraso is not None and retraso <= REPLICA_MAX_RETRASO_SEG
+        _replica_estado.update(usable=usable, revisado=ahora)
+        if not usable:
+            cnx.close()
+            return None
+    return cnx
+
+
 # -------------------------------------------------------------------
 # CONTEXT MANAGER PARA CONEXIÓN
 # -------------------------------------------------------------------
+# Breaker de la primaria: tras 5 fallas transitorias seguidas rechaza las
+# operaciones durante 30 s con BaseDatosNoDisponible (ver resiliencia.py).
+# Su estado se publica en metricas.estados()["breaker_bd"].
+_breaker = Breaker("breaker_bd", umbral=5, espera_seg=30.0)
+
+
+def estado_bd() -> str:
+    """Estado del breaker de la BD: cerrado, abierto o semiabierto."""
+    return _breaker.estado()
+
+
+def _abrir(replica: bool = False):
+    if replica:
+        cnx = _conectar_replica()
+        contar("lectura_replica" if cnx else "lectura_replica_en_primaria")
+        if cnx is not None:
+            return cnx
+    return _conectar()
+
+
+def _cerrar(cnx) -> None:
+    if not cnx:
+        return
+    try:
+        # Una lectura deja abierta su transacción (autocommit apagado): sin
+        # este rollback el siguiente uso de la conexión vería datos viejos.
+        if cnx.is_connected() and getattr(cnx, "in_transaction", False):
+            cnx.rollback()
+    except Exception:
+        pass
+    finally:
+        # Siempre, aunque la conexión se haya caído: close() es lo que la
+        # devuelve al pool (get_connection() la reconecta al volver a usarla).
+        # Sin esto cada conexión perdida se llevaría un lugar del pool.
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+
+# -------------------------------------------------------------------
+# STATEMENTS PREPARADOS (MySQL)
+# Las consultas con nombre (ver consultas.py) se preparan una sola vez por
+# conexión física y se reutilizan mientras esa conexión viva en el pool:
+# el servidor ya no analiza ni planifica el SQL en cada llamada.
+# -------------------------------------------------------------------
+_preparadas: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_preparadas_lock = threading.Lock()
+
+# MySQL: "Unknown prepared statement handler" (la conexión se reconectó)
+_ER_PREPARADA_DESCONOCIDA = 1243
+
+
+def _usar_preparada(nombre: str | None) -> bool:
+    return bool(nombre) and BACKEND != "sqlite"
+
+
+def _ejecutar_preparada(cnx, sql: str, params):
+    """
+    Ejecuta sql con el statement preparado de esta conexión (lo prepara la
+    primera vez) y devuelve el cursor. Cada conexión la usa un solo hilo a
+    la vez, así que sus cursores no necesitan más bloqueo.
+    """
+    # PooledMySQLConnection envuelve a la conexión real, que es la que dura
+    fisica = getattr(cnx, "_cnx", cnx)
+    with _preparadas_lock:
+        cursores = _preparadas.setdefault(fisica, {})
+
+    for intento in (1, 2):
+        cur = cursores.get(sql)
+        if cur is None:
+            cur = cnx.cursor(prepared=True)
+            cursores[sql] = cur
+            contar("sql_preparadas")
+        try:
+            cur.execute(sql, params or ())
+            return cur
+        except Exception as exc:
+            cursores.pop(sql, None)
+            if intento == 2 or getattr(exc, "errno", None) != _ER_PREPARADA_DESCONOCIDA:
+                raise
+
+
 @contextmanager
-def db_conn():
-    """Abre y cierra la conexión automáticamente."""
-    params = _get_params()
+def db_conn(replica: bool = False):
+    """
+    Entrega una conexión del pool y la devuelve al terminar
+    (close() en una conexión del pool la regresa al pool).
+    Con replica=True usa la réplica de lectura si está disponible y al día;
+    si no, la primaria. Solo para lecturas que toleran datos algo atrasados.
+    """
     cnx = None
 
     try:
-        cnx = mysql.connector.connect(**params)
+        cnx = _abrir(replica)
         yield cnx
 
     finally:
-        if cnx and cnx.is_connected():
-            cnx.close()
+        _cerrar(cnx)
 
 
 # -------------------------------------------------------------------
-# SELECT: fetch_one
+# LÍMITE DE TIEMPO POR OPERACIÓN
+# Cada operación pertenece a una categoría con su límite en segundos
+# (GAPC_LIMITE_<CATEGORIA>_SEG; 0 = sin límite). limite_seg= lo cambia
+# para una sola llamada. El límite cubre la llamada completa, reintentos
+# incluidos.
+#   - Lecturas SELECT en MySQL: el propio servidor corta la consulta
+#     (hint MAX_EXECUTION_TIME). Las lecturas en streaming (iter_lotes) no
+#     lo usan: con cursor sin buffer ese tiempo incluye lo que el consumidor
+#     tarda entre lote y lote.
+#   - Todo lo demás (escrituras, transacciones, streaming, SQLite, SQL que
+#     no empieza con SELECT): un temporizador cancela la sentencia en curso
+#     con KILL QUERY desde otra conexión (en SQLite, interrupt()).
+# La categoría "lote" es para los procesos de línea de comandos que leen
+# millones de filas (snapshot, exportación CSV): sin límite por defecto.
+# Al vencer se lanza ConsultaExcedida y se cuenta en las métricas
+# "timeouts" y "timeouts_<categoria>".
 # -------------------------------------------------------------------
-def fetch_one(sql: str, params: tuple | None = None):
-    """Ejecuta SELECT y devuelve 1 fila como dict."""
+def _limite_env(categoria: str, defecto: float) -> float:
+    return float(os.getenv(f"GAPC_LIMITE_{categoria.upper()}_SEG", defecto))
+
+
+LIMITES_SEG = {
+    "general":     _limite_env("general", 15),
+    "reporte":     _limite_env("reporte", 30),
+    "exportacion": _limite_env("exportacion", 300),
+    "escritura":   _limite_env("escritura", 30),
+    "lote":        _limite_env("lote", 0),
+}
+
+# MySQL: "maximum statement execution time exceeded"
+_ER_TIEMPO_EXCEDIDO = 3024
+_RE_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+
+def _limite(categoria: str, limite_seg: float | None) -> float | None:
+    if limite_seg is None:
+        limite_seg = LIMITES_SEG[categoria]
+    return limite_seg if limite_seg and limite_seg > 0 else None
+
+
+def _cancelar_sentencia(cnx) -> None:
+    """Cancela lo que esté ejecutando cnx, sin cerrar la conexión."""
+    if BACKEND == "sqlite":
+        cnx.interrupt()
+        return
+
+    import mysql.connector
+
+    config = DB_CONFIG
+    if REPLICA_CONFIG and cnx.server_host == REPLICA_CONFIG["host"]:
+        config = REPLICA_CONFIG
+    otra = mysql.connector.connect(connection_timeout=5, **_get_params(config))
     try:
-        with db_conn() as cnx:
+        cur = otra.cursor()
+        cur.execute(f"KILL QUERY {int(cnx.connection_id)}")
+        cur.close()
+    finally:
+        otra.close()
+
+
+class _Plazo:
+    """
+    Límite de tiempo de una llamada. Como context manager arma el
+    temporizador (si cancelar=True) y, al salir, convierte el error de la
+    sentencia cancelada en ConsultaExcedida. vigilar(cnx) / soltar() indican
+    qué conexión hay que cancelar; se suelta antes de devolverla al pool.
+    """
+
+    def __init__(self, categoria: str, limite: float | None, cancelar: bool = True):
+        self.categoria = categoria
+        self.limite = limite
+        self._cancelar = cancelar and limite is not None
+        self._lock = threading.Lock()
+        self._timer = None
+        self._cnx = None
+        self._vencido = False
+
+    def __enter__(self):
+        if self._cancelar:
+            self._timer = threading.Timer(self.limite, self._vencer)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, tipo, exc, tb):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if exc is None or isinstance(exc, ConsultaExcedida) or not isinstance(exc, Exception):
+            return False
+        if self._vencido or getattr(exc, "errno", None) == _ER_TIEMPO_EXCEDIDO:
+            raise self._excedida() from exc
+        return False
+
+    def _vencer(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                return
+            self._vencido = True
+            if self._cnx is not None:
+                try:
+                    _cancelar_sentencia(self._cnx)
+                except Exception:
+                    pass
+
+    def _excedida(self) -> ConsultaExcedida:
+        contar("timeouts")
+        contar(f"timeouts_{self.categoria}")
+        return ConsultaExcedida(self.categoria, self.limite)
+
+    def vigilar(self, cnx) -> None:
+        with self._lock:
+            if self._vencido:
+                raise self._excedida()
+            self._cnx = cnx
+
+    def soltar(self) -> None:
+        with self._lock:
+            self._cnx = None
+
+    @contextmanager
+    def sobre(self, cnx):
+        self.vigilar(cnx)
+        try:
+            yield cnx
+        finally:
+            self.soltar()
+
+
+def _plazo_lectura(sql: str, categoria: str, limite_seg: float | None):
+    """Plazo de una lectura y el SQL a ejecutar (con el hint si aplica)."""
+    limite = _limite(categoria, limite_seg)
+    if limite is not None and BACKEND != "sqlite" and _RE_SELECT.match(sql):
+        hint = f"SELECT /*+ MAX_EXECUTION_TIME({int(limite * 1000)}) */"
+        return _Plazo(categoria, limite, cancelar=False), _RE_SELECT.sub(hint, sql, count=1)
+    return _Plazo(categoria, limite), sql
+
+
+def _medir_nombre(nombre: str | None):
+    """Latencia propia de una consulta con nombre: métrica "sql.<nombre>"."""
+    return medir(f"sql.{nombre}") if nombre else nullcontext()
+
+
+def _leer(
+    operacion: str,
+    sql: str,
+    params,
+    replica: bool,
+    categoria: str,
+    limite_seg,
+    nombre: str | None,
+    una: bool,
+):
+    plazo, sql = _plazo_lectura(sql, categoria, limite_seg)
+
+    def consultar():
+        with medir(operacion), _medir_nombre(nombre), db_conn(replica) as cnx, plazo.sobre(cnx):
+            if _usar_preparada(nombre):
+                cur = _ejecutar_preparada(cnx, sql, params)
+                columnas = cur.column_names
+                filas = [dict(zip(columnas, f)) for f in cur.fetchall()]
+                if una:
+                    return filas[0] if filas else None
+                return filas
+
             cur = cnx.cursor(dictionary=True)
             cur.execute(sql, params or ())
-            row = cur.fetchone()
+            resultado = cur.fetchone() if una else cur.fetchall()
             cur.close()
-            return row
+            return resultado
 
-    except Error as err:
-        raise
+    with plazo:
+        return protegido(_breaker, consultar, reintentar=True)
 
 
 # -------------------------------------------------------------------
-# SELECT: fetch_all
+# SELECT: fetch_one
+# Las lecturas se reintentan ante fallas transitorias (ver resiliencia.py)
 # -------------------------------------------------------------------
-def fetch_all(sql: str, params: tuple | None = None):
-    """Ejecuta SELECT y devuelve lista de dicts."""
-    try:
-        with db_conn() as cnx:
-            cur = cnx.cursor(dictionary=True)
-            cur.execute(sql, params or ())
-            rows = cur.fetchall()
-            cur.close()
-            return rows
+def fetch_one(
+    sql: str,
+    params: tuple | None = None,
+    replica: bool = False,
+    categoria: str = "general",
+    limite_seg: float | None = None,
+    nombre: str | None = None,
+):
+    """
+    Ejecuta SELECT y devuelve 1 fila como dict.
+    'nombre' lo pasa consultas.py: la consulta se mide aparte y, en MySQL,
+    reutiliza su statement preparado.
+    """
+    return _leer("fetch_one", sql, params, replica, categoria, limite_seg, nombre, una=True)
 
-    except Error as err:
-        raise
+
+# -------------------------------------------------------------------
+# SELECT: fetch_all
+# -------------------------------------------------------------------
+def fetch_all(
+    sql: str,
+    params: tuple | None = None,
+    replica: bool = False,
+    categoria: str = "general",
+    limite_seg: float | None = None,
+    nombre: str | None = None,
+):
+    """Ejecuta SELECT y devuelve lista de dicts ('nombre' como en fetch_one)."""
+    return _leer("fetch_all", sql, params, replica, categoria, limite_seg, nombre, una=False)
 
 
 # -------------------------------------------------------------------
 # INSERT/UPDATE/DELETE: execute
+# Las escrituras no se reintentan (podrían aplicarse dos veces)
 # -------------------------------------------------------------------
-def execute(sql: str, params: tuple | None = None, return_last_id: bool = False):
+def execute(
+    sql: str,
+    params: tuple | None = None,
+    return_last_id: bool = False,
+    categoria: str = "escritura",
+    limite_seg: float | None = None,
+    nombre: str | None = None,
+):
     """
     Ejecuta INSERT/UPDATE/DELETE.
     Si return_last_id=True, devuelve el último ID insertado.
+    'nombre' como en fetch_one.
     """
-    try:
-        with db_conn() as cnx:
+    plazo = _Plazo(categoria, _limite(categoria, limite_seg))
+
+    def escribir():
+        with medir("execute"), _medir_nombre(nombre), db_conn() as cnx, plazo.sobre(cnx):
+            if _usar_preparada(nombre):
+                cur = _ejecutar_preparada(cnx, sql, params)
+                last_id = cur.lastrowid
+                cnx.commit()
+                return last_id
+
             cur = cnx.cursor()
             cur.execute(sql, params or ())
             last_id = cur.lastrowid
             cnx.commit()
             cur.close()
+            return last_id
+
+    with plazo:
+        last_id = protegido(_breaker, escribir)
+    if return_last_id:
+        return last_id
 
-            if return_last_id:
-                return last_id
 
-    except Error as err:
+# -------------------------------------------------------------------
+# TRANSACCIÓN: varias escrituras que se confirman juntas
+# -------------------------------------------------------------------
+@contextmanager
+def transaccion(categoria: str = "escritura", limite_seg: float | None = None):
+    """
+    Entrega un cursor (filas como dict) dentro de una transacción.
+    Si el bloque termina bien hace commit; si lanza excepción, rollback.
+    No se reintenta; una falla transitoria llega como BaseDatosNoDisponible.
+    Si se pasa del límite, la sentencia en curso se cancela, se hace
+    rollback y llega ConsultaExcedida.
+    """
+    plazo = _Plazo(categoria, _limite(categoria, limite_seg))
+    prueba = _breaker.permitir()
+    try:
+        with plazo, medir("transaccion"), db_conn() as cnx, plazo.sobre(cnx):
+            cur = cnx.cursor(dictionary=True)
+            try:
+                yield cur
+                cnx.commit()
+            except Exception:
+                cnx.rollback()
+                raise
+            finally:
+                cur.close()
+    except BaseDatosNoDisponible:
         raise
+    except Exception as exc:
+        if not es_transitorio(exc):
+            # La BD respondió (error de datos, ConsultaExcedida o del bloque):
+            # igual que en protegido(), cuenta como éxito para el breaker
+            _breaker.exito()
+            raise
+        _breaker.falla()
+        raise BaseDatosNoDisponible() from exc
+    else:
+        _breaker.exito()
+    finally:
+        if prueba:
+            _breaker.liberar()
+
+
+def update_en_lote(cur, tabla: str, clave: str, columnas: list[str], filas: list[dict]) -> int:
+    """
+    Actualiza varias filas con una sola sentencia:
+        UPDATE tabla SET col = CASE clave WHEN ... THEN ... END, ...
+        WHERE clave IN (...)
+    'filas' son dicts con la clave y las columnas a escribir. Se usa con el
+    cursor de transaccion(). Devuelve cuántas filas se enviaron.
+    """
+    if not filas:
+        return 0
+
+    sets = []
+    params: list = []
+    for col in columnas:
+        casos = " ".join(["WHEN %s THEN %s"] * len(filas))
+        sets.append(f"{col} = CASE {clave} {casos} END")
+        for f in filas:
+            params.extend((f[clave], f[col]))
+
+    marcadores = ", ".join(["%s"] * len(filas))
+    params.extend(f[clave] for f in filas)
+
+    sql = f"UPDATE {tabla} SET {', '.join(sets)} WHERE {clave} IN ({marcadores})"
+    cur.execute(sql, tuple(params))
+    return len(filas)
+
+
+def insert_en_lote(cur, tabla: str, columnas: list[str], filas: list[tuple]) -> int:
+    """
+    Inserta varias filas (tuplas en el orden de 'columnas') con un solo
+    INSERT ... VALUES (...), (...). Se usa con el cursor de transaccion().
+    """
+    if not filas:
+        return 0
+    una = "(" + ", ".join(["%s"] * len(columnas)) + ")"
+    sql = (
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+        f"VALUES {', '.join([una] * len(filas))}"
+    )
+    cur.execute(sql, tuple(v for fila in filas for v in fila))
+    return len(filas)
+
+
+# -------------------------------------------------------------------
+# API ASÍNCRONA: afetch_one / afetch_all / aexecute
+# Mismos parámetros que la versión síncrona (replica, categoria,
+# limite_seg...). Cada llamada corre la versión síncrona en un hilo propio
+# (con conexión del pool), así que comparte pool, límites y métricas. Para procesos por lotes o servicios con asyncio:
+#
+#     filas = await asyncio.gather(*(afetch_all(sql, (g,)) for g in grupos))
+# -------------------------------------------------------------------
+# Tantos hilos como conexiones en el pool
+_ejecutor_async = ThreadPoolExecutor(max_workers=_POOL_TAMANO, thread_name_prefix="gapc-async")
+
+
+async def _en_hilo(funcion, *args, **kwargs):
+    # asyncio se importa aquí: la app (sin async) no paga su import al arrancar
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ejecutor_async, partial(funcion, *args, **kwargs))
+
+
+async def afetch_one(sql: str, params: tuple | None = None, **opciones):
+    """Versión asíncrona de fetch_one."""
+    return await _en_hilo(fetch_one, sql, params, **opciones)
+
+
+async def afetch_all(sql: str, params: tuple | None = None, **opciones):
+    """Versión asíncrona de fetch_all."""
+    return await _en_hilo(fetch_all, sql, params, **opciones)
+
+
+async def aexecute(sql: str, params: tuple | None = None, **opciones):
+    """Versión asíncrona de execute."""
+    return await _en_hilo(execute, sql, params, **opciones)
+
+
+# -------------------------------------------------------------------
+# LECTURAS EN PARALELO: en_paralelo
+# -------------------------------------------------------------------
+# Menor que el pool, para dejar conexiones libres a las demás sesiones
+_MAX_HILOS = 4
+_ejecutor = ThreadPoolExecutor(max_workers=_MAX_HILOS, thread_name_prefix="gapc-db")
+
+
+def en_paralelo(tareas: dict) -> dict:
+    """
+    Ejecuta lecturas independientes a la vez, cada una con su propia
+    conexión del pool, y devuelve {nombre: resultado} cuando terminan todas.
+
+        datos = en_paralelo({
+            "ahorros": lambda: fetch_one(sql_ahorros, params),
+            "multas":  lambda: fetch_all(sql_multas, params),
+        })
+
+    Las tareas solo deben consultar la BD: nada de st.* ni st.session_state,
+    que no están disponibles fuera del hilo de la sesión. Si alguna falla,
+    se relanza su excepción.
+    """
+    if len(tareas) <= 1:
+        return {nombre: tarea() for nombre, tarea in tareas.items()}
+
+    futuros = {nombre: _ejecutor.submit(tarea) for nombre, tarea in tareas.items()}
+    return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+
+# -------------------------------------------------------------------
+# SELECT en streaming: iter_lotes / iter_rows
+# -------------------------------------------------------------------
+def iter_lotes(
+    sql: str,
+    params: tuple | None = None,
+    tamano_lote: int = 1000,
+    replica: bool = False,
+    categoria: str = "exportacion",
+    limite_seg: float | None = None,
+):
+    """
+    Ejecuta SELECT con cursor sin buffer (las filas se quedan en el servidor)
+    y va entregando lotes de hasta 'tamano_lote' filas como
+    (columnas, filas), donde 'columnas' es la misma tupla de nombres para
+    todos los lotes y cada fila es una tupla de valores (sin dict por fila).
+    La memoria usada no depende del total de filas.
+    Si la consulta no se puede abrir por una falla transitoria se reintenta;
+    una vez entregado el primer lote ya no.
+    El límite de tiempo (categoría "exportacion" por defecto) cuenta desde
+    que se abre la consulta hasta que se lee el último lote; los procesos
+    por lotes usan la categoría "lote" (sin límite, salvo configuración).
+    """
+    # Sin hint MAX_EXECUTION_TIME: el temporizador controla el plazo
+    plazo = _Plazo(categoria, _limite(categoria, limite_seg))
+
+    def abrir():
+        cnx = _abrir(replica)
+        try:
+            plazo.vigilar(cnx)
+            cur = cnx.cursor(buffered=False)
+            cur.execute(sql, params or ())
+            return cnx, cur
+        except Exception:
+            plazo.soltar()
+            _cerrar(cnx)
+            raise
+
+    with plazo:
+        cnx, cur = protegido(_breaker, abrir, reintentar=True)
+        agotado = False
+        try:
+            columnas = tuple(cur.column_names)
+            while True:
+                filas = cur.fetchmany(tamano_lote)
+                if not filas:
+                    agotado = True
+                    break
+                yield columnas, filas
+        finally:
+            try:
+                # Si el consumidor se detuvo antes, hay que descartar lo pendiente
+                # para poder cerrar el cursor sin "Unread result found".
+                if not agotado:
+                    cnx.consume_results()
+                cur.close()
+            finally:
+                plazo.soltar()
+                _cerrar(cnx)
+
+
+def iter_rows(
+    sql: str,
+    params: tuple | None = None,
+    tamano_lote: int = 1000,
+    replica: bool = False,
+    categoria: str = "exportacion",
+    limite_seg: float | None = None,
+):
+    """Igual que iter_lotes, pero entrega las filas una a una como dicts."""
+    for columnas, filas in iter_lotes(sql, params, tamano_lote, replica, categoria, limite_seg):
+        for fila in filas:
+            yield dict(zip(columnas, fila))
+
+
+# -------------------------------------------------------------------
+# SELECT por columnas: fetch_columnas
+# -------------------------------------------------------------------
+def fetch_columnas(
+    sql: str,
+    params: tuple | None = None,
+    numericas: tuple[str, ...] = (),
+    tamano_lote: int = 1000,
+    replica: bool = False,
+    categoria: str = "exportacion",
+    limite_seg: float | None = None,
+) -> dict:
+    """
+    Ejecuta SELECT y devuelve los datos por columna: {columna: [valores]}.
+    No se crea un dict por fila. Las columnas DECIMAL (y las indicadas en
+    'numericas', aunque vengan todas en NULL) se convierten a float una sola
+    vez por columna, con NULL -> 0.0. Si no hay filas devuelve {}.
+    """
+    columnas = None
+    datos: list[list] = []
+
+    for cols, filas in iter_lotes(sql, params, tamano_lote, replica, categoria, limite_seg):
+        if columnas is None:
+            columnas = cols
+            datos = [[] for _ in cols]
+        for lista, valores in zip(datos, zip(*filas)):
+            lista.extend(valores)
+
+    if columnas is None:
+        return {}
+
+    resultado = {}
+    for nombre, valores in zip(columnas, datos):
+        muestra = next((v for v in valores if v is not None), None)
+        if nombre in numericas or isinstance(muestra, Decimal):
+            valores = [0.0 if v is None else float(v) for v in valores]
+        resultado[nombre] = valores
+    return resultado
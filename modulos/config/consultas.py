@@ -0,0 +1,352 @@
+# modulos/config/consultas.py
+#
+# Registro de consultas con nombre.
+# Las pantallas piden la consulta por su nombre en vez de repetir el SQL:
+#
+#     grupos = todos("grupos_de_promotora", (dui,))
+#
+# Así cada SQL existe una sola vez, sus métricas salen por nombre
+# ("sql.<nombre>" en metricas.resumen()) y en MySQL se ejecuta como
+# statement preparado que se reutiliza en cada conexión del pool.
+# Solo para SQL de texto fijo: las consultas con listas IN (...) de largo
+# variable se siguen armando donde se usan.
+from modulos.config.conexion import fetch_one, fetch_all, execute
+
+CONSULTAS: dict[str, str] = {
+    # -------------------------------------------------------------------
+    # Catálogos
+    # -------------------------------------------------------------------
+    "distritos": """
+        SELECT Id_distrito, Nombre
+        FROM distritos
+        ORDER BY Nombre ASC
+    """,
+    "distrito_crear": "INSERT INTO distritos (Nombre) VALUES (%s)",
+    "distrito_eliminar": "DELETE FROM distritos WHERE Id_distrito = %s",
+    "roles": "SELECT Id_rol, `Tipo de rol` FROM rol ORDER BY Id_rol",
+    "rol_directiva": "SELECT Id_rol FROM rol WHERE `Tipo de rol` = 'DIRECTIVA' LIMIT 1",
+    # -------------------------------------------------------------------
+    # Usuarios, promotoras y directivas
+    # -------------------------------------------------------------------
+    "usuarios": """
+        SELECT u.Id_usuario,
+               u.Nombre,
+               u.DUI,
+               r.`Tipo de rol` AS Rol,
+               u.Id_rol
+        FROM Usuario u
+        JOIN rol r ON r.Id_rol = u.Id_rol
+        ORDER BY u.Id_usuario ASC
+    """,
+    "usuario_con_rol": """
+        SELECT u.Id_usuario,
+               u.Nombre,
+               u.DUI,
+               r.`Tipo de rol` AS RolNombre
+        FROM Usuario u
+        JOIN rol r ON r.Id_rol = u.Id_rol
+        WHERE u.Id_usuario = %s
+    """,
+    "usuario_por_dui": "SELECT Id_usuario FROM Usuario WHERE DUI = %s LIMIT 1",
+    "usuario_crear": """
+        INSERT INTO Usuario (Nombre, DUI, Contraseña, Id_rol)
+        VALUES (%s, %s, %s, %s)
+    """,
+    "usuario_eliminar": "DELETE FROM Usuario WHERE Id_usuario = %s",
+    "usuario_directiva_eliminar": """
+        DELETE FROM Usuario
+        WHERE DUI = %s
+          AND Id_rol IN (
+              SELECT Id_rol FROM rol WHERE `Tipo de rol` = 'DIRECTIVA'
+          )
+    """,
+    "promotora_por_dui": """
+        SELECT Id_promotora, Nombre, DUI
+        FROM promotora
+        WHERE DUI = %s
+        LIMIT 1
+    """,
+    "promotora_crear": "INSERT INTO promotora (Nombre, DUI) VALUES (%s, %s)",
+    "directivas_por_dui": """
+        SELECT
+            d.Id_directiva,
+            d.Nombre,
+            d.DUI,
+            d.Id_grupo,
+            g.Nombre AS Nombre_grupo
+        FROM directiva d
+        JOIN grupos g ON g.Id_grupo = d.Id_grupo
+        WHERE d.DUI = %s
+        ORDER BY g.Nombre, d.Id_grupo
+    """,
+    "directivas_de_promotora": """
+        SELECT
+            dir.Id_directiva,
+            dir.Nombre,
+            dir.DUI,
+            g.Id_grupo,
+            g.Nombre AS Grupo,
+            g.DUIs_promotoras,
+            dir.Creado_en
+        FROM directiva dir
+        JOIN grupos g ON g.Id_grupo = dir.Id_grupo
+        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
+        ORDER BY dir.Id_directiva
+    """,
+    "directiva_crear": """
+        INSERT INTO directiva (Nombre, DUI, Id_grupo, Creado_en)
+        VALUES (%s, %s, %s, %s)
+    """,
+    "directiva_eliminar": "DELETE FROM directiva WHERE Id_directiva = %s",
+    "directiva_existe_dui": "SELECT Id_directiva FROM directiva WHERE DUI = %s LIMIT 1",
+    # -------------------------------------------------------------------
+    # Grupos
+    # -------------------------------------------------------------------
+    # Quitamos espacios en DUIs_promotoras por si los hay
+    "grupos_de_promotora": """
+        SELECT g.Id_grupo,
+               g.Nombre,
+               d.Nombre AS Distrito,
+               g.Estado,
+               g.Creado_en,
+               g.DUIs_promotoras
+        FROM grupos g
+        LEFT JOIN distritos d ON d.Id_distrito = g.Id_distrito
+        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
+        ORDER BY g.Id_grupo ASC
+    """,
+    "grupos_de_distrito": """
+        SELECT Id_grupo, Nombre
+        FROM grupos
+        WHERE Id_distrito = %s
+        ORDER BY Nombre ASC
+    """,
+    "grupo_crear": """
+        INSERT INTO grupos
+        (Nombre, Id_distrito, Estado, Creado_en, DUIs_promotoras, Id_promotora)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """,
+    "grupo_eliminar": "DELETE FROM grupos WHERE Id_grupo = %s",
+    "grupo_promotoras_actualizar": "UPDATE grupos SET DUIs_promotoras = %s WHERE Id_grupo = %s",
+    # -------------------------------------------------------------------
+    # Reuniones y caja
+    # -------------------------------------------------------------------
+    "reunion_por_id": """
+        SELECT Id_reunion, Id_grupo, Fecha, Numero_reunion, Tema
+        FROM reuniones_grupo
+        WHERE Id_reunion = %s
+        LIMIT 1
+    """,
+    "caja_de_reunion": """
+        SELECT *
+        FROM caja_reunion
+        WHERE Id_grupo = %s AND Id_reunion = %s
+        LIMIT 1
+    """,
+    # Mismo orden de cadena que modulos/directiva/recalculo_caja.py
+    "caja_saldo_anterior": """
+        SELECT cr.Saldo_cierre AS saldo
+        FROM caja_reunion cr
+        JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+        WHERE cr.Id_grupo = %s
+          AND (rg.Fecha, COALESCE(rg.Numero_reunion, 0)) < (%s, %s)
+        ORDER BY rg.Fecha DESC, COALESCE(rg.Numero_reunion, 0) DESC, cr.Id_caja DESC
+        LIMIT 1
+    """,
+    "caja_saldo_actual": """
+        SELECT Saldo_cierre AS saldo
+        FROM caja_reunion
+        WHERE Id_grupo = %s
+        ORDER BY Id_caja DESC
+        LIMIT 1
+    """,
+    # -------------------------------------------------------------------
+    # Asistencia, multas y ahorros
+    # -------------------------------------------------------------------
+    "asistencia_de_reunion": """
+        SELECT
+            a.Id_asistencia,
+            a.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            m.Sexo,
+            a.Presente
+        FROM asistencia_miembro a
+        JOIN miembros m ON m.Id_miembro = a.Id_miembro
+        WHERE a.Id_reunion = %s
+        ORDER BY m.Cargo, m.Nombre
+    """,
+    "multas_de_grupo": """
+        SELECT
+            mm.Id_multa,
+            mm.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            mm.Fecha_multa,
+            mm.Monto,
+            mm.Pagada,
+            mm.Fecha_pago
+        FROM multas_miembro mm
+        JOIN miembros m ON m.Id_miembro = mm.Id_miembro
+        WHERE mm.Id_grupo = %s
+        ORDER BY mm.Fecha_multa DESC, mm.Id_multa DESC
+    """,
+    "multas_pendientes_grupo": """
+        SELECT COUNT(*) AS c
+        FROM multas_miembro
+        WHERE Id_grupo = %s AND Pagada = 0
+    """,
+    "ahorros_de_reunion": """
+        SELECT
+            a.Id_ahorro,
+            a.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            a.Saldo_inicial,
+            a.Ahorro,
+            a.Otras_actividades,
+            a.Retiros,
+            a.Saldo_final
+        FROM ahorros_miembros a
+        JOIN miembros m ON m.Id_miembro = a.Id_miembro
+        WHERE a.Id_grupo = %s
+          AND a.Id_reunion = %s
+        ORDER BY m.Cargo, m.Nombre
+    """,
+    "ahorros_ultimos_saldos": """
+        SELECT a.Id_miembro, a.Saldo_final
+        FROM ahorros_miembros a
+        WHERE a.Id_grupo = %s
+          AND a.Id_ahorro = (
+              SELECT a2.Id_ahorro
+              FROM ahorros_miembros a2
+              WHERE a2.Id_grupo = a.Id_grupo AND a2.Id_miembro = a.Id_miembro
+              ORDER BY a2.Id_reunion DESC, a2.Id_ahorro DESC
+              LIMIT 1
+          )
+    """,
+    "ahorro_ultimo_de_miembro": """
+        SELECT Id_ahorro
+        FROM ahorros_miembros
+        WHERE Id_grupo = %s AND Id_miembro = %s
+        ORDER BY Id_reunion DESC, Id_ahorro DESC
+        LIMIT 1
+    """,
+    "ahorro_saldo_final_actualizar": """
+        UPDATE ahorros_miembros
+        SET Saldo_final = %s
+        WHERE Id_ahorro = %s
+    """,
+    # -------------------------------------------------------------------
+    # Préstamos
+    # -------------------------------------------------------------------
+    "prestamos_de_grupo": """
+        SELECT
+            p.Id_prestamo,
+            p.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            p.Fecha_prestamo,
+            p.Fecha_primer_pago,
+            p.Meses_plazo,
+            p.Monto,
+            p.Tasa_mensual,
+            p.Capital_total,
+            p.Interes_total,
+            p.Total_pagar,
+            p.Saldo_pendiente,
+            p.Cuotas_vencidas,
+            p.Ultimo_pago
+        FROM prestamos_miembro p
+        JOIN miembros m ON m.Id_miembro = p.Id_miembro
+        WHERE p.Id_grupo = %s
+        ORDER BY p.Fecha_prestamo DESC, p.Id_prestamo DESC
+    """,
+    # Usa el índice (Id_grupo, Saldo_pendiente)
+    "prestamo_pendiente_grupo": """
+        SELECT Id_prestamo
+        FROM prestamos_miembro
+        WHERE Id_grupo = %s AND Saldo_pendiente > 0.01
+        LIMIT 1
+    """,
+    "pagos_de_prestamo": """
+        SELECT
+            Id_pago,
+            Id_prestamo,
+            Numero_cuota,
+            Fecha_programada,
+            Capital_programado,
+            Interes_programado,
+            Capital_pagado,
+            Interes_pagado
+        FROM pagos_prestamo
+        WHERE Id_prestamo = %s
+        ORDER BY Numero_cuota
+    """,
+    # -------------------------------------------------------------------
+    # Cierres de ciclo
+    # -------------------------------------------------------------------
+    "cierre_detalle": """
+        SELECT
+            ccm.Id_cierre_miembro,
+            ccm.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            ccm.Total_ahorrado_ciclo,
+            ccm.Total_correspondiente,
+            ccm.Retiro_cierre,
+            ccm.Saldo_siguiente_ciclo
+        FROM cierres_ciclo_miembros ccm
+        JOIN miembros m ON m.Id_miembro = ccm.Id_miembro
+        WHERE ccm.Id_cierre = %s
+        ORDER BY m.Cargo, m.Nombre
+    """,
+    "cierre_totales_ahorro": """
+        SELECT
+            m.Id_miembro,
+            m.Nombre,
+            m.Cargo,
+            COALESCE(SUM(
+                COALESCE(a.Ahorro, 0)
+              + COALESCE(a.Otras_actividades, 0)
+              - COALESCE(a.Retiros, 0)
+            ), 0) AS Total_ahorrado
+        FROM miembros m
+        LEFT JOIN ahorros_miembros a
+            ON a.Id_miembro = m.Id_miembro
+           AND a.Id_grupo = m.Id_grupo
+        LEFT JOIN reuniones_grupo rg
+            ON rg.Id_reunion = a.Id_reunion
+        WHERE m.Id_grupo = %s
+          AND (rg.Fecha IS NULL OR (rg.Fecha BETWEEN %s AND %s))
+        GROUP BY m.Id_miembro, m.Nombre, m.Cargo
+        ORDER BY m.Cargo, m.Nombre
+    """,
+    "cierre_ultimo_de_fecha": """
+        SELECT Id_cierre
+        FROM cierres_ciclo
+        WHERE Id_grupo = %s AND Fecha_cierre = %s
+        ORDER BY Id_cierre DESC
+        LIMIT 1
+    """,
+}
+
+
+def sql(nombre: str) -> str:
+    """SQL registrado bajo 'nombre' (KeyError si no existe)."""
+    return CONSULTAS[nombre]
+
+
+def uno(nombre: str, params: tuple | None = None, **opciones):
+    """fetch_one de la consulta registrada (opciones: replica, categoria...)."""
+    return fetch_one(CONSULTAS[nombre], params, nombre=nombre, **opciones)
+
+
+def todos(nombre: str, params: tuple | None = None, **opciones):
+    """fetch_all de la consulta registrada."""
+    return fetch_all(CONSULTAS[nombre], params, nombre=nombre, **opciones)
+
+
+def ejecutar(nombre: str, params: tuple | None = None, **opciones):
+    """execute de la consulta registrada (acepta return_last_id=True)."""
+    return execute(CONSULTAS[nombre], params, nombre=nombre, **opciones)
@@ -0,0 +1,67 @@
+# modulos/config/metricas.py
+#
+# Contadores en memoria del proceso para el acceso a datos:
+# llamadas, errores y tiempo acumulado por operación.
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_datos: dict[str, dict] = {}
+_estados: dict[str, str] = {}
+
+
+def registrar(operacion: str, segundos: float, error: bool = False) -> None:
+    """Suma una llamada (y su duración) a la operación indicada."""
+    with _lock:
+        d = _datos.setdefault(
+            operacion, {"llamadas": 0, "errores": 0, "segundos": 0.0, "max_segundos": 0.0}
+        )
+        d["llamadas"] += 1
+        d["segundos"] += segundos
+        d["max_segundos"] = max(d["max_segundos"], segundos)
+        if error:
+            d["errores"] += 1
+
+
+def contar(evento: str) -> None:
+    """Cuenta un evento sin duración (por ejemplo, a dónde se envió una lectura)."""
+    registrar(evento, 0.0)
+
+
+@contextmanager
+def medir(operacion: str):
+    """Mide el bloque y lo registra; si lanza excepción cuenta como error."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registrar(operacion, time.perf_counter() - inicio, error=True)
+        raise
+    registrar(operacion, time.perf_counter() - inicio)
+
+
+def fijar_estado(nombre: str, valor: str) -> None:
+    """Guarda el estado actual de un componente (por ejemplo, el circuit breaker)."""
+    with _lock:
+        _estados[nombre] = valor
+
+
+def estados() -> dict[str, str]:
+    with _lock:
+        return dict(_estados)
+
+
+def resumen() -> dict[str, dict]:
+    """Copia de los contadores, con el promedio en milisegundos."""
+    with _lock:
+        copia = {op: dict(d) for op, d in _datos.items()}
+    for d in copia.values():
+        d["promedio_ms"] = d["segundos"] * 1000 / d["llamadas"] if d["llamadas"] else 0.0
+    return copia
+
+
+def reiniciar() -> None:
+    """Borra los contadores (los estados se conservan)."""
+    with _lock:
+        _datos.clear()
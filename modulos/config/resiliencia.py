@@ -0,0 +1,184 @@
+# modulos/config/resiliencia.py
+#
+# Manejo de fallas de la BD para conexion.py:
+#   - clasificar errores en transitorios (red, conexión perdida, bloqueos)
+#     o permanentes (SQL inválido, datos, permisos)
+#   - reintentar lecturas con espera exponencial y jitter
+#   - circuit breaker: tras varias fallas seguidas deja de intentar por un
+#     rato y responde de inmediato con un mensaje claro
+import random
+import threading
+import time
+
+from modulos.config.metricas import contar, fijar_estado
+
+
+class BaseDatosNoDisponible(Exception):
+    """La BD no responde (o el breaker está abierto). Mensaje apto para el usuario."""
+
+    def __init__(self, mensaje: str | None = None):
+        super().__init__(
+            mensaje
+            or "No se pudo conectar con la base de datos. "
+            "Intenta de nuevo en unos segundos; si el problema continúa, "
+            "avisa al administrador."
+        )
+
+
+class ConsultaExcedida(Exception):
+    """
+    La consulta superó su tiempo máximo y se canceló. No es una falla de la
+    BD: repetirla daría lo mismo, así que no se reintenta ni abre el breaker.
+    """
+
+    def __init__(self, categoria: str = "general", limite_seg: float | None = None):
+        self.categoria = categoria
+        self.limite_seg = limite_seg
+        super().__init__(
+            "La consulta tardó demasiado y se canceló: el reporte es demasiado "
+            "grande. Reduce el rango de fechas (o el número de grupos) e "
+            "intenta de nuevo."
+        )
+
+
+# Códigos de MySQL que indican una falla pasajera
+_ERRNOS_TRANSITORIOS = {
+    1040,  # Too many connections
+    1053,  # Server shutdown in progress
+    1205,  # Lock wait timeout
+    1213,  # Deadlock
+    2002,  # Can't connect (socket)
+    2003,  # Can't connect (TCP)
+    2006,  # Server has gone away
+    2013,  # Lost connection during query
+    2055,  # Lost connection (system error)
+}
+
+
+def es_transitorio(exc: BaseException) -> bool:
+    """True si vale la pena reintentar: la misma operación podría funcionar luego."""
+    if isinstance(exc, BaseDatosNoDisponible):
+        return True
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if getattr(exc, "errno", None) in _ERRNOS_TRANSITORIOS:
+        return True
+    # sqlite3: base ocupada por otro proceso
+    mensaje = str(exc).lower()
+    return type(exc).__name__ == "OperationalError" and (
+        "locked" in mensaje or "busy" in mensaje
+    )
+
+
+# -------------------------------------------------------------------
+# CIRCUIT BREAKER
+# cerrado    -> todo pasa; cuenta fallas transitorias seguidas
+# abierto    -> rechaza de inmediato durante 'espera_seg'
+# semiabierto -> deja pasar una prueba; si funciona se cierra, si no se abre
+# -------------------------------------------------------------------
+class Breaker:
+    def __init__(self, nombre: str, umbral: int = 5, espera_seg: float = 30.0):
+        self.nombre = nombre
+        self.umbral = umbral
+        self.espera_seg = espera_seg
+        self._lock = threading.Lock()
+        self._fallas = 0
+        self._abierto_desde: float | None = None
+        self._prueba_en_curso = False
+        fijar_estado(self.nombre, "cerrado")
+
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado()
+
+    def _estado(self) -> str:
+        if self._abierto_desde is None:
+            return "cerrado"
+        if time.monotonic() - self._abierto_desde >= self.espera_seg:
+            return "semiabierto"
+        return "abierto"
+
+    def permitir(self) -> bool:
+        """
+        Lanza BaseDatosNoDisponible si el breaker no deja pasar la operación.
+        Devuelve True si la operación es la prueba del estado semiabierto: quien
+        la recibe debe llamar a liberar() al terminar, pase lo que pase.
+        """
+        with self._lock:
+            estado = self._estado()
+            if estado == "cerrado":
+                return False
+            if estado == "semiabierto" and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                fijar_estado(self.nombre, "semiabierto")
+                return True
+        contar(f"{self.nombre}_rechazos")
+        raise BaseDatosNoDisponible()
+
+    def liberar(self) -> None:
+        """
+        Suelta la prueba si terminó sin exito() ni falla() (por ejemplo con
+        KeyboardInterrupt); si no, ningún otro intento volvería a pasar.
+        """
+        with self._lock:
+            self._prueba_en_curso = False
+
+    def exito(self) -> None:
+        with self._lock:
+            self._fallas = 0
+            self._prueba_en_curso = False
+            if self._abierto_desde is not None:
+                self._abierto_desde = None
+                fijar_estado(self.nombre, "cerrado")
+
+    def falla(self) -> None:
+        with self._lock:
+            self._fallas += 1
+            if self._prueba_en_curso or self._fallas >= self.umbral:
+                self._abierto_desde = time.monotonic()
+                self._prueba_en_curso = False
+                fijar_estado(self.nombre, "abierto")
+                contar(f"{self.nombre}_aperturas")
+
+
+# -------------------------------------------------------------------
+# REINTENTOS
+# -------------------------------------------------------------------
+_REINTENTOS_LECTURA = 3
+_ESPERA_BASE_SEG = 0.2
+_ESPERA_MAX_SEG = 2.0
+
+
+def _espera(intento: int) -> float:
+    """Backoff exponencial con 'full jitter'."""
+    return random.uniform(0, min(_ESPERA_MAX_SEG, _ESPERA_BASE_SEG * 2 ** (intento - 1)))
+
+
+def protegido(breaker: Breaker, funcion, reintentar: bool = False):
+    """
+    Ejecuta funcion() bajo el breaker. Los errores permanentes se relanzan
+    tal cual. Los transitorios se reintentan (solo si reintentar=True, para
+    operaciones idempotentes como las lecturas) y, si se agotan los
+    intentos, se convierten en BaseDatosNoDisponible.
+    """
+    intentos = _REINTENTOS_LECTURA if reintentar else 1
+    for intento in range(1, intentos + 1):
+        prueba = breaker.permitir()
+        try:
+            resultado = funcion()
+        except Exception as exc:
+            if not es_transitorio(exc):
+                # La BD respondió: el error es de la operación, no de la BD
+                breaker.exito()
+                raise
+            breaker.falla()
+            if intento == intentos:
+                raise BaseDatosNoDisponible() from exc
+            contar("reintentos")
+            time.sleep(_espera(intento))
+        else:
+            breaker.exito()
+            return resultado
+        finally:
+            if prueba:
+                breaker.liberar()
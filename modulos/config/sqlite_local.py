@@ -0,0 +1,217 @@
+# modulos/config/sqlite_local.py
+#
+# Motor SQLite embebido para desarrollo y pruebas de carga sin red.
+# Envuelve sqlite3 con la parte de la API de mysql.connector que usa
+# conexion.py (cursor(dictionary=...), column_names, consume_results...),
+# traduce los marcadores %s a ? y registra las funciones de MySQL que
+# usan las consultas de la app (FIND_IN_SET, DATEDIFF, CURDATE, NOW).
+import datetime as dt
+import re
+import sqlite3
+from pathlib import Path
+
+ESQUEMA = Path(__file__).resolve().parents[2] / "sql" / "esquema_sqlite.sql"
+
+# %s fuera de comillas simples -> ?
+_MARCADOR = re.compile(r"('(?:[^']|'')*')|%s")
+
+
+def _traducir(sql: str) -> str:
+    return _MARCADOR.sub(lambda m: m.group(1) or "?", sql)
+
+
+# -------------------------------------------------------------------
+# Tipos: fechas como date/datetime, igual que mysql.connector
+# -------------------------------------------------------------------
+def _a_fecha(valor: bytes):
+    return dt.date.fromisoformat(valor.decode()[:10])
+
+
+def _a_fecha_hora(valor: bytes):
+    return dt.datetime.fromisoformat(valor.decode())
+
+
+sqlite3.register_adapter(dt.date, lambda d: d.isoformat())
+sqlite3.register_adapter(dt.datetime, lambda d: d.isoformat(sep=" "))
+sqlite3.register_converter("DATE", _a_fecha)
+sqlite3.register_converter("DATETIME", _a_fecha_hora)
+
+
+# -------------------------------------------------------------------
+# Funciones de MySQL
+# -------------------------------------------------------------------
+def _find_in_set(aguja, lista):
+    if aguja is None or lista is None:
+        return None
+    partes = str(lista).split(",")
+    return partes.index(str(aguja)) + 1 if str(aguja) in partes else 0
+
+
+def _datediff(a, b):
+    if a is None or b is None:
+        return None
+    return (dt.date.fromisoformat(str(a)[:10]) - dt.date.fromisoformat(str(b)[:10])).days
+
+
+class _Cursor:
+    def __init__(self, cur: sqlite3.Cursor, dictionary: bool):
+        self._cur = cur
+        self._dictionary = dictionary
+
+    @property
+    def column_names(self) -> tuple:
+        return tuple(d[0] for d in self._cur.description or ())
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def execute(self, sql: str, params=()):
+        self._cur.execute(_traducir(sql), tuple(params or ()))
+
+    def executemany(self, sql: str, filas):
+        self._cur.executemany(_traducir(sql), filas)
+
+    def _fila(self, fila):
+        if fila is None or not self._dictionary:
+            return fila
+        return dict(zip(self.column_names, fila))
+
+    def fetchone(self):
+        return self._fila(self._cur.fetchone())
+
+    def fetchmany(self, tamano: int):
+        return [self._fila(f) for f in self._cur.fetchmany(tamano)]
+
+    def fetchall(self):
+        return [self._fila(f) for f in self._cur.fetchall()]
+
+    def close(self):
+        self._cur.close()
+
+
+class ConexionSQLite:
+    """Conexión SQLite con la interfaz de mysql.connector que usa la app."""
+
+    def __init__(self, ruta: str, timeout: float = 30.0):
+        self._cnx = sqlite3.connect(
+            ruta,
+            timeout=timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        self._cnx.execute("PRAGMA journal_mode = WAL")
+        self._cnx.create_function("FIND_IN_SET", 2, _find_in_set, deterministic=True)
+        self._cnx.create_function("DATEDIFF", 2, _datediff, deterministic=True)
+        self._cnx.create_function("CURDATE", 0, lambda: dt.date.today().isoformat())
+        self._cnx.create_function("NOW", 0, lambda: dt.datetime.now().isoformat(sep=" "))
+        self._abierta = True
+
+    def cursor(self, dictionary: bool = False, buffered: bool = True):
+        return _Cursor(self._cnx.cursor(), dictionary)
+
+    def commit(self):
+        self._cnx.commit()
+
+    def rollback(self):
+        self._cnx.rollback()
+
+    def consume_results(self):
+        # sqlite3 no deja resultados pendientes en la conexión
+        pass
+
+    def interrupt(self):
+        self._cnx.interrupt()
+
+    def is_connected(self) -> bool:
+        return self._abierta
+
+    def close(self):
+        if self._abierta:
+            self._cnx.close()
+            self._abierta = False
+
+
+def inicializar(ruta: str) -> None:
+    """Crea las tablas del esquema traducido si todavía no existen."""
+    cnx = sqlite3.connect(ruta)
+    try:
+        cnx.executescript(ESQUEMA.read_text(encoding="utf-8"))
+        # Bases creadas antes de que la clave se llamara como en MySQL
+        columnas = {f[1] for f in cnx.execute("PRAGMA table_info(cierres_ciclo_miembros)")}
+        if "Id_detalle" in columnas:
+            cnx.execute(
+                "ALTER TABLE cierres_ciclo_miembros RENAME COLUMN Id_detalle TO Id_cierre_miembro"
+            )
+        cnx.commit()
+    finally:
+        cnx.close()
+
+
+# -------------------------------------------------------------------
+# Verificación del esquema contra las consultas de la app
+#   python -m modulos.config.sqlite_local
+# Ejecuta cada consulta de consultas.py (con NULL en cada parámetro)
+# sobre una base nueva y revierte: falla si alguna nombra una tabla o
+# columna que el esquema no tiene. Las violaciones de NOT NULL por los
+# parámetros de prueba no cuentan.
+# -------------------------------------------------------------------
+def verificar_consultas() -> dict[str, str]:
+    """Devuelve {nombre de la consulta: error} (vacío si todas corren)."""
+    import os
+    import tempfile
+
+    from modulos.config.consultas import CONSULTAS
+
+    carpeta = tempfile.mkdtemp(prefix="gapc_esquema_")
+    ruta = os.path.join(carpeta, "verificar.db")
+    errores = {}
+    try:
+        inicializar(ruta)
+        cnx = ConexionSQLite(ruta)
+        try:
+            for nombre, sql in CONSULTAS.items():
+                marcadores = sum(1 for m in _MARCADOR.finditer(sql) if not m.group(1))
+                cur = cnx.cursor()
+                try:
+                    cur.execute(sql, (None,) * marcadores)
+                    cur.fetchall()
+                except sqlite3.IntegrityError:
+                    # NOT NULL / FK con los NULL de prueba: la sentencia sí compiló
+                    pass
+                except sqlite3.Error as e:
+                    errores[nombre] = str(e)
+                finally:
+                    cur.close()
+                    cnx.rollback()
+        finally:
+            cnx.close()
+    finally:
+        for archivo in os.listdir(carpeta):
+            os.remove(os.path.join(carpeta, archivo))
+        os.rmdir(carpeta)
+    return errores
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    argparse.ArgumentParser(
+        description="Verifica que las consultas de consultas.py corran sobre el esquema SQLite."
+    ).parse_args(argv)
+    errores = verificar_consultas()
+    for nombre, error in errores.items():
+        print(f"{nombre}: {error}")
+    if errores:
+        print(f"{len(errores)} consulta(s) con errores.")
+        sys.exit(1)
+    print("Todas las consultas corren sobre el esquema SQLite.")
+
+
+if __name__ == "__main__":
+    main()
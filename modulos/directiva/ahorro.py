@@ -0,0 +1,225 @@
+# modulos/directiva/ahorro.py
+
+import pandas as pd
+import streamlit as st
+
+from modulos.config.conexion import transaccion, update_en_lote, insert_en_lote
+from modulos.config.consultas import todos
+from modulos.directiva.comun import (
+    obtener_reglamento_por_grupo,
+    obtener_miembros_grupo,
+    obtener_reuniones_de_grupo,
+    obtener_reunion_por_id,
+    monto_cambio,
+)
+
+
+# -------------------------------------------------------
+# Sección: Ahorro final
+# Tabla: ahorros_miembros
+# -------------------------------------------------------
+def _obtener_ahorros_de_reunion(id_grupo: int, id_reunion: int):
+    return todos("ahorros_de_reunion", (id_grupo, id_reunion))
+
+
+def _obtener_ultimos_saldos_grupo(id_grupo: int) -> dict[int, float]:
+    """
+    Último Saldo_final registrado de cada miembro del grupo (por reunión más
+    reciente), en una sola consulta: {Id_miembro: saldo}.
+    """
+    return {
+        f["Id_miembro"]: float(f["Saldo_final"] or 0.0)
+        for f in todos("ahorros_ultimos_saldos", (id_grupo,))
+    }
+
+
+def seccion_ahorro_final(info_dir: dict):
+    st.subheader("Ahorro final")
+
+    id_grupo = info_dir["Id_grupo"]
+    reuniones = obtener_reuniones_de_grupo(id_grupo)
+    miembros = obtener_miembros_grupo(id_grupo)
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+
+    if not miembros:
+        st.info("Primero debes registrar miembros.")
+        return
+
+    if not reuniones:
+        st.info("Todavía no hay reuniones registradas. Crea al menos una en Asistencia.")
+        return
+
+    ahorro_minimo = 0.0
+    if reglamento and reglamento.get("Ahorro_minimo") is not None:
+        try:
+            ahorro_minimo = float(reglamento["Ahorro_minimo"])
+        except Exception:
+            ahorro_minimo = 0.0
+
+    opciones_reu = {
+        f"{r['Fecha']} - Reunión {r['Numero_reunion']} ({r['Tema']})": r["Id_reunion"]
+        for r in reuniones
+    }
+
+    st.markdown("### Seleccionar reunión para registrar ahorros")
+
+    id_reunion_sel = st.selectbox(
+        "Reunión",
+        list(opciones_reu.values()),
+        format_func=lambda rid: next(
+            k for k, v in opciones_reu.items() if v == rid
+        ),
+        key="reunion_ahorro",
+    )
+
+    info_reu = obtener_reunion_por_id(id_reunion_sel)
+    st.markdown(
+        f"Reunión seleccionada: **Id_reunion = {id_reunion_sel}**, "
+        f"Fecha: **{info_reu['Fecha']}**, Tema: **{info_reu['Tema']}**"
+    )
+
+    registros = _obtener_ahorros_de_reunion(id_grupo, id_reunion_sel)
+    registros_dict = {r["Id_miembro"]: r for r in registros}
+    ultimos_saldos = _obtener_ultimos_saldos_grupo(id_grupo)
+
+    st.markdown("### Registro de ahorros por miembro")
+
+    # Saldo inicial: el registrado, o el último saldo del miembro,
+    # o el ahorro mínimo del reglamento si todavía no tiene saldo
+    filas = []
+    for m in miembros:
+        mid = m["Id_miembro"]
+        previo = registros_dict.get(mid)
+        if previo:
+            saldo_inicial = float(previo["Saldo_inicial"])
+        else:
+            saldo_prev = ultimos_saldos.get(mid, 0.0)
+            saldo_inicial = saldo_prev if saldo_prev > 0 else ahorro_minimo
+        filas.append(
+            {
+                "Id_miembro": mid,
+                "Miembro": f"{m['Nombre']} ({m['Cargo']})",
+                "Saldo inicial": saldo_inicial,
+                "Ahorro": float(previo["Ahorro"]) if previo else 0.0,
+                "Otras actividades": float(previo["Otras_actividades"]) if previo else 0.0,
+                "Retiros": float(previo["Retiros"]) if previo else 0.0,
+            }
+        )
+
+    # Una sola tabla editable en lugar de tres campos por miembro
+    with st.form("form_ahorro_final"):
+        editado = st.data_editor(
+            pd.DataFrame(filas),
+            key=f"editor_ahorro_{id_reunion_sel}",
+            hide_index=True,
+            use_container_width=True,
+            num_rows="fixed",
+            disabled=["Id_miembro", "Miembro", "Saldo inicial"],
+            column_config={
+                "Id_miembro": None,
+                "Saldo inicial": st.column_config.NumberColumn(format="$%.2f"),
+                "Ahorro": st.column_config.NumberColumn(min_value=0.0, step=0.5, format="%.2f"),
+                "Otras actividades": st.column_config.NumberColumn(
+                    min_value=0.0, step=0.5, format="%.2f"
+                ),
+                "Retiros": st.column_config.NumberColumn(min_value=0.0, step=0.5, format="%.2f"),
+            },
+        )
+        st.caption("Saldo final = saldo inicial + ahorro + otras actividades - retiros.")
+        guardar_ahorros = st.form_submit_button("Guardar ahorros de la reunión")
+
+    if guardar_ahorros:
+        datos_form = {}
+        for f in editado.fillna(0.0).to_dict("records"):
+            saldo_inicial = float(f["Saldo inicial"])
+            ahorro = float(f["Ahorro"])
+            otras = float(f["Otras actividades"])
+            retiros = float(f["Retiros"])
+            mid = int(f["Id_miembro"])
+            previo = registros_dict.get(mid)
+            datos_form[mid] = {
+                "saldo_inicial": saldo_inicial,
+                "ahorro": ahorro,
+                "otras": otras,
+                "retiros": retiros,
+                "saldo_final": saldo_inicial + ahorro + otras - retiros,
+                "existente": previo["Id_ahorro"] if previo else None,
+            }
+
+        # Miembros sin registro se insertan; los existentes solo si cambiaron
+        nuevos = []
+        cambiados = []
+        for mid, info_m in datos_form.items():
+            previo = registros_dict.get(mid)
+            if not previo:
+                nuevos.append(
+                    (
+                        id_grupo,
+                        id_reunion_sel,
+                        mid,
+                        info_m["saldo_inicial"],
+                        info_m["ahorro"],
+                        info_m["otras"],
+                        info_m["retiros"],
+                        info_m["saldo_final"],
+                    )
+                )
+            elif (
+                monto_cambio(previo["Ahorro"], info_m["ahorro"])
+                or monto_cambio(previo["Otras_actividades"], info_m["otras"])
+                or monto_cambio(previo["Retiros"], info_m["retiros"])
+                or monto_cambio(previo["Saldo_final"], info_m["saldo_final"])
+            ):
+                cambiados.append(
+                    {
+                        "Id_ahorro": info_m["existente"],
+                        "Ahorro": info_m["ahorro"],
+                        "Otras_actividades": info_m["otras"],
+                        "Retiros": info_m["retiros"],
+                        "Saldo_final": info_m["saldo_final"],
+                    }
+                )
+
+        if not nuevos and not cambiados:
+            st.info("No hay cambios en los ahorros.")
+        else:
+            with transaccion() as cur:
+                insert_en_lote(
+                    cur,
+                    "ahorros_miembros",
+                    [
+                        "Id_grupo", "Id_reunion", "Id_miembro", "Saldo_inicial",
+                        "Ahorro", "Otras_actividades", "Retiros", "Saldo_final",
+                    ],
+                    nuevos,
+                )
+                update_en_lote(
+                    cur,
+                    "ahorros_miembros",
+                    "Id_ahorro",
+                    ["Ahorro", "Otras_actividades", "Retiros", "Saldo_final"],
+                    cambiados,
+                )
+
+            st.success("Ahorros guardados correctamente.")
+            st.rerun()
+
+    # ---- Resumen por reunión ----
+    st.markdown("### Resumen de ahorros de la reunión")
+
+    registros = _obtener_ahorros_de_reunion(id_grupo, id_reunion_sel)
+    if registros:
+        st.table(registros)
+
+        total_ahorro = sum(float(r["Ahorro"]) for r in registros)
+        total_otras = sum(float(r["Otras_actividades"]) for r in registros)
+        total_retiros = sum(float(r["Retiros"]) for r in registros)
+        total_saldo_final = sum(float(r["Saldo_final"]) for r in registros)
+
+        st.write(f"**Totales del grupo en la reunión {id_reunion_sel}:**")
+        st.write(f"- Total ahorro: **${total_ahorro:.2f}**")
+        st.write(f"- Total otras actividades: **${total_otras:.2f}**")
+        st.write(f"- Total retiros: **${total_retiros:.2f}**")
+        st.write(f"- Total saldo final del grupo: **${total_saldo_final:.2f}**")
+    else:
+        st.info("Todavía no hay ahorros registrados para esta reunión.")
@@ -0,0 +1,264 @@
+# modulos/directiva/asistencia.py
+
+import datetime as dt
+import pandas as pd
+import streamlit as st
+
+from modulos.config.conexion import (
+    fetch_one,
+    execute,
+    transaccion,
+    update_en_lote,
+    insert_en_lote,
+    en_paralelo,
+)
+from modulos.config.consultas import todos
+from modulos.directiva.comun import (
+    invalidar_datos_grupo,
+    obtener_reglamento_por_grupo,
+    obtener_miembros_grupo,
+    obtener_reuniones_de_grupo,
+    obtener_reunion_por_id,
+)
+
+
+# -------------------------------------------------------
+# Sección: Asistencia (con multas automáticas)
+# -------------------------------------------------------
+def _obtener_asistencia_de_reunion(id_reunion: int):
+    return todos("asistencia_de_reunion", (id_reunion,))
+
+
+def _crear_multas_inasistencia(
+    cur,
+    id_grupo: int,
+    ids_miembro: list[int],
+    fecha_multa: dt.date,
+    monto_multa: float,
+):
+    """
+    Crea multas por inasistencia para los miembros indicados, omitiendo a
+    quienes ya tienen una multa en ese grupo y fecha. Usa el cursor de la
+    transacción que guarda la asistencia.
+    """
+    if monto_multa <= 0 or not ids_miembro:
+        return
+
+    marcadores = ", ".join(["%s"] * len(ids_miembro))
+    cur.execute(
+        f"""
+        SELECT Id_miembro
+        FROM multas_miembro
+        WHERE Id_grupo = %s AND Fecha_multa = %s
+          AND Id_miembro IN ({marcadores})
+        """,
+        (id_grupo, fecha_multa, *ids_miembro),
+    )
+    con_multa = {f["Id_miembro"] for f in cur.fetchall()}
+
+    insert_en_lote(
+        cur,
+        "multas_miembro",
+        ["Id_grupo", "Id_miembro", "Fecha_multa", "Monto", "Pagada", "Fecha_pago"],
+        [
+            (id_grupo, mid, fecha_multa, monto_multa, 0, None)
+            for mid in ids_miembro
+            if mid not in con_multa
+        ],
+    )
+
+
+def seccion_asistencia(info_dir: dict):
+    st.subheader("Asistencia")
+
+    id_grupo = info_dir["Id_grupo"]
+    reuniones = obtener_reuniones_de_grupo(id_grupo)
+    miembros = obtener_miembros_grupo(id_grupo)
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+
+    if not miembros:
+        st.info("Primero debes registrar miembros.")
+        return
+
+    st.markdown("#### 1. Seleccionar o crear reunión")
+
+    # ---- Select de reuniones existentes ----
+    id_reunion_sel = None
+    opciones_reu = {}
+    if reuniones:
+        opciones_reu = {
+            f"{r['Fecha']} - Reunión {r['Numero_reunion']} ({r['Tema']})": r[
+                "Id_reunion"
+            ]
+            for r in reuniones
+        }
+        id_reunion_sel = st.selectbox(
+            "Reuniones creadas",
+            list(opciones_reu.values()),
+            format_func=lambda rid: next(
+                k for k, v in opciones_reu.items() if v == rid
+            ),
+            key="reunion_existente",
+        )
+
+    st.markdown("##### Crear nueva reunión")
+
+    with st.form("form_reunion"):
+        col1, col2 = st.columns(2)
+        with col1:
+            fecha = st.date_input(
+                "Fecha de la reunión", value=dt.date.today(), key="fecha_reu_nueva"
+            )
+        with col2:
+            numero = st.number_input(
+                "Número de reunión", min_value=1, step=1, value=1, key="num_reu_nueva"
+            )
+        tema = st.text_input("Tema / Comentarios de la reunión", "", key="tema_reu")
+        btn_crear_reunion = st.form_submit_button("Crear reunión")
+
+    if btn_crear_reunion:
+        sql_busca = """
+        SELECT Id_reunion
+        FROM reuniones_grupo
+        WHERE Id_grupo = %s AND Fecha = %s AND Numero_reunion = %s
+        LIMIT 1
+        """
+        existente = fetch_one(sql_busca, (id_grupo, fecha, numero))
+        if existente:
+            id_reunion_sel = existente["Id_reunion"]
+        else:
+            sql_ins = """
+            INSERT INTO reuniones_grupo (Fecha, Numero_reunion, Tema, Id_grupo)
+            VALUES (%s, %s, %s, %s)
+            """
+            execute(sql_ins, (fecha, numero, tema.strip(), id_grupo))
+            existente = fetch_one(sql_busca, (id_grupo, fecha, numero))
+            id_reunion_sel = existente["Id_reunion"]
+            invalidar_datos_grupo(id_grupo)
+
+        st.session_state["reunion_abierta"] = id_reunion_sel
+        st.success(f"Reunión creada (Id_reunion = {id_reunion_sel}).")
+        st.rerun()
+
+    # Si hay en session_state, tiene prioridad
+    id_reunion_sel = st.session_state.get("reunion_abierta") or id_reunion_sel
+
+    if not id_reunion_sel:
+        st.info("Selecciona una reunión existente o crea una nueva.")
+        return
+
+    lecturas = en_paralelo(
+        {
+            "reunion": lambda: obtener_reunion_por_id(id_reunion_sel),
+            "asistencia": lambda: _obtener_asistencia_de_reunion(id_reunion_sel),
+        }
+    )
+    info_reu = lecturas["reunion"]
+    st.markdown(
+        f"**Reunión actual:** Id_reunion = {id_reunion_sel} — Fecha: {info_reu['Fecha']} — "
+        f"N° {info_reu['Numero_reunion']} — {info_reu['Tema']}"
+    )
+
+    # ---- Formulario de asistencia ----
+    st.markdown("#### 2. Marcar asistencia de miembros")
+
+    registros = lecturas["asistencia"]
+    presentes_dict = {r["Id_miembro"]: bool(r["Presente"]) for r in registros}
+    ids_asistencia = {r["Id_miembro"]: r["Id_asistencia"] for r in registros}
+
+    tabla = pd.DataFrame(
+        [
+            {
+                "Id_miembro": m["Id_miembro"],
+                "Miembro": m["Nombre"],
+                "Cargo": m["Cargo"],
+                "Sexo": m["Sexo"],
+                "Presente": presentes_dict.get(m["Id_miembro"], False),
+            }
+            for m in miembros
+        ]
+    )
+
+    with st.form("form_asistencia_miembros"):
+        editado = st.data_editor(
+            tabla,
+            key=f"editor_asistencia_{id_reunion_sel}",
+            hide_index=True,
+            use_container_width=True,
+            num_rows="fixed",
+            disabled=["Id_miembro", "Miembro", "Cargo", "Sexo"],
+            column_config={
+                "Id_miembro": None,
+                "Presente": st.column_config.CheckboxColumn(default=False),
+            },
+        )
+        guardar_asistencia = st.form_submit_button("Guardar asistencia")
+
+    if guardar_asistencia:
+        nuevos_presentes: dict[int, bool] = {
+            int(mid): bool(presente)
+            for mid, presente in zip(editado["Id_miembro"], editado["Presente"].fillna(False))
+        }
+
+        monto_multa = 0.0
+        if reglamento and reglamento.get("Monto_multa") is not None:
+            try:
+                monto_multa = float(reglamento["Monto_multa"])
+            except Exception:
+                monto_multa = 0.0
+
+        # Solo se escribe lo que cambió respecto a lo cargado:
+        # miembros sin registro se insertan, los demás se actualizan si cambiaron
+        nuevos = []
+        cambiados = []
+        ausentes = []
+        for mid, presente in nuevos_presentes.items():
+            if mid not in ids_asistencia:
+                nuevos.append((id_reunion_sel, mid, 1 if presente else 0))
+            elif presentes_dict[mid] != presente:
+                cambiados.append(
+                    {"Id_asistencia": ids_asistencia[mid], "Presente": 1 if presente else 0}
+                )
+            else:
+                continue
+            if not presente:
+                ausentes.append(mid)
+
+        if not nuevos and not cambiados:
+            st.info("No hay cambios en la asistencia.")
+        else:
+            with transaccion() as cur:
+                insert_en_lote(
+                    cur,
+                    "asistencia_miembro",
+                    ["Id_reunion", "Id_miembro", "Presente"],
+                    nuevos,
+                )
+                update_en_lote(
+                    cur, "asistencia_miembro", "Id_asistencia", ["Presente"], cambiados
+                )
+
+                # Multa automática por inasistencia (solo a quienes quedaron ausentes)
+                if ausentes and monto_multa > 0 and info_reu:
+                    _crear_multas_inasistencia(
+                        cur, id_grupo, ausentes, info_reu["Fecha"], monto_multa
+                    )
+
+            st.success(
+                "Asistencia guardada correctamente (y multas de inasistencia generadas)."
+            )
+            st.rerun()
+
+    # ---- Resumen de la reunión ----
+    st.markdown("#### 3. Resumen de asistencia")
+
+    registros = _obtener_asistencia_de_reunion(id_reunion_sel)
+    if registros:
+        st.table(registros)
+        total = len(registros)
+        presentes = sum(1 for r in registros if r["Presente"])
+        st.write(f"Fecha de la reunión: **{info_reu['Fecha']}**")
+        st.write(f"Total de miembros registrados: **{total}**")
+        st.write(f"Asistieron: **{presentes}** — No asistieron: **{total - presentes}**")
+    else:
+        st.info("Todavía no se ha registrado asistencia para esta reunión.")
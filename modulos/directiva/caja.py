@@ -0,0 +1,268 @@
+# modulos/directiva/caja.py
+
+import datetime as dt
+import streamlit as st
+
+from modulos.config.conexion import fetch_one, en_paralelo, transaccion
+from modulos.config.consultas import uno
+from modulos.reportes.motor import invalidar_caja
+from modulos.directiva.comun import obtener_reuniones_de_grupo, obtener_reunion_por_id
+from modulos.directiva.recalculo_caja import recalcular_desde
+
+
+# -------------------------------------------------------
+# Helpers de Caja
+# -------------------------------------------------------
+def _obtener_caja_por_reunion(id_grupo: int, id_reunion: int) -> dict | None:
+    return uno("caja_de_reunion", (id_grupo, id_reunion))
+
+
+def _sumar_float(sql: str, params=()) -> float:
+    """Ejecuta un SUM(...) AS suma y devuelve 0.0 si es NULL."""
+    fila = fetch_one(sql, params)
+    if not fila or fila.get("suma") is None:
+        return 0.0
+    try:
+        return float(fila["suma"])
+    except Exception:
+        return 0.0
+
+
+def _obtener_saldo_cierre_anterior(
+    id_grupo: int, fecha_reunion: dt.date, numero_reunion: int | None
+) -> float:
+    """
+    Devuelve el saldo de cierre de la caja de la reunión inmediatamente anterior
+    (por fecha y número de reunión) para el grupo. Si no hay, devuelve 0.
+    """
+    fila = uno("caja_saldo_anterior", (id_grupo, fecha_reunion, numero_reunion or 0))
+    if fila and fila.get("saldo") is not None:
+        try:
+            return float(fila["saldo"])
+        except Exception:
+            return 0.0
+    return 0.0
+
+
+# -------------------------------------------------------
+# Sección: Caja
+# Tabla: caja_reunion
+# -------------------------------------------------------
+def seccion_caja(info_dir: dict):
+    st.subheader("Caja")
+
+    id_grupo = info_dir["Id_grupo"]
+    reuniones = obtener_reuniones_de_grupo(id_grupo)
+
+    if not reuniones:
+        st.info("Todavía no hay reuniones registradas. Crea al menos una en Asistencia.")
+        return
+
+    opciones_reu = {
+        f"{r['Fecha']} - Reunión {r['Numero_reunion']} ({r['Tema']})": r["Id_reunion"]
+        for r in reuniones
+    }
+
+    st.markdown("### Seleccionar reunión para ver la caja")
+
+    id_reunion_sel = st.selectbox(
+        "Reunión",
+        list(opciones_reu.values()),
+        format_func=lambda rid: next(
+            k for k, v in opciones_reu.items() if v == rid
+        ),
+        key="reunion_caja",
+    )
+
+    info_reu = obtener_reunion_por_id(id_reunion_sel)
+    fecha_reu = info_reu["Fecha"]
+
+    st.markdown(
+        f"Reunión seleccionada: **{fecha_reu}** — N° {info_reu['Numero_reunion']} — {info_reu['Tema']}"
+    )
+
+    # Todas las lecturas de la caja son independientes: se hacen en paralelo
+    lecturas = en_paralelo(
+        {
+            # Caja existente (si ya se guardó antes)
+            "caja": lambda: _obtener_caja_por_reunion(id_grupo, id_reunion_sel),
+            "saldo_anterior": lambda: _obtener_saldo_cierre_anterior(
+                id_grupo, fecha_reu, info_reu["Numero_reunion"]
+            ),
+            # ---- DINERO QUE ENTRA (automático) ----
+            "multas_pagadas": lambda: _sumar_float(
+                """
+                SELECT SUM(Monto) AS suma
+                FROM multas_miembro
+                WHERE Id_grupo = %s AND Pagada = 1 AND Fecha_pago = %s
+                """,
+                (id_grupo, fecha_reu),
+            ),
+            "ahorros": lambda: _sumar_float(
+                """
+                SELECT SUM(Ahorro) AS suma
+                FROM ahorros_miembros
+                WHERE Id_grupo = %s AND Id_reunion = %s
+                """,
+                (id_grupo, id_reunion_sel),
+            ),
+            "otras_act": lambda: _sumar_float(
+                """
+                SELECT SUM(Otras_actividades) AS suma
+                FROM ahorros_miembros
+                WHERE Id_grupo = %s AND Id_reunion = %s
+                """,
+                (id_grupo, id_reunion_sel),
+            ),
+            "pagos_prestamos": lambda: _sumar_float(
+                """
+                SELECT SUM(pp.Capital_pagado + pp.Interes_pagado) AS suma
+                FROM pagos_prestamo pp
+                JOIN prestamos_miembro p ON p.Id_prestamo = pp.Id_prestamo
+                WHERE p.Id_grupo = %s AND pp.Fecha_programada = %s
+                """,
+                (id_grupo, fecha_reu),
+            ),
+            # ---- DINERO QUE SALE (automático) ----
+            "retiros_ahorros": lambda: _sumar_float(
+                """
+                SELECT SUM(Retiros) AS suma
+                FROM ahorros_miembros
+                WHERE Id_grupo = %s AND Id_reunion = %s
+                """,
+                (id_grupo, id_reunion_sel),
+            ),
+            "desembolsos_prestamos": lambda: _sumar_float(
+                """
+                SELECT SUM(Monto) AS suma
+                FROM prestamos_miembro
+                WHERE Id_grupo = %s AND Fecha_prestamo = %s
+                """,
+                (id_grupo, fecha_reu),
+            ),
+        }
+    )
+    caja = lecturas["caja"]
+    multas_pagadas = lecturas["multas_pagadas"]
+    ahorros = lecturas["ahorros"]
+    otras_act = lecturas["otras_act"]
+    pagos_prestamos = lecturas["pagos_prestamos"]
+    retiros_ahorros = lecturas["retiros_ahorros"]
+    desembolsos_prestamos = lecturas["desembolsos_prestamos"]
+
+    # Saldo de apertura: si ya hay caja guardada, usamos ese; si no, el cierre anterior
+    if caja:
+        saldo_apertura = float(caja["Saldo_apertura"])
+        otros_ingresos_default = float(caja["Otros_ingresos"])
+        otros_gastos_default = float(caja["Otros_gastos"])
+    else:
+        saldo_apertura = lecturas["saldo_anterior"]
+        otros_ingresos_default = 0.0
+        otros_gastos_default = 0.0
+
+    # ---- Formulario para otros ingresos/gastos y guardar ----
+    with st.form("form_caja"):
+        st.markdown("### Dinero que entra")
+        st.write(f"- Multas pagadas: **${multas_pagadas:.2f}**")
+        st.write(f"- Ahorros: **${ahorros:.2f}**")
+        st.write(f"- Otras actividades: **${otras_act:.2f}**")
+        st.write(
+            f"- Pago de préstamos (capital e interés): **${pagos_prestamos:.2f}**"
+        )
+
+        otros_ingresos = st.number_input(
+            "Otros ingresos del grupo",
+            min_value=0.0,
+            step=1.0,
+            format="%.2f",
+            value=otros_ingresos_default,
+        )
+
+        total_entradas = (
+            multas_pagadas + ahorros + otras_act + pagos_prestamos + otros_ingresos
+        )
+
+        st.write(f"**Total dinero que entra:** ${total_entradas:.2f}**")
+
+        st.markdown("### Dinero que sale")
+        st.write(f"- Retiro de ahorros: **${retiros_ahorros:.2f}**")
+        st.write(f"- Desembolso de préstamos: **${desembolsos_prestamos:.2f}**")
+
+        otros_gastos = st.number_input(
+            "Otros gastos del grupo",
+            min_value=0.0,
+            step=1.0,
+            format="%.2f",
+            value=otros_gastos_default,
+        )
+
+        total_salidas = retiros_ahorros + desembolsos_prestamos + otros_gastos
+
+        st.write(f"**Total dinero que sale:** ${total_salidas:.2f}**")
+
+        saldo_despues_entradas = saldo_apertura + total_entradas
+        saldo_cierre = saldo_despues_entradas - total_salidas
+
+        st.markdown("### Resumen de caja")
+        st.write(f"Saldo de apertura: **${saldo_apertura:.2f}**")
+        st.write(f"Saldo después de que entra dinero: **${saldo_despues_entradas:.2f}**")
+        st.write(f"Saldo de cierre: **${saldo_cierre:.2f}**")
+
+        btn_guardar_caja = st.form_submit_button("Guardar caja de la reunión")
+
+    if btn_guardar_caja:
+        valores = (
+            saldo_apertura,
+            multas_pagadas,
+            ahorros,
+            otras_act,
+            pagos_prestamos,
+            otros_ingresos,
+            total_entradas,
+            retiros_ahorros,
+            desembolsos_prestamos,
+            otros_gastos,
+            total_salidas,
+            saldo_cierre,
+        )
+        # La caja y los saldos de las reuniones posteriores se confirman juntos
+        with transaccion() as cur:
+            if caja:
+                sql_up = """
+                UPDATE caja_reunion
+                SET Saldo_apertura = %s,
+                    Multas = %s,
+                    Ahorros = %s,
+                    Otras_actividades = %s,
+                    Pagos_prestamos = %s,
+                    Otros_ingresos = %s,
+                    Total_entradas = %s,
+                    Retiros_ahorros = %s,
+                    Desembolsos_prestamos = %s,
+                    Otros_gastos = %s,
+                    Total_salidas = %s,
+                    Saldo_cierre = %s
+                WHERE Id_caja = %s
+                """
+                cur.execute(sql_up, (*valores, caja["Id_caja"]))
+                id_caja = caja["Id_caja"]
+            else:
+                sql_ins = """
+                INSERT INTO caja_reunion (
+                    Id_grupo, Id_reunion,
+                    Saldo_apertura,
+                    Multas, Ahorros, Otras_actividades, Pagos_prestamos,
+                    Otros_ingresos, Total_entradas,
+                    Retiros_ahorros, Desembolsos_prestamos, Otros_gastos,
+                    Total_salidas, Saldo_cierre
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                cur.execute(sql_ins, (id_grupo, id_reunion_sel, *valores))
+                id_caja = cur.lastrowid
+
+            recalcular_desde(cur, id_caja)
+
+        invalidar_caja(id_grupo)
+        st.success("Caja de la reunión guardada correctamente.")
+        st.rerun()
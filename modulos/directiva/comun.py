@@ -0,0 +1,171 @@
+# modulos/directiva/comun.py
+#
+# Datos y helpers que comparten las secciones del panel de directiva.
+
+from modulos.config.conexion import fetch_all, en_paralelo
+from modulos.config.consultas import uno
+from modulos.auth.perfil import perfil_actual
+from modulos.config.cache import obtener_sesion, guardar_sesion, invalidar
+from modulos.reportes.ciclos import cierres_de_grupo
+
+
+# Valores válidos al registrar miembros (formulario e importación)
+CARGOS = [
+    "Presidenta",
+    "Secretaria",
+    "Tesorera",
+    "Vocal",
+    "Comité de crédito",
+    "Comité de educación",
+    "Asociado",
+]
+SEXOS = ["Femenino", "Masculino", "Otro"]
+
+
+# -------------------------------------------------------
+# Datos base por grupo (reglamento, miembros, reuniones)
+# Se precargan en sesión para todos los grupos de la directiva
+# con una consulta por tabla, y se invalidan al escribir.
+# -------------------------------------------------------
+# Respaldo por si los datos se escribieron desde otro proceso (otro
+# servidor o las herramientas de línea de comandos, como historial.py)
+_DATOS_GRUPO_TTL_SEG = 300
+
+
+def etiqueta_grupo(id_grupo: int) -> str:
+    return f"grupo:{id_grupo}"
+
+
+def invalidar_datos_grupo(id_grupo: int) -> None:
+    """Llamar después de guardar reglamento, miembros o reuniones del grupo."""
+    invalidar(etiqueta_grupo(id_grupo))
+
+
+def _precargar_datos_grupos(ids_grupo: list[int]) -> dict[int, dict]:
+    """
+    Trae reglamento, miembros y reuniones de varios grupos a la vez
+    (una consulta por tabla para todos los grupos) y los separa por grupo.
+    """
+    marcas = ", ".join(["%s"] * len(ids_grupo))
+    params = tuple(ids_grupo)
+
+    lecturas = en_paralelo(
+        {
+            "reglamentos": lambda: fetch_all(
+                f"""
+                SELECT *
+                FROM reglamento_grupo
+                WHERE Id_grupo IN ({marcas})
+                ORDER BY Id_grupo, Id_reglamento
+                """,
+                params,
+            ),
+            "miembros": lambda: fetch_all(
+                f"""
+                SELECT
+                    Id_grupo,
+                    Id_miembro,
+                    Nombre,
+                    DUI,
+                    Cargo,
+                    Sexo
+                FROM miembros
+                WHERE Id_grupo IN ({marcas})
+                ORDER BY Cargo, Nombre
+                """,
+                params,
+            ),
+            "reuniones": lambda: fetch_all(
+                f"""
+                SELECT
+                    Id_grupo,
+                    Id_reunion,
+                    Fecha,
+                    Numero_reunion,
+                    Tema
+                FROM reuniones_grupo
+                WHERE Id_grupo IN ({marcas})
+                ORDER BY Fecha, Numero_reunion
+                """,
+                params,
+            ),
+        }
+    )
+    reglamentos = lecturas["reglamentos"]
+    miembros = lecturas["miembros"]
+    reuniones = lecturas["reuniones"]
+
+    datos = {gid: {"reglamento": None, "miembros": [], "reuniones": []} for gid in ids_grupo}
+    for r in reglamentos:
+        if datos[r["Id_grupo"]]["reglamento"] is None:
+            datos[r["Id_grupo"]]["reglamento"] = r
+    for m in miembros:
+        gid = m.pop("Id_grupo")
+        datos[gid]["miembros"].append(m)
+    for r in reuniones:
+        gid = r.pop("Id_grupo")
+        datos[gid]["reuniones"].append(r)
+    return datos
+
+
+def _copia(datos: dict) -> dict:
+    # Copia de las listas y filas: quien las modifique no altera la cache
+    return {
+        "reglamento": dict(datos["reglamento"]) if datos["reglamento"] else None,
+        "miembros": [dict(m) for m in datos["miembros"]],
+        "reuniones": [dict(r) for r in datos["reuniones"]],
+    }
+
+
+def datos_grupo(id_grupo: int) -> dict:
+    """
+    Devuelve {"reglamento", "miembros", "reuniones"} del grupo (una copia)
+    desde la cache de sesión. Si falta o caducó, precarga de una vez todos
+    los grupos de la directiva que no estén vigentes en cache, para que
+    cambiar de grupo no sea una carga en frío.
+    """
+    clave = f"datos_grupo:{id_grupo}"
+    datos = obtener_sesion(clave, _DATOS_GRUPO_TTL_SEG)
+    if datos is not None:
+        return _copia(datos)
+
+    perfil = perfil_actual()
+    otros = [g["Id_grupo"] for g in (perfil or {}).get("Grupos", []) if g["Id_grupo"] != id_grupo]
+    faltantes = [id_grupo] + [
+        gid for gid in otros if obtener_sesion(f"datos_grupo:{gid}", _DATOS_GRUPO_TTL_SEG) is None
+    ]
+
+    precargados = _precargar_datos_grupos(faltantes)
+    for gid, datos_g in precargados.items():
+        guardar_sesion(f"datos_grupo:{gid}", datos_g, etiqueta_grupo(gid))
+
+    return _copia(precargados[id_grupo])
+
+
+def obtener_reglamento_por_grupo(id_grupo: int) -> dict | None:
+    return datos_grupo(id_grupo)["reglamento"]
+
+
+def obtener_miembros_grupo(id_grupo: int):
+    return datos_grupo(id_grupo)["miembros"]
+
+
+def obtener_reuniones_de_grupo(id_grupo: int):
+    return datos_grupo(id_grupo)["reuniones"]
+
+
+def obtener_reunion_por_id(id_reunion: int) -> dict | None:
+    return uno("reunion_por_id", (id_reunion,))
+
+
+def monto_cambio(anterior, nuevo) -> bool:
+    """True si dos montos difieren a partir del centavo."""
+    return abs(float(anterior or 0) - float(nuevo or 0)) >= 0.005
+
+
+def obtener_cierres_ciclo_grupo(id_grupo: int):
+    """
+    Devuelve todos los cierres de ciclo del grupo (historial),
+    desde el catálogo de ciclos compartido.
+    """
+    return cierres_de_grupo(id_grupo)
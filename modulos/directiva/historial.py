@@ -0,0 +1,555 @@
+# modulos/directiva/historial.py
+#
+# Carga del historial en papel de un grupo que se incorpora al sistema:
+# reuniones, asistencia, ahorros, multas y préstamos (con sus cuotas) desde
+# un libro de Excel, sin pasar por cientos de formularios.
+#
+# Hojas del libro (encabezado en la primera fila; sin importar mayúsculas):
+#   Reuniones   Fecha, Numero, Tema, Otros_ingresos, Otros_gastos
+#   Asistencia  Fecha, DUI, Presente (Sí/No)
+#   Ahorros     Fecha, DUI, Ahorro, Otras_actividades, Retiros
+#   Multas      Fecha, DUI, Monto, Fecha_pago (vacía = pendiente)
+#   Prestamos   Clave, Fecha, DUI, Monto, Tasa_mensual_pct, Meses, Fecha_primer_pago
+#   Pagos       Clave, Cuota, Capital_pagado, Interes_pagado
+# Solo Reuniones es obligatoria. "Fecha" identifica la reunión; "Clave" es
+# un identificador libre del préstamo dentro del libro. Los miembros se
+# buscan por DUI y deben existir (ver importacion.py). Tasa_mensual_pct va
+# en porcentaje (2 = 2 % mensual). En vez del .xlsx se puede indicar una
+# carpeta con un CSV por hoja (Reuniones.csv, ...).
+#
+# El historial debe ser posterior a la última reunión que el grupo ya tenga
+# registrada (lo normal: se carga antes de empezar a usar el sistema). Así
+# los saldos de ahorro siguen desde el último registrado y no quedan
+# registros existentes con saldos viejos.
+#
+# Primero se valida todo el libro: si hay un solo error no se escribe nada
+# y se devuelven los errores. Si está bien, todo se inserta en una sola
+# transacción, por tablas y en orden de dependencia, con INSERT por lotes;
+# al final se arman las cajas de las reuniones nuevas con los mismos
+# cálculos que la pantalla de Caja y se recalcula la cadena de saldos.
+# Las multas por inasistencia no se generan solas: vienen en la hoja Multas.
+#
+#   python -m modulos.directiva.historial --grupo 12 historial.xlsx
+#   python -m modulos.directiva.historial --grupo 12 historial.xlsx --validar
+#   python -m modulos.directiva.historial --plantilla historial.xlsx
+import argparse
+import calendar
+import datetime as dt
+import os
+import sys
+
+from modulos.config.conexion import fetch_all, insert_en_lote, transaccion
+from modulos.directiva.importacion import filas_archivo, normalizar_dui
+from modulos.directiva.recalculo_caja import reconstruir_cadena
+from modulos.directiva.saldos import recalcular_saldos
+from modulos.reportes.conciliacion import componentes_caja, sumas_origen
+
+# Filas por sentencia INSERT
+_LOTE_INSERT = 500
+
+HOJAS = {
+    "Reuniones": ["Fecha", "Numero", "Tema", "Otros_ingresos", "Otros_gastos"],
+    "Asistencia": ["Fecha", "DUI", "Presente"],
+    "Ahorros": ["Fecha", "DUI", "Ahorro", "Otras_actividades", "Retiros"],
+    "Multas": ["Fecha", "DUI", "Monto", "Fecha_pago"],
+    "Prestamos": ["Clave", "Fecha", "DUI", "Monto", "Tasa_mensual_pct", "Meses", "Fecha_primer_pago"],
+    "Pagos": ["Clave", "Cuota", "Capital_pagado", "Interes_pagado"],
+}
+
+# Tasa mensual máxima aceptada, en porcentaje
+_TASA_MAXIMA_PCT = 20
+
+_SI = {"si", "sí", "s", "x", "1", "true", "presente"}
+_NO = {"no", "n", "0", "false", "ausente", ""}
+
+
+class _Invalido(ValueError):
+    pass
+
+
+# -------------------------------------------------------
+# Lectura
+# -------------------------------------------------------
+def _leer_hoja(ruta: str, hoja: str) -> list[dict]:
+    """Filas de la hoja (claves en minúsculas); lista vacía si la hoja no existe."""
+    if os.path.isdir(ruta):
+        archivo = os.path.join(ruta, f"{hoja}.csv")
+        if not os.path.exists(archivo):
+            return []
+        with open(archivo, "rb") as f:
+            filas = list(filas_archivo(f, archivo))
+    else:
+        try:
+            filas = list(filas_archivo(ruta, ruta, hoja=hoja))
+        except ValueError:
+            # Hoja ausente: solo Reuniones es obligatoria
+            return []
+    return [{str(k).strip().lower(): v for k, v in f.items()} for f in filas]
+
+
+def _fecha(valor, obligatoria: bool = True) -> dt.date | None:
+    if isinstance(valor, dt.datetime):
+        return valor.date()
+    if isinstance(valor, dt.date):
+        return valor
+    texto = str(valor or "").strip()
+    if not texto:
+        if obligatoria:
+            raise _Invalido("Falta la fecha.")
+        return None
+    for formato in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+        try:
+            return dt.datetime.strptime(texto[:10], formato).date()
+        except ValueError:
+            pass
+    raise _Invalido(f"Fecha no válida: {texto} (usa AAAA-MM-DD o DD/MM/AAAA).")
+
+
+def _numero(valor, nombre: str) -> float:
+    if valor is None or str(valor).strip() == "":
+        return 0.0
+    if isinstance(valor, (int, float)):
+        numero = float(valor)
+    else:
+        texto = str(valor).strip().replace("$", "").replace("%", "").strip()
+        if "," in texto and "." not in texto:
+            texto = texto.replace(",", ".")
+        try:
+            numero = float(texto.replace(",", ""))
+        except ValueError:
+            raise _Invalido(f"{nombre} no es un número: {valor}.")
+    if numero < 0:
+        raise _Invalido(f"{nombre} no puede ser negativo.")
+    return numero
+
+
+def _monto(valor, nombre: str) -> float:
+    return round(_numero(valor, nombre), 2)
+
+
+def _entero(valor, nombre: str) -> int | None:
+    if valor is None or str(valor).strip() == "":
+        return None
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError):
+        raise _Invalido(f"{nombre} debe ser un número entero: {valor}.")
+
+
+def _sumar_meses(fecha: dt.date, meses: int) -> dt.date:
+    # Igual que en prestamos.py
+    year = fecha.year + (fecha.month - 1 + meses) // 12
+    month = (fecha.month - 1 + meses) % 12 + 1
+    day = min(fecha.day, calendar.monthrange(year, month)[1])
+    return dt.date(year, month, day)
+
+
+# -------------------------------------------------------
+# Validación: arma las filas a insertar o junta los errores
+# -------------------------------------------------------
+def _validar(id_grupo: int, hojas: dict[str, list[dict]]) -> tuple[dict, list[dict]]:
+    errores: list[dict] = []
+
+    def fallar(hoja: str, fila: dict, motivo: str):
+        errores.append({"Hoja": hoja, "Fila": fila.get("_fila"), "Motivo": motivo})
+
+    # Una consulta por tabla para lo que ya existe en el grupo
+    miembros = {
+        normalizar_dui(m["DUI"]): m["Id_miembro"]
+        for m in fetch_all("SELECT Id_miembro, DUI FROM miembros WHERE Id_grupo = %s", (id_grupo,))
+        if m["DUI"]
+    }
+    existentes = fetch_all(
+        "SELECT Fecha, Numero_reunion FROM reuniones_grupo WHERE Id_grupo = %s", (id_grupo,)
+    )
+    ultima_fecha = max((_fecha(r["Fecha"]) for r in existentes), default=None)
+    ultimo_numero = max((r["Numero_reunion"] or 0 for r in existentes), default=0)
+
+    def miembro(hoja: str, fila: dict):
+        dui = normalizar_dui(fila.get("dui"))
+        if dui not in miembros:
+            raise _Invalido(f"No hay un miembro del grupo con DUI {fila.get('dui') or '(vacío)'}.")
+        return miembros[dui]
+
+    # ---- Reuniones ----
+    reuniones: dict[dt.date, dict] = {}
+    # Todas las fechas del libro, aunque la reunión tenga errores: así un
+    # error en Reuniones no se repite en cada fila de las otras hojas
+    fechas_libro: set[dt.date] = set()
+    for f in hojas["Reuniones"]:
+        try:
+            fecha = _fecha(f.get("fecha"))
+            fechas_libro.add(fecha)
+            if fecha in reuniones:
+                raise _Invalido("Fecha repetida en la hoja Reuniones.")
+            if ultima_fecha is not None and fecha <= ultima_fecha:
+                raise _Invalido(
+                    f"El grupo ya tiene reuniones registradas hasta {ultima_fecha}: "
+                    "el historial debe ser posterior."
+                )
+            reuniones[fecha] = {
+                "Fecha": fecha,
+                "Numero": _entero(f.get("numero"), "Numero"),
+                "Tema": str(f.get("tema") or "").strip() or "Historial",
+                "Otros_ingresos": _monto(f.get("otros_ingresos"), "Otros_ingresos"),
+                "Otros_gastos": _monto(f.get("otros_gastos"), "Otros_gastos"),
+            }
+        except _Invalido as e:
+            fallar("Reuniones", f, str(e))
+    if not hojas["Reuniones"]:
+        errores.append({"Hoja": "Reuniones", "Fila": None, "Motivo": "La hoja Reuniones está vacía."})
+
+    # Número de reunión: el del libro o consecutivo a partir del último del grupo
+    for i, r in enumerate(sorted(reuniones.values(), key=lambda r: r["Fecha"]), start=1):
+        if r["Numero"] is None:
+            r["Numero"] = ultimo_numero + i
+
+    def reunion(hoja: str, valor) -> dt.date:
+        fecha = _fecha(valor)
+        if fecha not in fechas_libro:
+            raise _Invalido(f"No hay una reunión con fecha {fecha} en la hoja Reuniones.")
+        return fecha
+
+    # ---- Asistencia ----
+    asistencia: dict[tuple, int] = {}
+    for f in hojas["Asistencia"]:
+        try:
+            clave = (reunion("Asistencia", f.get("fecha")), miembro("Asistencia", f))
+            presente = str(f.get("presente") or "").strip().lower()
+            if presente not in _SI | _NO:
+                raise _Invalido(f"Presente debe ser Sí o No: {f.get('presente')}.")
+            if clave in asistencia:
+                raise _Invalido("Asistencia repetida para ese miembro y reunión.")
+            asistencia[clave] = 1 if presente in _SI else 0
+        except _Invalido as e:
+            fallar("Asistencia", f, str(e))
+
+    # ---- Ahorros ----
+    ahorros: dict[tuple, dict] = {}
+    for f in hojas["Ahorros"]:
+        try:
+            clave = (reunion("Ahorros", f.get("fecha")), miembro("Ahorros", f))
+            if clave in ahorros:
+                raise _Invalido("Ahorro repetido para ese miembro y reunión.")
+            ahorros[clave] = {
+                "Ahorro": _monto(f.get("ahorro"), "Ahorro"),
+                "Otras_actividades": _monto(f.get("otras_actividades"), "Otras_actividades"),
+                "Retiros": _monto(f.get("retiros"), "Retiros"),
+            }
+        except _Invalido as e:
+            fallar("Ahorros", f, str(e))
+
+    # ---- Multas ----
+    multas: list[tuple] = []
+    for f in hojas["Multas"]:
+        try:
+            fecha = _fecha(f.get("fecha"))
+            id_miembro = miembro("Multas", f)
+            monto = _monto(f.get("monto"), "Monto")
+            fecha_pago = _fecha(f.get("fecha_pago"), obligatoria=False)
+            # La caja cuenta las multas pagadas en la fecha de una reunión
+            if fecha_pago is not None and fecha_pago not in fechas_libro:
+                raise _Invalido(f"Fecha_pago {fecha_pago} no coincide con ninguna reunión.")
+            multas.append((id_grupo, id_miembro, fecha, monto, int(fecha_pago is not None), fecha_pago))
+        except _Invalido as e:
+            fallar("Multas", f, str(e))
+
+    # ---- Préstamos ----
+    prestamos: dict[str, dict] = {}
+    for f in hojas["Prestamos"]:
+        try:
+            clave = str(f.get("clave") or "").strip()
+            if not clave:
+                raise _Invalido("Falta la Clave del préstamo.")
+            if clave in prestamos:
+                raise _Invalido(f"Clave de préstamo repetida: {clave}.")
+            fecha = reunion("Prestamos", f.get("fecha"))
+            id_miembro = miembro("Prestamos", f)
+            monto = _monto(f.get("monto"), "Monto")
+            # En porcentaje; en prestamos_miembro se guarda como fracción
+            tasa_pct = _numero(f.get("tasa_mensual_pct"), "Tasa_mensual_pct")
+            if tasa_pct > _TASA_MAXIMA_PCT:
+                raise _Invalido(
+                    f"Tasa_mensual_pct fuera de rango: {tasa_pct:g} % "
+                    f"(va en porcentaje, de 0 a {_TASA_MAXIMA_PCT})."
+                )
+            tasa = round(tasa_pct / 100.0, 6)
+            meses = _entero(f.get("meses"), "Meses")
+            if monto <= 0 or not meses or meses <= 0:
+                raise _Invalido("Monto y Meses deben ser mayores que cero.")
+            if any(p["Id_miembro"] == id_miembro and p["Fecha"] == fecha for p in prestamos.values()):
+                raise _Invalido("El miembro ya tiene otro préstamo con esa fecha en el libro.")
+            primer_pago = _fecha(f.get("fecha_primer_pago"), obligatoria=False) or _sumar_meses(fecha, 1)
+            # Mismos cálculos que la sección de Préstamos
+            interes_total = round(monto * tasa * meses, 2)
+            prestamos[clave] = {
+                "Id_miembro": id_miembro,
+                "Fecha": fecha,
+                "Primer_pago": primer_pago,
+                "Meses": meses,
+                "Monto": monto,
+                "Tasa": tasa,
+                "Interes_total": interes_total,
+                "Total_pagar": round(monto + interes_total, 2),
+                "Capital_cuota": round(monto / meses, 2),
+                "Interes_cuota": round(interes_total / meses, 2),
+                "Pagos": {},
+            }
+        except _Invalido as e:
+            fallar("Prestamos", f, str(e))
+
+    # ---- Pagos de cuotas ----
+    for f in hojas["Pagos"]:
+        try:
+            clave = str(f.get("clave") or "").strip()
+            if clave not in prestamos:
+                raise _Invalido(f"No hay un préstamo con Clave {clave or '(vacía)'} en la hoja Prestamos.")
+            cuota = _entero(f.get("cuota"), "Cuota")
+            if not cuota or not 1 <= cuota <= prestamos[clave]["Meses"]:
+                raise _Invalido(f"Cuota fuera del plazo del préstamo: {f.get('cuota')}.")
+            if cuota in prestamos[clave]["Pagos"]:
+                raise _Invalido("Pago repetido para esa cuota.")
+            prestamos[clave]["Pagos"][cuota] = (
+                _monto(f.get("capital_pagado"), "Capital_pagado"),
+                _monto(f.get("interes_pagado"), "Interes_pagado"),
+            )
+        except _Invalido as e:
+            fallar("Pagos", f, str(e))
+
+    datos = {
+        "reuniones": reuniones,
+        "asistencia": asistencia,
+        "ahorros": ahorros,
+        "multas": multas,
+        "prestamos": prestamos,
+    }
+    return datos, errores
+
+
+# -------------------------------------------------------
+# Escritura (una transacción, en orden de dependencia)
+# -------------------------------------------------------
+def _insertar(cur, tabla: str, columnas: list[str], filas: list[tuple]) -> int:
+    for i in range(0, len(filas), _LOTE_INSERT):
+        insert_en_lote(cur, tabla, columnas, filas[i:i + _LOTE_INSERT])
+    return len(filas)
+
+
+def _marcadores(valores) -> str:
+    return ", ".join(["%s"] * len(valores))
+
+
+def _cargar(cur, id_grupo: int, datos: dict) -> dict:
+    reuniones = datos["reuniones"]
+    fechas = sorted(reuniones)
+    conteo = {}
+
+    # 1) Reuniones, y sus Id por fecha (el grupo no tenía reuniones en esas fechas)
+    conteo["reuniones"] = _insertar(
+        cur,
+        "reuniones_grupo",
+        ["Id_grupo", "Fecha", "Numero_reunion", "Tema"],
+        [(id_grupo, f, reuniones[f]["Numero"], reuniones[f]["Tema"]) for f in fechas],
+    )
+    ids_reunion: dict[str, int] = {}
+    for i in range(0, len(fechas), _LOTE_INSERT):
+        lote = fechas[i:i + _LOTE_INSERT]
+        cur.execute(
+            f"SELECT Id_reunion, Fecha FROM reuniones_grupo "
+            f"WHERE Id_grupo = %s AND Fecha IN ({_marcadores(lote)})",
+            (id_grupo, *lote),
+        )
+        ids_reunion.update({str(r["Fecha"])[:10]: r["Id_reunion"] for r in cur.fetchall()})
+
+    def id_reunion(fecha: dt.date) -> int:
+        return ids_reunion[str(fecha)]
+
+    # 2) Asistencia
+    conteo["asistencia"] = _insertar(
+        cur,
+        "asistencia_miembro",
+        ["Id_reunion", "Id_miembro", "Presente"],
+        [(id_reunion(f), mid, p) for (f, mid), p in datos["asistencia"].items()],
+    )
+
+    # 3) Ahorros: el saldo corre por miembro en orden de fecha, desde su
+    #    último Saldo_final registrado (0 si no tiene); el libro es posterior
+    #    a todas las reuniones del grupo (ver _validar)
+    ids_miembro = sorted({mid for _, mid in datos["ahorros"]})
+    saldos: dict[int, float] = {}
+    if ids_miembro:
+        cur.execute(
+            f"""
+            SELECT a.Id_miembro, a.Saldo_final
+            FROM ahorros_miembros a
+            JOIN reuniones_grupo rg ON rg.Id_reunion = a.Id_reunion
+            WHERE a.Id_grupo = %s AND rg.Fecha < %s
+              AND a.Id_miembro IN ({_marcadores(ids_miembro)})
+            ORDER BY rg.Fecha, a.Id_ahorro
+            """,
+            (id_grupo, fechas[0], *ids_miembro),
+        )
+        saldos = {f["Id_miembro"]: float(f["Saldo_final"] or 0) for f in cur.fetchall()}
+    filas_ahorro = []
+    for (fecha, mid), a in sorted(datos["ahorros"].items()):
+        inicial = round(saldos.get(mid, 0.0), 2)
+        final = round(inicial + a["Ahorro"] + a["Otras_actividades"] - a["Retiros"], 2)
+        saldos[mid] = final
+        filas_ahorro.append(
+            (id_grupo, id_reunion(fecha), mid, inicial, a["Ahorro"], a["Otras_actividades"], a["Retiros"], final)
+        )
+    conteo["ahorros"] = _insertar(
+        cur,
+        "ahorros_miembros",
+        ["Id_grupo", "Id_reunion", "Id_miembro", "Saldo_inicial",
+         "Ahorro", "Otras_actividades", "Retiros", "Saldo_final"],
+        filas_ahorro,
+    )
+
+    # 4) Multas
+    conteo["multas"] = _insertar(
+        cur,
+        "multas_miembro",
+        ["Id_grupo", "Id_miembro", "Fecha_multa", "Monto", "Pagada", "Fecha_pago"],
+        datos["multas"],
+    )
+
+    # 5) Préstamos, y sus Id por (miembro, fecha): el libro no repite ese par
+    prestamos = datos["prestamos"]
+    cur.execute(
+        "SELECT COALESCE(MAX(Id_prestamo), 0) AS ultimo FROM prestamos_miembro"
+    )
+    ultimo = cur.fetchone()["ultimo"]
+    conteo["prestamos"] = _insertar(
+        cur,
+        "prestamos_miembro",
+        ["Id_grupo", "Id_miembro", "Fecha_prestamo", "Fecha_primer_pago", "Meses_plazo",
+         "Monto", "Tasa_mensual", "Capital_total", "Interes_total", "Total_pagar", "Saldo_pendiente"],
+        [
+            (id_grupo, p["Id_miembro"], p["Fecha"], p["Primer_pago"], p["Meses"], p["Monto"],
+             p["Tasa"], p["Monto"], p["Interes_total"], p["Total_pagar"], p["Total_pagar"])
+            for p in prestamos.values()
+        ],
+    )
+    ids_prestamo: dict[tuple, int] = {}
+    if prestamos:
+        cur.execute(
+            "SELECT Id_prestamo, Id_miembro, Fecha_prestamo FROM prestamos_miembro "
+            "WHERE Id_grupo = %s AND Id_prestamo > %s",
+            (id_grupo, ultimo),
+        )
+        ids_prestamo = {
+            (f["Id_miembro"], str(f["Fecha_prestamo"])[:10]): f["Id_prestamo"] for f in cur.fetchall()
+        }
+
+    # 6) Cuotas de cada préstamo, con lo pagado según el libro
+    cuotas = []
+    for p in prestamos.values():
+        pid = ids_prestamo[(p["Id_miembro"], str(p["Fecha"]))]
+        p["Id_prestamo"] = pid
+        for n in range(1, p["Meses"] + 1):
+            capital_pagado, interes_pagado = p["Pagos"].get(n, (0.0, 0.0))
+            cuotas.append(
+                (pid, n, _sumar_meses(p["Primer_pago"], n - 1), p["Capital_cuota"],
+                 p["Interes_cuota"], capital_pagado, interes_pagado)
+            )
+    conteo["cuotas"] = _insertar(
+        cur,
+        "pagos_prestamo",
+        ["Id_prestamo", "Numero_cuota", "Fecha_programada", "Capital_programado",
+         "Interes_programado", "Capital_pagado", "Interes_pagado"],
+        cuotas,
+    )
+    ids = [p["Id_prestamo"] for p in prestamos.values()]
+    for i in range(0, len(ids), _LOTE_INSERT):
+        recalcular_saldos(cur, ids[i:i + _LOTE_INSERT])
+
+    # 7) Cajas de las reuniones nuevas (mismos cálculos que la pantalla de
+    #    Caja) y, una sola vez, la cadena de saldos del grupo
+    def leer(sql, params):
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+    sumas = sumas_origen([id_grupo], leer)
+    cajas = []
+    for f in fechas:
+        c = componentes_caja(
+            sumas, id_grupo, id_reunion(f), f,
+            reuniones[f]["Otros_ingresos"], reuniones[f]["Otros_gastos"],
+        )
+        cajas.append(
+            (id_grupo, id_reunion(f), c["Multas"], c["Ahorros"], c["Otras_actividades"],
+             c["Pagos_prestamos"], c["Otros_ingresos"], c["Total_entradas"], c["Retiros_ahorros"],
+             c["Desembolsos_prestamos"], c["Otros_gastos"], c["Total_salidas"])
+        )
+    conteo["cajas"] = _insertar(
+        cur,
+        "caja_reunion",
+        ["Id_grupo", "Id_reunion", "Multas", "Ahorros", "Otras_actividades", "Pagos_prestamos",
+         "Otros_ingresos", "Total_entradas", "Retiros_ahorros", "Desembolsos_prestamos",
+         "Otros_gastos", "Total_salidas"],
+        cajas,
+    )
+    reconstruir_cadena(cur, [id_grupo])
+    return conteo
+
+
+def cargar_historial(id_grupo: int, ruta: str, validar: bool = False) -> tuple[dict, list[dict]]:
+    """
+    Valida el libro y, si no tiene errores (y validar=False), carga todo en
+    una transacción. Devuelve ({tabla: filas insertadas}, errores).
+    """
+    hojas = {hoja: _leer_hoja(ruta, hoja) for hoja in HOJAS}
+    datos, errores = _validar(id_grupo, hojas)
+    if errores or validar:
+        return {}, errores
+    with transaccion(categoria="exportacion") as cur:
+        conteo = _cargar(cur, id_grupo, datos)
+    return conteo, []
+
+
+def escribir_plantilla(ruta: str) -> None:
+    """Libro vacío con una hoja por tabla y sus encabezados."""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Para crear la plantilla se necesita 'openpyxl' (pip install openpyxl).")
+    libro = Workbook()
+    libro.remove(libro.active)
+    for hoja, columnas in HOJAS.items():
+        libro.create_sheet(hoja).append(columnas)
+    libro.save(ruta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Carga el historial en papel de un grupo desde un libro de Excel."
+    )
+    parser.add_argument("libro", help="Archivo .xlsx (o carpeta con un CSV por hoja)")
+    parser.add_argument("--grupo", type=int, help="Id_grupo destino")
+    parser.add_argument("--validar", action="store_true", help="Solo validar, sin escribir")
+    parser.add_argument("--plantilla", action="store_true", help="Crear un libro vacío en 'libro'")
+    args = parser.parse_args(argv)
+
+    if args.plantilla:
+        escribir_plantilla(args.libro)
+        print(f"Plantilla creada: {args.libro}")
+        return
+    if args.grupo is None:
+        parser.error("falta --grupo")
+
+    conteo, errores = cargar_historial(args.grupo, args.libro, validar=args.validar)
+    for e in errores:
+        fila = f" fila {e['Fila']}" if e["Fila"] else ""
+        print(f"{e['Hoja']}{fila}: {e['Motivo']}")
+    if errores:
+        print(f"{len(errores)} error(es); no se cargó nada.")
+        sys.exit(1)
+    if args.validar:
+        print("El libro no tiene errores.")
+        return
+    print(", ".join(f"{tabla}: {n}" for tabla, n in conteo.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# modulos/directiva/importacion.py
+#
+# Importación masiva de miembros desde un archivo CSV o Excel (.xlsx).
+# El archivo se lee fila por fila (sin cargarlo entero en memoria), cada
+# fila se valida y los duplicados se detectan contra el grupo con una sola
+# consulta. Las filas válidas se insertan juntas en una transacción; las
+# rechazadas se devuelven con el motivo para descargarlas y corregirlas.
+#
+# Columnas esperadas (encabezado en la primera fila, sin importar
+# mayúsculas): Nombre, DUI, Cargo, Sexo. Cargo vacío = Asociado.
+import codecs
+import csv
+import io
+import itertools
+
+from modulos.config.conexion import fetch_all, insert_en_lote, transaccion
+from modulos.directiva.comun import CARGOS, SEXOS
+
+# Filas por sentencia INSERT
+_LOTE_INSERT = 500
+
+# Bytes que se miran para adivinar el separador del CSV
+_MUESTRA_CSV = 4096
+
+# Bytes por lectura al comprobar si el CSV es UTF-8
+_BLOQUE_CODIFICACION = 64 * 1024
+
+COLUMNAS_MIEMBRO = ["Nombre", "DUI", "Cargo", "Sexo"]
+
+_CARGOS = {c.lower(): c for c in CARGOS}
+_SEXOS = {s.lower(): s for s in SEXOS} | {"f": "Femenino", "m": "Masculino"}
+
+
+# -------------------------------------------------------
+# Lectura del archivo
+# -------------------------------------------------------
+def _texto(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _codificacion_csv(archivo) -> str:
+    """
+    "utf-8-sig" si todo el archivo es UTF-8 válido; si no, "cp1252": lo que
+    deja "Guardar como CSV" de Excel en Windows en español. Se lee por
+    bloques y se vuelve al inicio del archivo.
+    """
+    inicio = archivo.tell()
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        while bloque := archivo.read(_BLOQUE_CODIFICACION):
+            decodificador.decode(bloque)
+        decodificador.decode(b"", final=True)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1252"
+    finally:
+        archivo.seek(inicio)
+
+
+def _filas_csv(archivo):
+    """Filas de un CSV (UTF-8 con o sin BOM, o Windows-1252; separador ',' o ';')."""
+    # Decodificación estricta: un nombre mal leído ("Mar�a") pasaría la validación
+    texto = io.TextIOWrapper(archivo, encoding=_codificacion_csv(archivo), newline="")
+    try:
+        # Muestra para adivinar el separador, completada hasta el fin de línea
+        muestra = texto.read(_MUESTRA_CSV)
+        muestra += texto.readline()
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;")
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(itertools.chain(io.StringIO(muestra, newline=""), texto), dialecto)
+    except UnicodeDecodeError:
+        raise ValueError(
+            "No se pudo leer el archivo: guárdalo como CSV UTF-8 "
+            "(en Excel: Guardar como > CSV UTF-8)."
+        )
+    finally:
+        # Sin detach, cerrar el envoltorio cerraría también el archivo subido
+        texto.detach()
+
+
+def _filas_excel(archivo, hoja: str | None = None):
+    """Filas de una hoja de Excel en modo solo lectura (sin cargar el libro entero)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError(
+            "Para leer archivos Excel se necesita 'openpyxl' (pip install openpyxl). "
+            "También puedes guardar la hoja como CSV."
+        )
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        if hoja is not None and hoja not in libro.sheetnames:
+            raise ValueError(f"El libro no tiene la hoja '{hoja}'.")
+        hoja_excel = libro[hoja] if hoja is not None else libro.worksheets[0]
+        yield from hoja_excel.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def filas_archivo(archivo, nombre_archivo: str, hoja: str | None = None):
+    """
+    Lee un CSV o .xlsx (archivo binario abierto, p. ej. el de st.file_uploader)
+    y produce un dict por fila con las columnas del encabezado, sin las filas
+    vacías. Cada dict lleva además "_fila": el número de fila en el archivo.
+    """
+    if nombre_archivo.lower().endswith((".xlsx", ".xlsm")):
+        filas = _filas_excel(archivo, hoja)
+    else:
+        filas = _filas_csv(archivo)
+
+    encabezado = None
+    for numero, valores in enumerate(filas, start=1):
+        # Los números de Excel se dejan como número (ver normalizar_dui)
+        valores = [v.strip() if isinstance(v, str) else v for v in valores]
+        if not any(_texto(v) for v in valores):
+            continue
+        if encabezado is None:
+            encabezado = [_texto(v) for v in valores]
+            continue
+        fila = dict(zip(encabezado, valores))
+        fila["_fila"] = numero
+        yield fila
+
+
+def _campo(fila: dict, nombre: str):
+    """Valor de la columna sin importar mayúsculas ni espacios del encabezado."""
+    for clave, valor in fila.items():
+        if clave.strip().lower() == nombre.lower():
+            return valor
+    return ""
+
+
+# -------------------------------------------------------
+# Validación
+# -------------------------------------------------------
+def normalizar_dui(valor) -> str:
+    """
+    Deja solo dígitos (mismas reglas que en promotora/grupos.py). Un DUI que
+    Excel guardó como número pierde los ceros a la izquierda: se rellenan.
+    """
+    if isinstance(valor, (int, float)):
+        return str(int(valor)).zfill(9)
+    return "".join(ch for ch in (valor or "") if ch.isdigit())
+
+
+def _validar(fila: dict) -> tuple[dict | None, str | None]:
+    """Devuelve (miembro limpio, None) o (None, motivo del rechazo)."""
+    nombre = " ".join(_texto(_campo(fila, "Nombre")).split())
+    dui = normalizar_dui(_campo(fila, "DUI"))
+    cargo = _texto(_campo(fila, "Cargo")) or "Asociado"
+    sexo = _texto(_campo(fila, "Sexo"))
+
+    if not nombre:
+        return None, "Falta el nombre."
+    if len(dui) != 9:
+        return None, "El DUI debe tener 9 dígitos."
+    if cargo.lower() not in _CARGOS:
+        return None, f"Cargo no válido: {cargo}."
+    if sexo.lower() not in _SEXOS:
+        return None, f"Sexo no válido: {sexo or '(vacío)'}."
+    return {
+        "Nombre": nombre,
+        "DUI": dui,
+        "Cargo": _CARGOS[cargo.lower()],
+        "Sexo": _SEXOS[sexo.lower()],
+    }, None
+
+
+def duis_del_grupo(id_grupo: int) -> set[str]:
+    """DUIs ya registrados en el grupo (normalizados), en una sola consulta."""
+    filas = fetch_all("SELECT DUI FROM miembros WHERE Id_grupo = %s", (id_grupo,))
+    return {normalizar_dui(f["DUI"]) for f in filas if f["DUI"]}
+
+
+# -------------------------------------------------------
+# Importación
+# -------------------------------------------------------
+def importar_miembros(id_grupo: int, filas) -> tuple[int, list[dict]]:
+    """
+    Valida las filas (iterable de dicts, ver filas_archivo) e inserta las
+    válidas en una sola transacción. Devuelve (insertados, rechazados);
+    cada rechazada es la fila original más "Motivo".
+    """
+    existentes = duis_del_grupo(id_grupo)
+    vistos: set[str] = set()
+    validos: list[tuple] = []
+    rechazados: list[dict] = []
+
+    for fila in filas:
+        miembro, motivo = _validar(fila)
+        if miembro and miembro["DUI"] in existentes:
+            motivo = "Ya existe un miembro con ese DUI en el grupo."
+        elif miembro and miembro["DUI"] in vistos:
+            motivo = "DUI repetido en el archivo."
+        if motivo:
+            rechazados.append({**fila, "Motivo": motivo})
+            continue
+        vistos.add(miembro["DUI"])
+        validos.append((id_grupo, *(miembro[c] for c in COLUMNAS_MIEMBRO)))
+
+    if validos:
+        with transaccion() as cur:
+            for i in range(0, len(validos), _LOTE_INSERT):
+                insert_en_lote(
+                    cur, "miembros", ["Id_grupo", *COLUMNAS_MIEMBRO], validos[i:i + _LOTE_INSERT]
+                )
+    return len(validos), rechazados
+
+
+def csv_rechazados(rechazados: list[dict]) -> bytes:
+    """CSV (UTF-8 con BOM, para Excel) con las filas rechazadas y su motivo."""
+    columnas = ["_fila"]
+    for fila in rechazados:
+        columnas += [c for c in fila if c not in columnas]
+    buffer = io.StringIO()
+    buffer.write("\ufeff")
+    escritor = csv.DictWriter(buffer, fieldnames=columnas, extrasaction="ignore")
+    escritor.writerow({c: ("Fila" if c == "_fila" else c) for c in columnas})
+    escritor.writerows(rechazados)
+    return buffer.getvalue().encode("utf-8")
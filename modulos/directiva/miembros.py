@@ -0,0 +1,196 @@
+# modulos/directiva/miembros.py
+
+import streamlit as st
+
+from modulos.config.conexion import fetch_all, execute
+from modulos.reportes.cartera import invalidar_cartera
+from modulos.directiva.comun import (
+    CARGOS,
+    SEXOS,
+    invalidar_datos_grupo,
+    obtener_miembros_grupo,
+)
+from modulos.directiva.importacion import (
+    csv_rechazados,
+    filas_archivo,
+    importar_miembros,
+)
+
+
+# -------------------------------------------------------
+# Importación desde CSV / Excel
+# -------------------------------------------------------
+def _importar_miembros(id_grupo: int):
+    # Resultado por grupo: al cambiar de grupo no se muestra el de otro
+    clave_resultado = f"importar_miembros_resultado:{id_grupo}"
+
+    def _olvidar_resultado():
+        # Archivo nuevo (o quitado): el resultado anterior ya no aplica
+        st.session_state.pop(clave_resultado, None)
+
+    with st.expander("Importar varios miembros desde un archivo (CSV o Excel)"):
+        st.caption(
+            "Columnas: Nombre, DUI, Cargo, Sexo (encabezado en la primera fila). "
+            "Si el cargo está vacío se registra como Asociado. "
+            "Las filas con errores no se guardan y se pueden descargar para corregirlas."
+        )
+        archivo = st.file_uploader(
+            "Archivo de miembros",
+            type=["csv", "xlsx"],
+            key=f"importar_miembros_archivo:{id_grupo}",
+            on_change=_olvidar_resultado,
+        )
+
+        if archivo is not None and st.button("Importar miembros", key="btn_importar_miembros"):
+            try:
+                insertados, rechazados = importar_miembros(
+                    id_grupo, filas_archivo(archivo, archivo.name)
+                )
+            except (RuntimeError, ValueError) as e:
+                st.error(str(e))
+                return
+            if insertados:
+                invalidar_datos_grupo(id_grupo)
+            # Se guarda en sesión para que el resultado sobreviva al rerun
+            st.session_state[clave_resultado] = (
+                insertados,
+                len(rechazados),
+                csv_rechazados(rechazados) if rechazados else None,
+            )
+            st.rerun()
+
+        resultado = st.session_state.get(clave_resultado)
+        if resultado:
+            insertados, cant_rechazados, csv_rech = resultado
+            st.success(f"Miembros importados: {insertados}.")
+            if csv_rech:
+                st.warning(f"Filas rechazadas: {cant_rechazados}.")
+                st.download_button(
+                    "Descargar filas rechazadas (CSV)",
+                    data=csv_rech,
+                    file_name=f"miembros_rechazados_grupo{id_grupo}.csv",
+                    mime="text/csv",
+                    key="descargar_miembros_rechazados",
+                )
+
+
+# -------------------------------------------------------
+# Sección: Miembros del grupo
+# -------------------------------------------------------
+def seccion_miembros(info_dir: dict):
+    st.subheader("Miembros del grupo")
+
+    id_grupo = info_dir["Id_grupo"]
+    nombre_grupo = info_dir["Nombre_grupo"]
+
+    st.caption(f"Grupo: **{nombre_grupo}** — Id_grupo: {id_grupo}")
+    st.write(
+        "En esta sección se registran todas las personas que forman parte del grupo "
+        "(directiva y asociados). Más adelante se usarán para asistencia, multas, "
+        "ahorros, préstamos, etc."
+    )
+
+    miembros = obtener_miembros_grupo(id_grupo)
+
+    # -------- Formulario para agregar miembro --------
+    st.markdown("### Agregar nuevo miembro")
+
+    with st.form("form_nuevo_miembro"):
+        nombre_m = st.text_input("Nombre completo del miembro")
+        dui_m = st.text_input("DUI del miembro (con o sin guiones)")
+        cargo_m = st.selectbox("Cargo dentro del grupo", CARGOS)
+        sexo_m = st.selectbox("Sexo", SEXOS)
+
+        btn_agregar = st.form_submit_button("Guardar miembro")
+
+    if btn_agregar:
+        if not nombre_m.strip() or not dui_m.strip():
+            st.warning("Debes completar el nombre y el DUI del miembro.")
+        else:
+            execute(
+                """
+                INSERT INTO miembros (Id_grupo, Nombre, DUI, Cargo, Sexo)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (id_grupo, nombre_m.strip(), dui_m.strip(), cargo_m, sexo_m),
+            )
+            invalidar_datos_grupo(id_grupo)
+            st.success("Miembro registrado correctamente.")
+            st.rerun()
+
+    # -------- Importar varios miembros desde archivo --------
+    _importar_miembros(id_grupo)
+
+    # -------- Listado y eliminación --------
+    st.markdown("---")
+    st.markdown("### Miembros registrados en el grupo")
+
+    if miembros:
+        st.table(miembros)
+
+        etiquetas = {
+            f"{m['Id_miembro']} - {m['Nombre']} ({m['Cargo']})": m["Id_miembro"]
+            for m in miembros
+        }
+
+        seleccion_eliminar = st.multiselect(
+            "Selecciona miembros a eliminar",
+            list(etiquetas.keys()),
+        )
+
+        if st.button("Eliminar miembros seleccionados", type="secondary"):
+            if not seleccion_eliminar:
+                st.warning("No has seleccionado ningún miembro para eliminar.")
+            else:
+                ids_a_borrar = [etiquetas[e] for e in seleccion_eliminar]
+
+                for mid in ids_a_borrar:
+                    # 1) Borrar pagos de préstamos del miembro
+                    prestamos_m = fetch_all(
+                        "SELECT Id_prestamo FROM prestamos_miembro WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+                    for p in prestamos_m:
+                        execute(
+                            "DELETE FROM pagos_prestamo WHERE Id_prestamo = %s",
+                            (p["Id_prestamo"],),
+                        )
+
+                    # 2) Borrar préstamos del miembro
+                    execute(
+                        "DELETE FROM prestamos_miembro WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+
+                    # 3) Borrar ahorros del miembro
+                    execute(
+                        "DELETE FROM ahorros_miembros WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+
+                    # 4) Borrar multas del miembro
+                    execute(
+                        "DELETE FROM multas_miembro WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+
+                    # 5) Borrar asistencias del miembro
+                    execute(
+                        "DELETE FROM asistencia_miembro WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+
+                    # 6) Finalmente borrar el miembro
+                    execute(
+                        "DELETE FROM miembros WHERE Id_miembro = %s",
+                        (mid,),
+                    )
+
+                invalidar_datos_grupo(id_grupo)
+                invalidar_cartera()
+                st.success(
+                    "Miembros y sus registros asociados fueron eliminados correctamente."
+                )
+                st.rerun()
+    else:
+        st.info("Aún no se han registrado miembros para este grupo.")
@@ -0,0 +1,135 @@
+# modulos/directiva/multas.py
+
+import datetime as dt
+import streamlit as st
+
+from modulos.config.conexion import execute
+from modulos.config.consultas import todos
+from modulos.directiva.comun import obtener_reglamento_por_grupo, obtener_miembros_grupo
+
+
+# -------------------------------------------------------
+# Sección: Multas
+# -------------------------------------------------------
+def _obtener_multas_de_grupo(id_grupo: int):
+    return todos("multas_de_grupo", (id_grupo,))
+
+
+def seccion_multas(info_dir: dict):
+    st.subheader("Multas")
+
+    id_grupo = info_dir["Id_grupo"]
+    miembros = obtener_miembros_grupo(id_grupo)
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+
+    monto_default = 0.0
+    if reglamento and reglamento.get("Monto_multa") is not None:
+        try:
+            monto_default = float(reglamento["Monto_multa"])
+        except Exception:
+            monto_default = 0.0
+
+    if not miembros:
+        st.info("Primero debes registrar miembros para poder asignar multas.")
+        return
+
+    st.markdown(
+        "Las multas por inasistencia se generan automáticamente al guardar la "
+        "asistencia (cuando un miembro aparece como NO presente). "
+        "Aquí puedes registrar multas especiales y gestionarlas."
+    )
+
+    # -------- Registrar multa manual --------
+    st.markdown("### Registrar nueva multa manual")
+
+    opciones_miembro = {
+        f"{m['Nombre']} ({m['Cargo']})": m["Id_miembro"] for m in miembros
+    }
+
+    with st.form("form_multas"):
+        miembro_label = st.selectbox(
+            "Miembro",
+            list(opciones_miembro.keys()),
+        )
+        id_miembro_sel = opciones_miembro[miembro_label]
+
+        fecha_multa = st.date_input("Fecha de la multa", value=dt.date.today())
+
+        monto = st.number_input(
+            "Monto de la multa ($)",
+            min_value=0.0,
+            step=0.5,
+            format="%.2f",
+            value=monto_default,
+        )
+
+        pagada = st.checkbox("¿Multa pagada?")
+        fecha_pago = None
+        if pagada:
+            fecha_pago = st.date_input(
+                "Fecha de pago de la multa", value=dt.date.today()
+            )
+
+        guardar_multa = st.form_submit_button("Guardar multa")
+
+    if guardar_multa:
+        sql = """
+        INSERT INTO multas_miembro
+            (Id_grupo, Id_miembro, Fecha_multa, Monto, Pagada, Fecha_pago)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        execute(
+            sql,
+            (
+                id_grupo,
+                id_miembro_sel,
+                fecha_multa,
+                monto,
+                1 if pagada else 0,
+                fecha_pago,
+            ),
+        )
+        st.success("Multa registrada correctamente.")
+        st.rerun()
+
+    # -------- Listado y gestión de multas --------
+    st.markdown("---")
+    st.markdown("### Multas registradas")
+
+    multas = _obtener_multas_de_grupo(id_grupo)
+    if not multas:
+        st.info("Todavía no hay multas registradas para este grupo.")
+        return
+
+    st.table(multas)
+
+    # Marcar una multa como pagada
+    pendientes = [m for m in multas if not m["Pagada"]]
+    if pendientes:
+        opciones_pend = {
+            f"#{m['Id_multa']} - {m['Nombre']} - ${m['Monto']} ({m['Fecha_multa']})": m[
+                "Id_multa"
+            ]
+            for m in pendientes
+        }
+
+        st.markdown("#### Marcar multa como pagada")
+        with st.form("form_marcar_pagada"):
+            label_sel = st.selectbox("Multa pendiente", list(opciones_pend.keys()))
+            id_multa_sel = opciones_pend[label_sel]
+            fecha_pago2 = st.date_input(
+                "Fecha de pago", value=dt.date.today(), key="fecha_pago_multa"
+            )
+            btn_pagar = st.form_submit_button("Marcar como pagada")
+
+        if btn_pagar:
+            sql_up = """
+            UPDATE multas_miembro
+            SET Pagada = 1, Fecha_pago = %s
+            WHERE Id_multa = %s
+            """
+            execute(sql_up, (fecha_pago2, id_multa_sel))
+            st.success("Multa actualizada como pagada.")
+            st.rerun()
+    else:
+        st.info("Todas las multas están pagadas actualmente.")
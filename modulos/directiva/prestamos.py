@@ -0,0 +1,376 @@
+# modulos/directiva/prestamos.py
+
+import datetime as dt
+import calendar
+import pandas as pd
+import streamlit as st
+
+from modulos.config.conexion import fetch_one, execute, transaccion, update_en_lote
+from modulos.config.consultas import uno, todos
+from modulos.reportes.cartera import (
+    cartera_en_riesgo,
+    mostrar_cartera,
+    invalidar_cartera,
+)
+from modulos.directiva.saldos import recalcular_saldos
+from modulos.directiva.comun import (
+    obtener_reglamento_por_grupo,
+    obtener_miembros_grupo,
+    monto_cambio,
+)
+
+
+# -------------------------------------------------------
+# Helpers de Préstamos
+# -------------------------------------------------------
+def _sumar_meses(fecha: dt.date, meses: int) -> dt.date:
+    """Suma 'meses' meses a una fecha sin usar librerías externas."""
+    year = fecha.year + (fecha.month - 1 + meses) // 12
+    month = (fecha.month - 1 + meses) % 12 + 1
+    day = min(fecha.day, calendar.monthrange(year, month)[1])
+    return dt.date(year, month, day)
+
+
+def _obtener_saldo_caja_actual(id_grupo: int) -> float:
+    """
+    Devuelve el último saldo de cierre registrado en caja_reunion para el grupo.
+    Se usa como disponibilidad de caja para nuevos préstamos.
+    """
+    fila = uno("caja_saldo_actual", (id_grupo,))
+    if fila and fila.get("saldo") is not None:
+        try:
+            return float(fila["saldo"])
+        except Exception:
+            return 0.0
+    return 0.0
+
+
+# -------------------------------------------------------
+# Sección: Préstamos
+# Tablas: prestamos_miembro y pagos_prestamo
+# -------------------------------------------------------
+def _obtener_prestamos_de_grupo(id_grupo: int):
+    return todos("prestamos_de_grupo", (id_grupo,))
+
+
+def _obtener_pagos_prestamo(id_prestamo: int):
+    return todos("pagos_de_prestamo", (id_prestamo,))
+
+
+def seccion_prestamos(info_dir: dict):
+    st.subheader("Préstamos")
+
+    id_grupo = info_dir["Id_grupo"]
+    miembros = obtener_miembros_grupo(id_grupo)
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+
+    if not miembros:
+        st.info("Primero debes registrar miembros para poder otorgar préstamos.")
+        return
+
+    # Tasa mensual tomada automáticamente del reglamento (Interes_por_10 / 10)
+    tasa_mensual = 0.05
+    if reglamento and reglamento.get("Interes_por_10") is not None:
+        try:
+            tasa_mensual = float(reglamento["Interes_por_10"]) / 10.0
+        except Exception:
+            tasa_mensual = 0.05
+
+    saldo_caja_actual = _obtener_saldo_caja_actual(id_grupo)
+    st.info(
+        f"Saldo disponible en caja: **${saldo_caja_actual:.2f}**\n\n"
+        f"Tasa de interés mensual aplicada (desde reglamento): "
+        f"**{tasa_mensual*100:.2f}%**"
+    )
+
+    st.markdown("### Registrar nuevo préstamo")
+
+    opciones_miembro = {
+        f"{m['Nombre']} ({m['Cargo']})": m["Id_miembro"] for m in miembros
+    }
+
+    with st.form("form_nuevo_prestamo"):
+        miembro_label = st.selectbox(
+            "Socia / socio (miembro que toma el préstamo)",
+            list(opciones_miembro.keys()),
+        )
+        id_miembro_sel = opciones_miembro[miembro_label]
+
+        fecha_prestamo = st.date_input("Fecha del préstamo", value=dt.date.today())
+        meses_plazo = st.number_input(
+            "Plazo en meses",
+            min_value=1,
+            step=1,
+            value=3,
+        )
+        monto = st.number_input(
+            "Monto del préstamo ($)",
+            min_value=0.0,
+            step=10.0,
+            format="%.2f",
+        )
+
+        st.write(
+            "La tasa mensual se toma automáticamente del reglamento del grupo.\n"
+            "Si en el reglamento dice, por ejemplo, 0.5 por cada $10, aquí se usa 5% mensual."
+        )
+        st.write(f"**Tasa mensual aplicada:** {tasa_mensual*100:.2f}%")
+
+        fecha_primer_pago = st.date_input(
+            "Fecha del primer pago",
+            value=_sumar_meses(fecha_prestamo, 1),
+        )
+
+        proposito = st.text_area(
+            "Propósito del préstamo",
+            placeholder="Ejemplo: capital de trabajo, emergencia médica, etc.",
+        )
+
+        btn_calcular = st.form_submit_button("Calcular y guardar préstamo")
+
+    if btn_calcular:
+        if monto <= 0 or meses_plazo <= 0 or tasa_mensual < 0:
+            st.error("Verifica que monto y plazo sean válidos.")
+            return
+
+        if monto > saldo_caja_actual:
+            st.error(
+                "El monto del préstamo supera el saldo de caja disponible. "
+                "No se puede otorgar este préstamo."
+            )
+            return
+
+        # --- Cálculos redondeados para evitar problemas con DECIMAL ---
+        interes_total = round(monto * tasa_mensual * meses_plazo, 2)
+        capital_total = round(monto, 2)
+        total_pagar = round(capital_total + interes_total, 2)
+
+        capital_cuota = round(capital_total / meses_plazo, 2)
+        interes_cuota = round(interes_total / meses_plazo, 2)
+
+        # --- Insert de préstamo con manejo de errores para ver el mensaje real ---
+        sql_ins = """
+        INSERT INTO prestamos_miembro (
+            Id_grupo, Id_miembro, Fecha_prestamo, Fecha_primer_pago,
+            Meses_plazo, Monto, Tasa_mensual,
+            Capital_total, Interes_total, Total_pagar, Saldo_pendiente
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        try:
+            execute(
+                sql_ins,
+                (
+                    id_grupo,
+                    id_miembro_sel,
+                    fecha_prestamo,
+                    fecha_primer_pago,
+                    int(meses_plazo),
+                    capital_total,
+                    tasa_mensual,
+                    capital_total,
+                    interes_total,
+                    total_pagar,
+                    total_pagar,
+                ),
+            )
+        except Exception as e:
+            st.error(f"Error al guardar el préstamo en la tabla prestamos_miembro: {e}")
+            return
+
+        # Recuperar Id_prestamo recién creado
+        sql_last = """
+        SELECT Id_prestamo
+        FROM prestamos_miembro
+        WHERE Id_grupo = %s AND Id_miembro = %s AND Fecha_prestamo = %s
+        ORDER BY Id_prestamo DESC
+        LIMIT 1
+        """
+        prestamo = fetch_one(sql_last, (id_grupo, id_miembro_sel, fecha_prestamo))
+        if not prestamo:
+            st.error("No se pudo recuperar el préstamo recién creado.")
+            return
+        id_prestamo = prestamo["Id_prestamo"]
+
+        # Crear calendario de pagos (cuotas mensuales)
+        for n in range(1, int(meses_plazo) + 1):
+            fecha_cuota = _sumar_meses(fecha_primer_pago, n - 1)
+            sql_pago = """
+            INSERT INTO pagos_prestamo (
+                Id_prestamo, Numero_cuota, Fecha_programada,
+                Capital_programado, Interes_programado,
+                Capital_pagado, Interes_pagado
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            try:
+                execute(
+                    sql_pago,
+                    (
+                        id_prestamo,
+                        n,
+                        fecha_cuota,
+                        capital_cuota,
+                        interes_cuota,
+                        0.0,
+                        0.0,
+                    ),
+                )
+            except Exception as e:
+                st.error(
+                    f"Error al crear la cuota {n} en la tabla pagos_prestamo: {e}"
+                )
+                return
+
+        invalidar_cartera()
+        st.success(
+            f"Préstamo guardado correctamente. Capital total: ${capital_total:.2f}, "
+            f"intereses totales: ${interes_total:.2f}, total a pagar: ${total_pagar:.2f}."
+        )
+        st.rerun()
+
+    # -------- Gestión de préstamos existentes --------
+    st.markdown("---")
+    st.markdown("### Préstamos registrados")
+
+    prestamos = _obtener_prestamos_de_grupo(id_grupo)
+    if not prestamos:
+        st.info("Aún no hay préstamos registrados para este grupo.")
+        return
+
+    with st.expander("Cartera en riesgo del grupo"):
+        # La consulta corre solo si se pide (el expander cerrado igual se ejecuta)
+        if st.checkbox("Calcular cartera en riesgo", key="cartera_grupo_ver"):
+            mostrar_cartera(cartera_en_riesgo("grupo", id_grupo))
+
+    etiquetas_prestamo = {
+        f"#{p['Id_prestamo']} - {p['Nombre']} - ${p['Monto']:.2f} "
+        f"({p['Fecha_prestamo']}, {p['Meses_plazo']} meses) — "
+        f"saldo ${float(p['Saldo_pendiente'] or 0):.2f}"
+        + (f", {p['Cuotas_vencidas']} cuota(s) vencida(s)" if p["Cuotas_vencidas"] else ""):
+        p["Id_prestamo"]
+        for p in prestamos
+    }
+
+    id_prestamo_sel = st.selectbox(
+        "Selecciona un préstamo para ver / registrar pagos",
+        list(etiquetas_prestamo.values()),
+        format_func=lambda pid: next(
+            k for k, v in etiquetas_prestamo.items() if v == pid
+        ),
+    )
+
+    prestamo_sel = next(p for p in prestamos if p["Id_prestamo"] == id_prestamo_sel)
+    pagos = _obtener_pagos_prestamo(id_prestamo_sel)
+
+    st.write(
+        f"**Socia:** {prestamo_sel['Nombre']} ({prestamo_sel['Cargo']}) — "
+        f"Fecha préstamo: {prestamo_sel['Fecha_prestamo']} — "
+        f"Monto: ${prestamo_sel['Monto']:.2f} — "
+        f"Tasa mensual: {prestamo_sel['Tasa_mensual']*100:.2f}% — "
+        f"Total a pagar: ${prestamo_sel['Total_pagar']:.2f}"
+    )
+
+    if not pagos:
+        st.info("No se encontraron cuotas para este préstamo.")
+        return
+
+    st.markdown("#### Calendario de pagos (a pagar vs pagado)")
+
+    total_cap_prog = sum(float(p["Capital_programado"]) for p in pagos)
+    total_int_prog = sum(float(p["Interes_programado"]) for p in pagos)
+    total_cap_pag = sum(float(p["Capital_pagado"]) for p in pagos)
+    total_int_pag = sum(float(p["Interes_pagado"]) for p in pagos)
+
+    tabla = pd.DataFrame(
+        [
+            {
+                "Id_pago": p["Id_pago"],
+                "Cuota": p["Numero_cuota"],
+                "Fecha": p["Fecha_programada"],
+                "Capital a pagar": float(p["Capital_programado"]),
+                "Interés a pagar": float(p["Interes_programado"]),
+                "Capital pagado": float(p["Capital_pagado"]),
+                "Interés pagado": float(p["Interes_pagado"]),
+            }
+            for p in pagos
+        ]
+    )
+
+    # Una sola tabla editable en lugar de cinco columnas por cuota
+    with st.form("form_pagos_prestamo"):
+        editado = st.data_editor(
+            tabla,
+            key=f"editor_pagos_{id_prestamo_sel}",
+            hide_index=True,
+            use_container_width=True,
+            num_rows="fixed",
+            disabled=["Id_pago", "Cuota", "Capital a pagar", "Interés a pagar"],
+            column_config={
+                "Id_pago": None,
+                "Fecha": st.column_config.DateColumn(format="YYYY-MM-DD", required=True),
+                "Capital a pagar": st.column_config.NumberColumn(format="$%.2f"),
+                "Interés a pagar": st.column_config.NumberColumn(format="$%.2f"),
+                "Capital pagado": st.column_config.NumberColumn(
+                    min_value=0.0, step=1.0, format="%.2f"
+                ),
+                "Interés pagado": st.column_config.NumberColumn(
+                    min_value=0.0, step=1.0, format="%.2f"
+                ),
+            },
+        )
+        btn_guardar_pagos = st.form_submit_button("Guardar pagos")
+
+
+    if btn_guardar_pagos:
+        nuevos_pagos = [
+            {
+                "Id_pago": int(f["Id_pago"]),
+                "Fecha_programada": pd.Timestamp(f["Fecha"]).date(),
+                "Capital_pagado": float(f["Capital pagado"]),
+                "Interes_pagado": float(f["Interés pagado"]),
+            }
+            for f in editado.fillna({"Capital pagado": 0.0, "Interés pagado": 0.0}).to_dict(
+                "records"
+            )
+        ]
+
+        # Solo las cuotas que cambiaron respecto a lo cargado
+        originales = {p["Id_pago"]: p for p in pagos}
+        cambiados = [
+            np
+            for np in nuevos_pagos
+            if np["Fecha_programada"] != originales[np["Id_pago"]]["Fecha_programada"]
+            or monto_cambio(originales[np["Id_pago"]]["Capital_pagado"], np["Capital_pagado"])
+            or monto_cambio(originales[np["Id_pago"]]["Interes_pagado"], np["Interes_pagado"])
+        ]
+
+        if not cambiados:
+            st.info("No hay cambios en las cuotas.")
+        else:
+            # Pagos y saldo del préstamo se confirman juntos
+            with transaccion() as cur:
+                update_en_lote(
+                    cur,
+                    "pagos_prestamo",
+                    "Id_pago",
+                    ["Fecha_programada", "Capital_pagado", "Interes_pagado"],
+                    cambiados,
+                )
+                recalcular_saldos(cur, [id_prestamo_sel])
+
+            invalidar_cartera()
+            st.success(f"Pagos actualizados correctamente ({len(cambiados)} cuota(s)).")
+            st.rerun()
+
+    # Resumen; el saldo es el que recalcular_saldos dejó guardado en la BD
+    total_pagado = total_cap_pag + total_int_pag
+    saldo_pendiente = float(prestamo_sel["Saldo_pendiente"] or 0)
+
+    st.markdown("#### Resumen del préstamo")
+    st.write(f"- Capital total programado: **${total_cap_prog:.2f}**")
+    st.write(f"- Interés total programado: **${total_int_prog:.2f}**")
+    st.write(f"- Capital pagado: **${total_cap_pag:.2f}**")
+    st.write(f"- Interés pagado: **${total_int_pag:.2f}**")
+    st.write(f"- Total pagado: **${total_pagado:.2f}**")
+    st.write(f"- Saldo pendiente: **${saldo_pendiente:.2f}**")
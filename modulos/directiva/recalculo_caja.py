@@ -0,0 +1,185 @@
+# modulos/directiva/recalculo_caja.py
+#
+# Cadena de saldos de caja_reunion. Cada caja abre con el Saldo_cierre de
+# la caja anterior del grupo (orden: Fecha, Numero_reunion, Id_caja) y
+# cierra con Saldo_apertura + Total_entradas - Total_salidas. Si se cambia
+# una caja antigua, todas las siguientes quedan con saldos viejos; aquí se
+# recalculan de una vez:
+#   - recalcular_desde(): después de guardar una caja, en la misma
+#     transacción, corrige las cajas posteriores de ese grupo
+#   - reconstruir_todos(): rehace la cadena completa de todos los grupos,
+#     repartidos en lotes que corren en paralelo
+# El saldo acumulado sale de una sola consulta con SUM(...) OVER (...)
+# y las correcciones se escriben con un UPDATE por lote.
+#
+#   python -m modulos.directiva.recalculo_caja --todos --trabajadores 4
+#   python -m modulos.directiva.recalculo_caja --grupo 12
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modulos.config.conexion import fetch_all, transaccion, update_en_lote
+
+# Tolerancia para comparar montos DECIMAL
+_TOLERANCIA = 0.01
+
+# Cajas por sentencia UPDATE
+_LOTE_UPDATE = 500
+
+# Grupos por transacción en la reconstrucción completa
+_GRUPOS_POR_LOTE = 50
+
+# Orden de la cadena; debe coincidir con "caja_saldo_anterior" (consultas.py)
+ORDEN_CAJA = "rg.Fecha, COALESCE(rg.Numero_reunion, 0), cr.Id_caja"
+
+
+def _sql_cadena(filtro: str) -> str:
+    return f"""
+    SELECT
+        cr.Id_caja,
+        cr.Id_grupo,
+        cr.Saldo_apertura,
+        cr.Saldo_cierre,
+        cr.Total_entradas - cr.Total_salidas AS Neto,
+        SUM(cr.Total_entradas - cr.Total_salidas) OVER (
+            PARTITION BY cr.Id_grupo
+            ORDER BY {ORDEN_CAJA}
+            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+        ) AS Acumulado
+    FROM caja_reunion cr
+    JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+    WHERE {filtro}
+    ORDER BY cr.Id_grupo, {ORDEN_CAJA}
+    """
+
+
+def _corregir(cur, filas: list[dict], base: dict[int, float]) -> int:
+    """
+    Con el acumulado de cada fila calcula su apertura y cierre correctos
+    (base del grupo + acumulado) y actualiza solo las que cambian.
+    """
+    cambios = []
+    for f in filas:
+        cierre = round(base.get(f["Id_grupo"], 0.0) + float(f["Acumulado"] or 0), 2)
+        apertura = round(cierre - float(f["Neto"] or 0), 2)
+        if (
+            abs(float(f["Saldo_apertura"] or 0) - apertura) > _TOLERANCIA
+            or abs(float(f["Saldo_cierre"] or 0) - cierre) > _TOLERANCIA
+        ):
+            cambios.append(
+                {"Id_caja": f["Id_caja"], "Saldo_apertura": apertura, "Saldo_cierre": cierre}
+            )
+
+    for i in range(0, len(cambios), _LOTE_UPDATE):
+        update_en_lote(
+            cur,
+            "caja_reunion",
+            "Id_caja",
+            ["Saldo_apertura", "Saldo_cierre"],
+            cambios[i:i + _LOTE_UPDATE],
+        )
+    return len(cambios)
+
+
+def recalcular_desde(cur, id_caja: int) -> int:
+    """
+    Recalcula las cajas del mismo grupo posteriores a 'id_caja', partiendo
+    de su Saldo_cierre. Usa el cursor de una transacción abierta (ver
+    conexion.transaccion) para confirmar todo junto con la caja guardada.
+    Devuelve cuántas cajas se corrigieron.
+    """
+    cur.execute(
+        """
+        SELECT cr.Id_grupo, cr.Saldo_cierre, rg.Fecha,
+               COALESCE(rg.Numero_reunion, 0) AS Numero
+        FROM caja_reunion cr
+        JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+        WHERE cr.Id_caja = %s
+        """,
+        (id_caja,),
+    )
+    origen = cur.fetchone()
+    if not origen:
+        return 0
+
+    cur.execute(
+        _sql_cadena(
+            f"cr.Id_grupo = %s AND ({ORDEN_CAJA}) > (%s, %s, %s)"
+        ),
+        (origen["Id_grupo"], origen["Fecha"], origen["Numero"], id_caja),
+    )
+    filas = cur.fetchall()
+    return _corregir(cur, filas, {origen["Id_grupo"]: float(origen["Saldo_cierre"] or 0)})
+
+
+def reconstruir_cadena(cur, ids_grupo: list[int]) -> int:
+    """
+    Rehace la cadena completa (la primera caja abre en 0) de los grupos
+    indicados con el cursor de una transacción abierta. Devuelve cuántas
+    cajas se corrigieron.
+    """
+    if not ids_grupo:
+        return 0
+    marcadores = ", ".join(["%s"] * len(ids_grupo))
+    cur.execute(_sql_cadena(f"cr.Id_grupo IN ({marcadores})"), tuple(ids_grupo))
+    return _corregir(cur, cur.fetchall(), {})
+
+
+def reconstruir_grupos(ids_grupo: list[int]) -> int:
+    """reconstruir_cadena() de los grupos indicados, en su propia transacción."""
+    if not ids_grupo:
+        return 0
+    with transaccion(categoria="exportacion") as cur:
+        return reconstruir_cadena(cur, ids_grupo)
+
+
+def reconstruir_todos(trabajadores: int = 4, id_grupo: int | None = None) -> dict:
+    """
+    Reconstruye la cadena de todos los grupos con caja (o de uno solo).
+    Los grupos se reparten en lotes de _GRUPOS_POR_LOTE; cada lote es una
+    transacción propia y hasta 'trabajadores' lotes corren a la vez.
+    """
+    inicio = time.perf_counter()
+    if id_grupo is not None:
+        ids = [id_grupo]
+    else:
+        ids = [
+            f["Id_grupo"]
+            for f in fetch_all("SELECT DISTINCT Id_grupo FROM caja_reunion ORDER BY Id_grupo")
+        ]
+    lotes = [ids[i:i + _GRUPOS_POR_LOTE] for i in range(0, len(ids), _GRUPOS_POR_LOTE)]
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, trabajadores), thread_name_prefix="gapc-caja"
+    ) as ejecutor:
+        corregidas = sum(ejecutor.map(reconstruir_grupos, lotes))
+
+    return {
+        "grupos": len(ids),
+        "corregidas": corregidas,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recalcula la cadena de saldos de caja_reunion."
+    )
+    destino = parser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--todos", action="store_true", help="Todos los grupos")
+    destino.add_argument("--grupo", type=int, help="Un solo grupo")
+    parser.add_argument(
+        "--trabajadores", type=int, default=4,
+        help="Lotes de grupos que se procesan a la vez (no más que el pool)",
+    )
+    args = parser.parse_args(argv)
+
+    r = reconstruir_todos(args.trabajadores, id_grupo=args.grupo)
+    print(
+        f"{r['grupos']} grupo(s), {r['corregidas']} caja(s) corregidas "
+        f"en {r['segundos']:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
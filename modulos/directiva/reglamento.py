@@ -0,0 +1,273 @@
+# modulos/directiva/reglamento.py
+
+import datetime as dt
+import streamlit as st
+
+from modulos.config.conexion import execute
+from modulos.reportes.ciclos import invalidar_catalogo
+from modulos.directiva.comun import invalidar_datos_grupo, obtener_reglamento_por_grupo
+
+
+# -------------------------------------------------------
+# Sección: Reglamento de grupo
+# -------------------------------------------------------
+def seccion_reglamento(info_dir: dict):
+    st.subheader("Reglamento del grupo")
+
+    id_grupo = info_dir["Id_grupo"]
+    nombre_grupo = info_dir["Nombre_grupo"]
+
+    st.caption(f"Grupo: **{nombre_grupo}** — Id_grupo: {id_grupo}")
+
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+
+    # -------- Formulario --------
+    with st.form("form_reglamento_grupo"):
+        # Datos básicos
+        nombre_comunidad = st.text_input(
+            "Nombre de la comunidad",
+            value=(reglamento.get("Nombre_comunidad") if reglamento else ""),
+        )
+
+        # Fecha de formación del grupo
+        if reglamento and reglamento.get("Fecha_formacion"):
+            fecha_formacion = st.date_input(
+                "Fecha en que se formó el grupo de ahorro",
+                value=reglamento["Fecha_formacion"],
+            )
+        else:
+            fecha_formacion = st.date_input(
+                "Fecha en que se formó el grupo de ahorro",
+                value=dt.date.today(),
+            )
+
+        st.markdown("### Reuniones")
+        reunion_dia = st.text_input(
+            "Día de la reunión",
+            value=(reglamento.get("Reunion_dia") if reglamento else ""),
+        )
+        reunion_hora = st.text_input(
+            "Hora de la reunión",
+            value=(reglamento.get("Reunion_hora") if reglamento else ""),
+            help="Ejemplo: 3:00 p.m.",
+        )
+        reunion_lugar = st.text_input(
+            "Lugar de la reunión",
+            value=(reglamento.get("Reunion_lugar") if reglamento else ""),
+        )
+        reunion_frecuencia = st.text_input(
+            "Frecuencia de la reunión",
+            value=(reglamento.get("Reunion_frecuencia") if reglamento else ""),
+            help="Ejemplo: semanal, quincenal, mensual…",
+        )
+
+        st.markdown("### Multas y ahorro mínimo")
+        monto_multa = st.number_input(
+            "Monto de la multa por inasistencia o llegadas tarde ($)",
+            min_value=0.0,
+            step=0.5,
+            format="%.2f",
+            value=float(reglamento["Monto_multa"])
+            if reglamento and reglamento.get("Monto_multa") is not None
+            else 0.0,
+        )
+
+        ahorro_minimo = st.number_input(
+            "Cantidad mínima de ahorro por reunión ($)",
+            min_value=0.0,
+            step=0.5,
+            format="%.2f",
+            value=float(reglamento["Ahorro_minimo"])
+            if reglamento and reglamento.get("Ahorro_minimo") is not None
+            else 0.0,
+        )
+
+        st.markdown("### Préstamos")
+        interes_por_10 = st.number_input(
+            "Pagamos ____ de interés por cada $10.00 prestados (por período)",
+            min_value=0.0,
+            step=0.1,
+            format="%.2f",
+            value=float(reglamento["Interes_por_10"])
+            if reglamento and reglamento.get("Interes_por_10") is not None
+            else 0.0,
+        )
+
+        prestamo_maximo = st.number_input(
+            "Solamente podemos tomar préstamos hasta la cantidad máxima de ($)",
+            min_value=0.0,
+            step=10.0,
+            format="%.2f",
+            value=float(reglamento["Prestamo_maximo"])
+            if reglamento and reglamento.get("Prestamo_maximo") is not None
+            else 0.0,
+        )
+
+        plazo_maximo_meses = st.number_input(
+            "Solamente podemos tomar préstamos por un plazo máximo de (meses)",
+            min_value=1,
+            step=1,
+            value=int(reglamento["Plazo_maximo_meses"])
+            if reglamento and reglamento.get("Plazo_maximo_meses") is not None
+            else 6,
+        )
+
+        condiciones_prestamo = st.text_area(
+            "Condiciones adicionales de préstamo",
+            value=(reglamento.get("Condiciones_prestamo") if reglamento else ""),
+            placeholder=(
+                "Ejemplo: solo podemos tener un préstamo a la vez, "
+                "requisitos especiales, garantías, etc."
+            ),
+        )
+
+        st.markdown("### Ciclo y meta social")
+        if reglamento and reglamento.get("Fecha_inicio_ciclo"):
+            fecha_inicio_ciclo = st.date_input(
+                "Fecha de inicio del ciclo (primer depósito)",
+                value=reglamento["Fecha_inicio_ciclo"],
+            )
+        else:
+            fecha_inicio_ciclo = st.date_input(
+                "Fecha de inicio del ciclo (primer depósito)",
+                value=dt.date.today(),
+            )
+
+        if reglamento and reglamento.get("Fecha_fin_ciclo"):
+            fecha_fin_ciclo = st.date_input(
+                "Fecha estimada de cierre del ciclo",
+                value=reglamento["Fecha_fin_ciclo"],
+            )
+        else:
+            fecha_fin_ciclo = st.date_input(
+                "Fecha estimada de cierre del ciclo",
+                value=dt.date.today().replace(year=dt.date.today().year + 1),
+            )
+
+        meta_social = st.text_area(
+            "Meta social del grupo",
+            value=(reglamento.get("Meta_social") if reglamento else ""),
+            placeholder="Ejemplo: actividades comunitarias, apoyo a la escuela, etc.",
+        )
+
+        if reglamento:
+            col1, col2 = st.columns(2)
+            with col1:
+                guardar = st.form_submit_button("Actualizar reglamento")
+            with col2:
+                eliminar = st.form_submit_button(
+                    "Eliminar reglamento", type="secondary"
+                )
+        else:
+            guardar = st.form_submit_button("Guardar reglamento")
+            eliminar = False
+
+    # -------- Lógica de guardado / borrado --------
+    if guardar:
+        if not nombre_comunidad.strip():
+            st.warning("Debes escribir el nombre de la comunidad.")
+            return
+
+        if reglamento is None:
+            sql = """
+            INSERT INTO reglamento_grupo (
+                Id_grupo,
+                Nombre_comunidad,
+                Fecha_formacion,
+                Reunion_dia,
+                Reunion_hora,
+                Reunion_lugar,
+                Reunion_frecuencia,
+                Monto_multa,
+                Ahorro_minimo,
+                Condiciones_prestamo,
+                Fecha_inicio_ciclo,
+                Fecha_fin_ciclo,
+                Meta_social,
+                Interes_por_10,
+                Prestamo_maximo,
+                Plazo_maximo_meses
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            execute(
+                sql,
+                (
+                    id_grupo,
+                    nombre_comunidad.strip(),
+                    fecha_formacion,
+                    reunion_dia.strip(),
+                    reunion_hora.strip(),
+                    reunion_lugar.strip(),
+                    reunion_frecuencia.strip(),
+                    monto_multa,
+                    ahorro_minimo,
+                    condiciones_prestamo.strip(),
+                    fecha_inicio_ciclo,
+                    fecha_fin_ciclo,
+                    meta_social.strip(),
+                    interes_por_10,
+                    prestamo_maximo,
+                    plazo_maximo_meses,
+                ),
+            )
+            invalidar_datos_grupo(id_grupo)
+            invalidar_catalogo()
+            st.success("Reglamento creado correctamente.")
+        else:
+            sql = """
+            UPDATE reglamento_grupo
+            SET
+                Nombre_comunidad = %s,
+                Fecha_formacion = %s,
+                Reunion_dia = %s,
+                Reunion_hora = %s,
+                Reunion_lugar = %s,
+                Reunion_frecuencia = %s,
+                Monto_multa = %s,
+                Ahorro_minimo = %s,
+                Condiciones_prestamo = %s,
+                Fecha_inicio_ciclo = %s,
+                Fecha_fin_ciclo = %s,
+                Meta_social = %s,
+                Interes_por_10 = %s,
+                Prestamo_maximo = %s,
+                Plazo_maximo_meses = %s
+            WHERE Id_reglamento = %s
+            """
+            execute(
+                sql,
+                (
+                    nombre_comunidad.strip(),
+                    fecha_formacion,
+                    reunion_dia.strip(),
+                    reunion_hora.strip(),
+                    reunion_lugar.strip(),
+                    reunion_frecuencia.strip(),
+                    monto_multa,
+                    ahorro_minimo,
+                    condiciones_prestamo.strip(),
+                    fecha_inicio_ciclo,
+                    fecha_fin_ciclo,
+                    meta_social.strip(),
+                    interes_por_10,
+                    prestamo_maximo,
+                    plazo_maximo_meses,
+                    reglamento["Id_reglamento"],
+                ),
+            )
+            invalidar_datos_grupo(id_grupo)
+            invalidar_catalogo()
+            st.success("Reglamento actualizado correctamente.")
+
+        st.rerun()
+
+    if eliminar and reglamento:
+        execute(
+            "DELETE FROM reglamento_grupo WHERE Id_reglamento = %s",
+            (reglamento["Id_reglamento"],),
+        )
+        invalidar_datos_grupo(id_grupo)
+        invalidar_catalogo()
+        st.success("Reglamento eliminado correctamente.")
+        st.rerun()
@@ -0,0 +1,100 @@
+# modulos/directiva/reportes.py
+
+import datetime as dt
+import streamlit as st
+
+from modulos.config.resiliencia import ConsultaExcedida
+from modulos.reportes.motor import reporte_caja
+from modulos.directiva.comun import obtener_reglamento_por_grupo, obtener_cierres_ciclo_grupo
+
+
+# -------------------------------------------------------
+# Sección: Reportes (Directiva)
+# -------------------------------------------------------
+def seccion_reportes_directiva(info_dir: dict):
+    st.subheader("Reportes del grupo (ingresos, egresos y consolidado)")
+
+    id_grupo = info_dir["Id_grupo"]
+
+    # Necesitamos el reglamento para saber el ciclo actual
+    reglamento = obtener_reglamento_por_grupo(id_grupo)
+    if not reglamento:
+        st.info(
+            "Primero debes definir el reglamento del grupo para poder ver reportes."
+        )
+        return
+
+    fecha_inicio_actual = reglamento.get("Fecha_inicio_ciclo")
+    fecha_fin_actual = reglamento.get("Fecha_fin_ciclo")
+
+    if not fecha_inicio_actual or not fecha_fin_actual:
+        st.warning(
+            "El reglamento no tiene definidas la fecha de inicio y fin del ciclo. "
+            "Completa esos datos en la pestaña de Reglamento."
+        )
+        return
+
+    # Opciones de ciclos: ciclo actual + ciclos pasados (de cierres_ciclo)
+    rangos_ciclos: dict[str, tuple[dt.date, dt.date]] = {}
+
+    # Ciclo actual según reglamento
+    rangos_ciclos[
+        f"Ciclo actual: del {fecha_inicio_actual} al {fecha_fin_actual}"
+    ] = (fecha_inicio_actual, fecha_fin_actual)
+
+    # Ciclos pasados a partir de la tabla cierres_ciclo
+    cierres = obtener_cierres_ciclo_grupo(id_grupo)
+    for c in cierres:
+        label = (
+            f"Ciclo cerrado el {c['Fecha_cierre']}: "
+            f"del {c['Fecha_inicio_ciclo']} al {c['Fecha_fin_ciclo']}"
+        )
+        rangos_ciclos[label] = (c["Fecha_inicio_ciclo"], c["Fecha_fin_ciclo"])
+
+    st.markdown("### Seleccionar ciclo para ver los gráficos")
+    etiqueta_sel = st.selectbox(
+        "Ciclo",
+        list(rangos_ciclos.keys()),
+    )
+
+    fecha_ini, fecha_fin = rangos_ciclos[etiqueta_sel]
+    st.caption(f"Mostrando información desde **{fecha_ini}** hasta **{fecha_fin}**.")
+
+    # Serie de caja del rango (se reutiliza en los tres gráficos)
+    try:
+        df = reporte_caja(id_grupo, fecha_ini, fecha_fin)
+    except ConsultaExcedida as e:
+        st.warning(str(e))
+        return
+    if df.empty:
+        st.info(
+            "No se encontraron registros de caja en el rango seleccionado. "
+            "Verifica que se haya registrado la caja en la pestaña correspondiente."
+        )
+        return
+
+    total_ingresos = df["Ingresos"].sum()
+    total_egresos = df["Egresos"].sum()
+    saldo_final = df["Saldo_cierre"].iloc[-1]
+
+    # ----- Gráfico de ingresos -----
+    st.markdown("#### Ingresos del ciclo seleccionado")
+    st.bar_chart(df, x="Reunión", y="Ingresos")
+    st.write(f"**Total de ingresos del ciclo:** ${total_ingresos:.2f}")
+
+    # ----- Gráfico de egresos -----
+    st.markdown("#### Egresos del ciclo seleccionado")
+    st.bar_chart(df, x="Reunión", y="Egresos")
+    st.write(f"**Total de egresos del ciclo:** ${total_egresos:.2f}")
+
+    # ----- Gráfico consolidado (saldo de caja por reunión) -----
+    st.markdown("#### Consolidado del ciclo (saldo de caja por reunión)")
+    st.line_chart(
+        df.rename(columns={"Saldo_cierre": "Saldo de caja"}),
+        x="Reunión",
+        y="Saldo de caja",
+    )
+    st.write(
+        f"**Saldo de caja al final del ciclo (última reunión en el rango):** "
+        f"${saldo_final:.2f}"
+    )
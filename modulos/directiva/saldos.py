@@ -0,0 +1,160 @@
+# modulos/directiva/saldos.py
+#
+# Saldos desnormalizados de cada préstamo (prestamos_miembro):
+#   - Saldo_pendiente: Total_pagar menos lo pagado (capital + interés)
+#   - Cuotas_vencidas: cuotas con fecha ya pasada y pago incompleto
+#   - Ultimo_pago:     fecha de la última cuota con algún pago
+# Se recalculan dentro de la misma transacción que guarda los pagos.
+# Cuotas_vencidas depende de la fecha, así que conviene correr la
+# verificación una vez al día:
+#   python -m modulos.directiva.saldos --corregir
+import argparse
+import datetime as dt
+import sys
+
+from modulos.config.conexion import iter_rows, transaccion
+
+# Tolerancia para comparar montos DECIMAL
+_TOLERANCIA = 0.01
+
+# Préstamos que se recalculan por sentencia en la verificación
+_LOTE_CORRECCION = 500
+
+
+def _sql_recalcular(cantidad: int) -> str:
+    # Sin alias en la tabla del UPDATE para que funcione igual en otros motores
+    marcadores = ", ".join(["%s"] * cantidad)
+    return f"""
+    UPDATE prestamos_miembro
+    SET
+        Saldo_pendiente = Total_pagar - COALESCE((
+            SELECT SUM(pp.Capital_pagado + pp.Interes_pagado)
+            FROM pagos_prestamo pp
+            WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+        ), 0),
+        Cuotas_vencidas = (
+            SELECT COUNT(*)
+            FROM pagos_prestamo pp
+            WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+              AND pp.Fecha_programada < %s
+              AND pp.Capital_pagado + pp.Interes_pagado
+                  < pp.Capital_programado + pp.Interes_programado - 0.01
+        ),
+        Ultimo_pago = (
+            SELECT MAX(pp.Fecha_programada)
+            FROM pagos_prestamo pp
+            WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+              AND pp.Capital_pagado + pp.Interes_pagado > 0
+        )
+    WHERE Id_prestamo IN ({marcadores})
+    """
+
+
+def recalcular_saldos(cur, ids_prestamo, hoy: dt.date | None = None) -> None:
+    """
+    Recalcula los saldos de los préstamos indicados usando el cursor de una
+    transacción abierta (ver conexion.transaccion), para que queden
+    confirmados junto con los pagos que los cambiaron.
+    """
+    ids = list(dict.fromkeys(ids_prestamo))
+    if not ids:
+        return
+    hoy = hoy or dt.date.today()
+    cur.execute(_sql_recalcular(len(ids)), (hoy, *ids))
+
+
+# -------------------------------------------------------------------
+# VERIFICACIÓN: compara lo guardado contra lo calculado desde pagos
+# -------------------------------------------------------------------
+def _sql_verificar(por_grupo: bool) -> str:
+    filtro = "WHERE p.Id_grupo = %s" if por_grupo else ""
+    return f"""
+    SELECT
+        p.Id_prestamo,
+        p.Id_grupo,
+        p.Saldo_pendiente,
+        p.Cuotas_vencidas,
+        p.Ultimo_pago,
+        p.Total_pagar - COALESCE(SUM(pp.Capital_pagado + pp.Interes_pagado), 0)
+            AS Saldo_calculado,
+        COALESCE(SUM(
+            CASE
+                WHEN pp.Fecha_programada < %s
+                 AND pp.Capital_pagado + pp.Interes_pagado
+                     < pp.Capital_programado + pp.Interes_programado - 0.01
+                THEN 1 ELSE 0
+            END
+        ), 0) AS Vencidas_calculadas,
+        MAX(
+            CASE WHEN pp.Capital_pagado + pp.Interes_pagado > 0
+                 THEN pp.Fecha_programada END
+        ) AS Ultimo_calculado
+    FROM prestamos_miembro p
+    LEFT JOIN pagos_prestamo pp ON pp.Id_prestamo = p.Id_prestamo
+    {filtro}
+    GROUP BY p.Id_prestamo, p.Id_grupo, p.Saldo_pendiente,
+             p.Cuotas_vencidas, p.Ultimo_pago, p.Total_pagar
+    ORDER BY p.Id_prestamo
+    """
+
+
+def _hay_desfase(f: dict) -> bool:
+    if abs(float(f["Saldo_pendiente"] or 0) - float(f["Saldo_calculado"] or 0)) > _TOLERANCIA:
+        return True
+    if int(f["Cuotas_vencidas"] or 0) != int(f["Vencidas_calculadas"] or 0):
+        return True
+    # MAX() de una fecha puede volver como texto en algunos motores
+    return str(f["Ultimo_pago"] or "") != str(f["Ultimo_calculado"] or "")[:10]
+
+
+def verificar_saldos(
+    id_grupo: int | None = None,
+    corregir: bool = False,
+    hoy: dt.date | None = None,
+) -> list[dict]:
+    """
+    Recalcula los saldos desde pagos_prestamo (de un grupo o de todos) y
+    devuelve los préstamos cuyo valor guardado no coincide.
+    Con corregir=True además los actualiza, en una sola transacción.
+    """
+    hoy = hoy or dt.date.today()
+    params = (hoy, id_grupo) if id_grupo is not None else (hoy,)
+    desfasados = [
+        f for f in iter_rows(_sql_verificar(id_grupo is not None), params)
+        if _hay_desfase(f)
+    ]
+
+    if corregir and desfasados:
+        ids = [f["Id_prestamo"] for f in desfasados]
+        with transaccion() as cur:
+            for i in range(0, len(ids), _LOTE_CORRECCION):
+                recalcular_saldos(cur, ids[i:i + _LOTE_CORRECCION], hoy)
+
+    return desfasados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Verifica los saldos desnormalizados de prestamos_miembro."
+    )
+    parser.add_argument("--grupo", type=int, help="Limitar a un grupo")
+    parser.add_argument("--corregir", action="store_true", help="Actualizar los desfasados")
+    args = parser.parse_args(argv)
+
+    desfasados = verificar_saldos(args.grupo, corregir=args.corregir)
+    for f in desfasados:
+        print(
+            f"Préstamo {f['Id_prestamo']} (grupo {f['Id_grupo']}): "
+            f"saldo {f['Saldo_pendiente']} -> {f['Saldo_calculado']}, "
+            f"vencidas {f['Cuotas_vencidas']} -> {f['Vencidas_calculadas']}, "
+            f"último pago {f['Ultimo_pago']} -> {f['Ultimo_calculado']}"
+        )
+    print(f"{len(desfasados)} préstamo(s) con desfase"
+          + (" corregidos." if args.corregir and desfasados else "."))
+
+    if desfasados and not args.corregir:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
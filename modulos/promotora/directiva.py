@@ -3,8 +3,9 @@
 import datetime as dt
 import streamlit as st
 
-from modulos.config.conexion import fetch_all, fetch_one, execute
+from modulos.config.consultas import uno, todos, ejecutar
 from modulos.auth.rbac import has_role
+from modulos.auth.perfil import invalidar_perfiles
 
 
 def _obtener_grupos_de_promotora(dui_promotora: str):
@@ -12,42 +13,14 @@ def _obtener_grupos_de_promotora(dui_promotora: str):
     Devuelve los grupos donde el DUI indicado aparece en la columna DUIs_promotoras.
     Se usa para que la promotora solo pueda asignar directivas a SUS grupos.
     """
-    sql = """
-        SELECT 
-            g.Id_grupo,
-            g.Nombre,
-            d.Nombre AS Distrito,
-            g.Estado,
-            g.Creado_en,
-            g.DUIs_promotoras
-        FROM grupos g
-        LEFT JOIN distritos d ON d.Id_distrito = g.Id_distrito
-        -- Quitamos espacios en DUIs_promotoras por si los hay
-        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
-        ORDER BY g.Id_grupo
-    """
-    return fetch_all(sql, (dui_promotora,))
+    return todos("grupos_de_promotora", (dui_promotora,))
 
 
 def _listar_directivas_de_promotora(dui_promotora: str):
     """
     Lista las directivas cuya Id_grupo pertenece a grupos donde aparece el DUI de la promotora.
     """
-    sql = """
-        SELECT 
-            dir.Id_directiva,
-            dir.Nombre,
-            dir.DUI,
-            g.Id_grupo,
-            g.Nombre AS Grupo,
-            g.DUIs_promotoras,
-            dir.Creado_en
-        FROM directiva dir
-        JOIN grupos g ON g.Id_grupo = dir.Id_grupo
-        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
-        ORDER BY dir.Id_directiva
-    """
-    return fetch_all(sql, (dui_promotora,))
+    return todos("directivas_de_promotora", (dui_promotora,))
 
 
 @has_role("PROMOTORA")
@@ -109,9 +82,7 @@ def crear_directiva_panel(promotora: dict):
             return
 
         # Verificar que exista el rol DIRECTIVA
-        rol_dir = fetch_one(
-            "SELECT Id_rol FROM rol WHERE `Tipo de rol` = 'DIRECTIVA' LIMIT 1"
-        )
+        rol_dir = uno("rol_directiva")
         if not rol_dir:
             st.error(
                 "No se encontró el rol 'DIRECTIVA' en la tabla 'rol'. "
@@ -122,10 +93,7 @@ def crear_directiva_panel(promotora: dict):
         id_rol_directiva = rol_dir["Id_rol"]
 
         # Verificar que el DUI no exista ya como usuario (para evitar conflictos)
-        existe_usuario = fetch_one(
-            "SELECT Id_usuario FROM Usuario WHERE DUI = %s LIMIT 1",
-            (dui_dir,),
-        )
+        existe_usuario = uno("usuario_por_dui", (dui_dir,))
         if existe_usuario:
             st.warning(
                 "Ya existe un usuario con ese DUI. "
@@ -135,23 +103,18 @@ def crear_directiva_panel(promotora: dict):
 
         # Insertar en Usuario
         hoy = dt.date.today()
-        id_usuario_nuevo = execute(
-            """
-            INSERT INTO Usuario (Nombre, DUI, Contraseña, Id_rol)
-            VALUES (%s, %s, %s, %s)
-            """,
+        id_usuario_nuevo = ejecutar(
+            "usuario_crear",
             (nombre_dir.strip(), dui_dir.strip(), contr_dir.strip(), id_rol_directiva),
             return_last_id=True,
         )
 
         # Insertar en tabla directiva
-        execute(
-            """
-            INSERT INTO directiva (Nombre, DUI, Id_grupo, Creado_en)
-            VALUES (%s, %s, %s, %s)
-            """,
+        ejecutar(
+            "directiva_crear",
             (nombre_dir.strip(), dui_dir.strip(), id_grupo_sel, hoy),
         )
+        invalidar_perfiles()
 
         st.success(
             f"Directiva creada correctamente y asociada al grupo {etiqueta_grupo}. "
@@ -208,27 +171,15 @@ def crear_directiva_panel(promotora: dict):
             dui_dir = dir_sel["DUI"]
 
             # 1) Eliminar el registro de la tabla directiva
-            execute(
-                "DELETE FROM directiva WHERE Id_directiva = %s",
-                (dir_sel["Id_directiva"],),
-            )
+            ejecutar("directiva_eliminar", (dir_sel["Id_directiva"],))
 
             # 2) Verificar si todavía existe alguna directiva con ese mismo DUI
-            aun_tiene_directivas = fetch_one(
-                "SELECT Id_directiva FROM directiva WHERE DUI = %s LIMIT 1",
-                (dui_dir,),
-            )
+            aun_tiene_directivas = uno("directiva_existe_dui", (dui_dir,))
 
             # 3) Si ya no tiene directivas, eliminar también al usuario con rol DIRECTIVA
             if not aun_tiene_directivas:
-                execute(
-                    """
-                    DELETE u FROM Usuario u
-                    JOIN rol r ON r.Id_rol = u.Id_rol
-                    WHERE u.DUI = %s AND r.`Tipo de rol` = 'DIRECTIVA'
-                    """,
-                    (dui_dir,),
-                )
+                ejecutar("usuario_directiva_eliminar", (dui_dir,))
 
+            invalidar_perfiles()
             st.success("Directiva eliminada correctamente.")
             st.rerun()
@@ -1,11 +1,22 @@
 # modulos/promotora/grupos.py
 import streamlit as st
 from datetime import date
-import pandas as pd  # 👈 para armar dataframes de los gráficos
 
-from modulos.config.conexion import fetch_all, fetch_one, execute
-from modulos.auth.rbac import require_auth, has_role, get_user
+from modulos.config.consultas import todos, ejecutar
+from modulos.config import catalogos
+from modulos.config.resiliencia import ConsultaExcedida
+from modulos.auth.rbac import require_auth, has_role
+from modulos.auth.perfil import perfil_actual, invalidar_perfiles
 from modulos.promotora.directiva import crear_directiva_panel  # 👈 NUEVO
+from modulos.reportes.ciclos import ciclo_actual, cierres_de_grupo
+from modulos.reportes.exportar import seccion_exportar
+from modulos.reportes.motor import reporte_caja
+from modulos.reportes.cartera import (
+    cartera_en_riesgo,
+    mostrar_cartera,
+    mostrar_cartera_por_grupo,
+    total_de_grupos,
+)
 
 
 # -------------------------------------------------------
@@ -44,74 +55,9 @@ def _serializar_duis(lista: list[str]) -> str:
 def _obtener_promotora_actual() -> dict | None:
     """
     Obtiene la fila de 'promotora' correspondiente al usuario en sesión (por su DUI).
+    Se resuelve al iniciar sesión y se reutiliza mientras no se invalide.
     """
-    user = get_user()
-    if not user:
-        return None
-
-    return fetch_one(
-        """
-        SELECT Id_promotora, Nombre, DUI
-        FROM promotora
-        WHERE DUI = %s
-        LIMIT 1
-        """,
-        (user["DUI"],),
-    )
-
-
-# -------------------------------------------------------
-# Helpers para reportes (reglamento + caja + cierres)
-# -------------------------------------------------------
-def _obtener_reglamento_por_grupo(id_grupo: int) -> dict | None:
-    """
-    Copia del helper de directiva: trae el reglamento de un grupo.
-    """
-    sql = """
-    SELECT *
-    FROM reglamento_grupo
-    WHERE Id_grupo = %s
-    LIMIT 1
-    """
-    return fetch_one(sql, (id_grupo,))
-
-
-def _obtener_caja_por_rango(id_grupo: int, fecha_ini, fecha_fin):
-    """
-    Trae la caja (entradas / salidas) por reunión dentro de un rango de fechas.
-    Usamos DATE(rg.Fecha) para que el eje X del gráfico no muestre horas.
-    """
-    sql = """
-    SELECT 
-        DATE(rg.Fecha) AS Fecha,
-        cr.Total_entradas,
-        cr.Total_salidas
-    FROM caja_reunion cr
-    JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
-    WHERE cr.Id_grupo = %s
-      AND rg.Fecha BETWEEN %s AND %s
-    ORDER BY rg.Fecha
-    """
-    return fetch_all(sql, (id_grupo, fecha_ini, fecha_fin))
-
-
-def _obtener_cierres_ciclo_grupo(id_grupo: int):
-    """
-    Devuelve todos los cierres de ciclo del grupo (historial),
-    para poder ofrecer ciclos pasados en el reporte.
-    """
-    sql = """
-    SELECT 
-        Id_cierre,
-        Fecha_inicio_ciclo,
-        Fecha_fin_ciclo,
-        Fecha_cierre,
-        Total_ahorro_grupo
-    FROM cierres_ciclo
-    WHERE Id_grupo = %s
-    ORDER BY Fecha_cierre DESC, Id_cierre DESC
-    """
-    return fetch_all(sql, (id_grupo,))
+    return perfil_actual()
 
 
 # -------------------------------------------------------
@@ -127,9 +73,7 @@ def _crear_grupo(promotora: dict):
     nombre = st.text_input("Nombre del grupo")
 
     # Distritos
-    distritos = fetch_all(
-        "SELECT Id_distrito, Nombre FROM distritos ORDER BY Nombre ASC"
-    )
+    distritos = catalogos.distritos()
     opciones = {d["Nombre"]: d["Id_distrito"] for d in distritos}
     nombre_distrito = (
         st.selectbox("Distrito", list(opciones.keys())) if opciones else None
@@ -165,12 +109,8 @@ def _crear_grupo(promotora: dict):
 
         duis_final = _serializar_duis(duis_lista)
 
-        execute(
-            """
-            INSERT INTO grupos
-            (Nombre, Id_distrito, Estado, Creado_en, DUIs_promotoras, Id_promotora)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
+        ejecutar(
+            "grupo_crear",
             (
                 nombre.strip(),
                 id_distrito,
@@ -193,21 +133,7 @@ def _mis_grupos(promotora: dict):
     dui_actual = promotora["DUI"]
 
     # Solo grupos donde el DUI de la promotora aparezca en DUIs_promotoras
-    grupos = fetch_all(
-        """
-        SELECT g.Id_grupo,
-               g.Nombre,
-               d.Nombre AS Distrito,
-               g.Estado,
-               g.Creado_en,
-               g.DUIs_promotoras
-        FROM grupos g
-        JOIN distritos d ON d.Id_distrito = g.Id_distrito
-        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
-        ORDER BY g.Id_grupo ASC
-        """,
-        (dui_actual,),
-    )
+    grupos = todos("grupos_de_promotora", (dui_actual,))
 
     if not grupos:
         st.info("No tienes grupos asignados todavía.")
@@ -245,10 +171,8 @@ def _mis_grupos(promotora: dict):
         elif not confirmar:
             st.warning("Debes marcar la casilla de confirmación.")
         else:
-            execute(
-                "DELETE FROM grupos WHERE Id_grupo = %s",
-                (grupo_sel_eliminar["Id_grupo"],),
-            )
+            ejecutar("grupo_eliminar", (grupo_sel_eliminar["Id_grupo"],))
+            invalidar_perfiles()
             st.success("Grupo eliminado correctamente.")
             st.rerun()
 
@@ -291,8 +215,8 @@ def _mis_grupos(promotora: dict):
         else:
             duis_actuales.append(dui_limpio)
             duis_actuales_unicos = _parsear_duis(_serializar_duis(duis_actuales))
-            execute(
-                "UPDATE grupos SET DUIs_promotoras = %s WHERE Id_grupo = %s",
+            ejecutar(
+                "grupo_promotoras_actualizar",
                 (_serializar_duis(duis_actuales_unicos), grupo_sel_gestion["Id_grupo"]),
             )
             st.success("Promotora agregada al grupo.")
@@ -313,8 +237,8 @@ def _mis_grupos(promotora: dict):
             if not duis_restantes:
                 st.warning("El grupo debe tener al menos una promotora responsable.")
             else:
-                execute(
-                    "UPDATE grupos SET DUIs_promotoras = %s WHERE Id_grupo = %s",
+                ejecutar(
+                    "grupo_promotoras_actualizar",
                     (_serializar_duis(duis_restantes), grupo_sel_gestion["Id_grupo"]),
                 )
                 st.success("Se actualizaron las promotoras asignadas al grupo.")
@@ -330,23 +254,19 @@ def _seccion_reportes_promotora(promotora: dict):
     dui_actual = promotora["DUI"]
 
     # Grupos donde la promotora participa
-    grupos = fetch_all(
-        """
-        SELECT g.Id_grupo,
-               g.Nombre,
-               d.Nombre AS Distrito
-        FROM grupos g
-        JOIN distritos d ON d.Id_distrito = g.Id_distrito
-        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
-        ORDER BY g.Id_grupo ASC
-        """,
-        (dui_actual,),
-    )
+    grupos = todos("grupos_de_promotora", (dui_actual,))
 
     if not grupos:
         st.info("No tienes grupos asignados todavía.")
         return
 
+    with st.expander("Cartera en riesgo de mis grupos"):
+        # Las consultas corren solo si se pide (el expander cerrado igual se ejecuta)
+        if st.checkbox("Calcular cartera en riesgo", key="cartera_promotora_ver"):
+            por_grupo = cartera_en_riesgo("promotora", dui_actual, por_grupo=True)
+            mostrar_cartera(total_de_grupos(por_grupo))
+            mostrar_cartera_por_grupo(por_grupo)
+
     opciones_grupo = {
         f"{g['Id_grupo']} - {g['Nombre']} ({g['Distrito']})": g["Id_grupo"]
         for g in grupos
@@ -361,22 +281,21 @@ def _seccion_reportes_promotora(promotora: dict):
     st.markdown(f"**Grupo seleccionado:** {etiqueta}")
 
     # ==========================
-    # Selección de ciclo
+    # Selección de ciclo (desde el catálogo de ciclos compartido)
     # ==========================
-    reglamento = _obtener_reglamento_por_grupo(id_grupo_sel)
-    cierres = _obtener_cierres_ciclo_grupo(id_grupo_sel)
+    actual = ciclo_actual(id_grupo_sel)
+    cierres = cierres_de_grupo(id_grupo_sel)
 
     opciones_periodo: dict[str, tuple] = {}
 
     # Opción: ciclo vigente según reglamento (si tiene fechas)
-    if reglamento:
-        fecha_ini_reg = reglamento.get("Fecha_inicio_ciclo")
-        fecha_fin_reg = reglamento.get("Fecha_fin_ciclo")
-        if fecha_ini_reg and fecha_fin_reg:
-            label_reg = (
-                f"Ciclo vigente (reglamento): {fecha_ini_reg} → {fecha_fin_reg}"
-            )
-            opciones_periodo[label_reg] = (fecha_ini_reg, fecha_fin_reg)
+    if actual:
+        fecha_ini_reg = actual["Fecha_inicio_ciclo"]
+        fecha_fin_reg = actual["Fecha_fin_ciclo"]
+        label_reg = (
+            f"Ciclo vigente (reglamento): {fecha_ini_reg} → {fecha_fin_reg}"
+        )
+        opciones_periodo[label_reg] = (fecha_ini_reg, fecha_fin_reg)
 
     # Opciones: ciclos cerrados (historial)
     for c in cierres:
@@ -409,38 +328,24 @@ def _seccion_reportes_promotora(promotora: dict):
     # ==========================
     # Datos de caja en el rango
     # ==========================
-    datos = _obtener_caja_por_rango(id_grupo_sel, fecha_ini, fecha_fin)
-    if not datos:
+    try:
+        df = reporte_caja(id_grupo_sel, fecha_ini, fecha_fin)
+    except ConsultaExcedida as e:
+        st.warning(str(e))
+        return
+    if df.empty:
         st.info("No hay registros de caja para este grupo en el ciclo seleccionado.")
         return
 
-    fechas = [d["Fecha"] for d in datos]
-    ingresos = [float(d["Total_entradas"] or 0) for d in datos]
-    egresos = [float(d["Total_salidas"] or 0) for d in datos]
-    consolidado = [ingresos[i] - egresos[i] for i in range(len(ingresos))]
-
     # ---- Gráfico 1: Ingresos vs Egresos ----
-    df_ie = pd.DataFrame(
-        {
-            "Fecha": fechas,
-            "Ingresos": ingresos,
-            "Egresos": egresos,
-        }
-    )
-
     st.markdown("## Ingresos vs egresos por reunión")
-    st.line_chart(df_ie, x="Fecha", y=["Ingresos", "Egresos"])
-
-    # ---- Gráfico 2: Consolidado ----
-    df_cons = pd.DataFrame(
-        {
-            "Fecha": fechas,
-            "Consolidado": consolidado,
-        }
-    )
+    st.line_chart(df, x="Fecha", y=["Ingresos", "Egresos"])
 
+    # ---- Gráfico 2: Consolidado (neto de cada reunión) ----
     st.markdown("## Consolidado por reunión")
-    st.line_chart(df_cons, x="Fecha", y=["Consolidado"])
+    st.line_chart(
+        df.rename(columns={"Neto": "Consolidado"}), x="Fecha", y=["Consolidado"]
+    )
 
 
 # -------------------------------------------------------
@@ -459,7 +364,9 @@ def promotora_panel():
 
     st.title("Panel de Promotora")
 
-    tabs = st.tabs(["Crear grupo", "Mis grupos", "Crear Directiva", "Reportes"])
+    tabs = st.tabs(
+        ["Crear grupo", "Mis grupos", "Crear Directiva", "Reportes", "Exportar"]
+    )
 
     with tabs[0]:
         _crear_grupo(promotora)
@@ -473,3 +380,6 @@ def promotora_panel():
 
     with tabs[3]:
         _seccion_reportes_promotora(promotora)
+
+    with tabs[4]:
+        seccion_exportar(dui_promotora=promotora["DUI"])
@@ -0,0 +1,215 @@
+# modulos/reportes/cartera.py
+#
+# Cartera en riesgo (PAR) y antigüedad de la mora sobre pagos_prestamo.
+# Una cuota está vencida si su Fecha_programada ya pasó y lo pagado
+# (capital + interés) es menor a lo programado. Los días de mora de un
+# préstamo se cuentan desde su cuota vencida más antigua.
+import datetime as dt
+
+import streamlit as st
+
+from modulos.config.conexion import fetch_all
+from modulos.config.cache import memo_compartido, invalidar, usar_replica
+
+# Etiqueta que se invalida en cada escritura de préstamos o pagos
+ETIQUETA_CARTERA = "cartera"
+
+# Respaldo por si los pagos se guardaron desde otro servidor
+_CARTERA_TTL_SEG = 600
+
+TRAMOS = [
+    ("Riesgo_1_30", "1 a 30 días"),
+    ("Riesgo_31_60", "31 a 60 días"),
+    ("Riesgo_60_mas", "Más de 60 días"),
+]
+
+_FILTROS_ALCANCE = {
+    "grupo": "p.Id_grupo = %s",
+    "distrito": "g.Id_distrito = %s",
+    "promotora": "FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0",
+}
+
+
+def invalidar_cartera() -> None:
+    """Llamar después de crear préstamos o guardar pagos."""
+    invalidar(ETIQUETA_CARTERA)
+
+
+def _consultar_cartera(alcance: str, valor, hoy: dt.date, por_grupo: bool) -> list[dict]:
+    """
+    Una sola consulta agregada: primero saldo de capital y días de mora por
+    préstamo, luego suma por tramo de mora (total o por grupo).
+    Solo cuenta préstamos con saldo de capital pendiente; diferencias de
+    hasta 0.01 (redondeo de centavos) no cuentan como saldo ni como mora.
+    """
+    agrupar = "GROUP BY t.Id_grupo, t.Grupo ORDER BY t.Grupo" if por_grupo else ""
+    columnas_grupo = "t.Id_grupo, t.Grupo," if por_grupo else ""
+
+    sql = f"""
+    SELECT
+        {columnas_grupo}
+        COUNT(*) AS Prestamos_activos,
+        SUM(CASE WHEN t.Dias_mora > 0 THEN 1 ELSE 0 END) AS Prestamos_en_mora,
+        COALESCE(SUM(t.Saldo_capital), 0) AS Cartera,
+        COALESCE(SUM(t.Monto_vencido), 0) AS Monto_vencido,
+        COALESCE(SUM(CASE WHEN t.Dias_mora BETWEEN 1 AND 30
+                          THEN t.Saldo_capital ELSE 0 END), 0) AS Riesgo_1_30,
+        COALESCE(SUM(CASE WHEN t.Dias_mora BETWEEN 31 AND 60
+                          THEN t.Saldo_capital ELSE 0 END), 0) AS Riesgo_31_60,
+        COALESCE(SUM(CASE WHEN t.Dias_mora > 60
+                          THEN t.Saldo_capital ELSE 0 END), 0) AS Riesgo_60_mas
+    FROM (
+        SELECT
+            p.Id_prestamo,
+            p.Id_grupo,
+            g.Nombre AS Grupo,
+            p.Capital_total - COALESCE(SUM(pp.Capital_pagado), 0) AS Saldo_capital,
+            COALESCE(MAX(
+                CASE
+                    WHEN pp.Fecha_programada < %s
+                     AND pp.Capital_pagado + pp.Interes_pagado
+                         < pp.Capital_programado + pp.Interes_programado - 0.01
+                    THEN DATEDIFF(%s, pp.Fecha_programada)
+                END
+            ), 0) AS Dias_mora,
+            COALESCE(SUM(
+                CASE
+                    WHEN pp.Fecha_programada < %s
+                     AND pp.Capital_pagado + pp.Interes_pagado
+                         < pp.Capital_programado + pp.Interes_programado - 0.01
+                    THEN pp.Capital_programado + pp.Interes_programado
+                         - pp.Capital_pagado - pp.Interes_pagado
+                    ELSE 0
+                END
+            ), 0) AS Monto_vencido
+        FROM prestamos_miembro p
+        JOIN grupos g ON g.Id_grupo = p.Id_grupo
+        LEFT JOIN pagos_prestamo pp ON pp.Id_prestamo = p.Id_prestamo
+        WHERE {_FILTROS_ALCANCE[alcance]}
+        GROUP BY p.Id_prestamo, p.Id_grupo, g.Nombre, p.Capital_total
+        HAVING Saldo_capital > 0.01
+    ) t
+    {agrupar}
+    """
+    # Justo después de un pago la réplica puede no tenerlo: se lee de la primaria
+    filas = fetch_all(
+        sql,
+        (hoy, hoy, hoy, valor),
+        replica=usar_replica(ETIQUETA_CARTERA),
+        categoria="reporte",
+    )
+    return [_con_indicadores(f) for f in filas or [] if f.get("Prestamos_activos")]
+
+
+def _con_indicadores(fila: dict) -> dict:
+    """Pasa montos a float y agrega los indicadores PAR (fracción de la cartera)."""
+    r = dict(fila)
+    for clave in ["Cartera", "Monto_vencido"] + [t for t, _ in TRAMOS]:
+        r[clave] = float(r.get(clave) or 0.0)
+    r["Prestamos_activos"] = int(r.get("Prestamos_activos") or 0)
+    r["Prestamos_en_mora"] = int(r.get("Prestamos_en_mora") or 0)
+
+    cartera = r["Cartera"]
+    en_riesgo = sum(r[t] for t, _ in TRAMOS)
+    r["PAR_1"] = en_riesgo / cartera if cartera else 0.0
+    r["PAR_30"] = (r["Riesgo_31_60"] + r["Riesgo_60_mas"]) / cartera if cartera else 0.0
+    r["PAR_60"] = r["Riesgo_60_mas"] / cartera if cartera else 0.0
+    return r
+
+
+def total_de_grupos(filas: list[dict]) -> dict | None:
+    """
+    Totales a partir de las filas por grupo (resultado de por_grupo=True),
+    para no repetir la consulta cuando se muestran ambos.
+    """
+    if not filas:
+        return None
+    total = {
+        clave: sum(f[clave] for f in filas)
+        for clave in ["Prestamos_activos", "Prestamos_en_mora", "Cartera", "Monto_vencido"]
+        + [t for t, _ in TRAMOS]
+    }
+    return _con_indicadores(total)
+
+
+def cartera_en_riesgo(alcance: str, valor, por_grupo: bool = False, hoy: dt.date | None = None):
+    """
+    Antigüedad de la mora y PAR para:
+      - alcance="grupo", valor=Id_grupo
+      - alcance="promotora", valor=DUI de la promotora
+      - alcance="distrito", valor=Id_distrito
+    Devuelve un dict con los totales (o None si no hay préstamos activos);
+    con por_grupo=True devuelve una lista con una fila por grupo.
+    El resultado de hoy se comparte entre sesiones hasta el próximo pago
+    guardado; con otra fecha ('hoy') se consulta sin cache.
+    """
+    if hoy is not None and hoy != dt.date.today():
+        filas = _consultar_cartera(alcance, valor, hoy, por_grupo)
+    else:
+        # Sin la fecha en la clave (la cache compartida no se vacía sola):
+        # al cambiar de día, el TTL limita cuánto dura el cálculo de ayer
+        filas = memo_compartido(
+            f"cartera:{alcance}:{valor}:{por_grupo}",
+            (ETIQUETA_CARTERA,),
+            lambda: _consultar_cartera(alcance, valor, dt.date.today(), por_grupo),
+            ttl=_CARTERA_TTL_SEG,
+        )
+    if por_grupo:
+        return filas
+    return filas[0] if filas else None
+
+
+def mostrar_cartera(resumen: dict | None, titulo: str = "Cartera en riesgo"):
+    """Muestra los indicadores de cartera en riesgo y los tramos de mora."""
+    st.markdown(f"### {titulo}")
+    if not resumen:
+        st.info("No hay préstamos con saldo pendiente.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cartera vigente", f"${resumen['Cartera']:.2f}")
+    col2.metric("PAR > 0 días", f"{resumen['PAR_1'] * 100:.1f}%")
+    col3.metric("PAR > 30 días", f"{resumen['PAR_30'] * 100:.1f}%")
+    col4.metric("PAR > 60 días", f"{resumen['PAR_60'] * 100:.1f}%")
+
+    st.caption(
+        f"Préstamos activos: {resumen['Prestamos_activos']} — "
+        f"en mora: {resumen['Prestamos_en_mora']} — "
+        f"cuotas vencidas sin pagar: ${resumen['Monto_vencido']:.2f}"
+    )
+    st.table(
+        [
+            {
+                "Tramo de mora": nombre,
+                "Saldo de capital": f"${resumen[clave]:.2f}",
+                "% de la cartera": (
+                    f"{resumen[clave] / resumen['Cartera'] * 100:.1f}%"
+                    if resumen["Cartera"]
+                    else "0.0%"
+                ),
+            }
+            for clave, nombre in TRAMOS
+        ]
+    )
+
+
+def mostrar_cartera_por_grupo(filas: list[dict]):
+    """Tabla con el PAR de cada grupo (resultado de por_grupo=True)."""
+    if not filas:
+        return
+    st.dataframe(
+        [
+            {
+                "Grupo": f["Grupo"],
+                "Préstamos activos": f["Prestamos_activos"],
+                "En mora": f["Prestamos_en_mora"],
+                "Cartera vigente": round(f["Cartera"], 2),
+                "PAR > 0 (%)": round(f["PAR_1"] * 100, 1),
+                "PAR > 30 (%)": round(f["PAR_30"] * 100, 1),
+                "PAR > 60 (%)": round(f["PAR_60"] * 100, 1),
+            }
+            for f in filas
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
@@ -0,0 +1,99 @@
+# modulos/reportes/ciclos.py
+from modulos.config.conexion import fetch_all
+from modulos.config.cache import memo_compartido, invalidar
+
+# Etiqueta que se invalida al registrar un cierre o guardar un reglamento
+ETIQUETA_CICLOS = "ciclos"
+
+# Respaldo por si otro servidor registró cierres (las versiones son por proceso)
+_CATALOGO_TTL_SEG = 600
+
+
+def invalidar_catalogo() -> None:
+    """Llamar después de guardar/eliminar un reglamento o registrar un cierre."""
+    invalidar(ETIQUETA_CICLOS)
+
+
+def _cargar_catalogo() -> dict[int, dict]:
+    """
+    Trae en una sola consulta los ciclos de TODOS los grupos:
+    - cierres registrados en 'cierres_ciclo'
+    - ciclo actual según 'reglamento_grupo' (si tiene fechas)
+    y los agrupa por Id_grupo.
+    """
+    filas = fetch_all(
+        """
+        SELECT
+            'cierre' AS Tipo,
+            Id_grupo,
+            Id_cierre,
+            Fecha_cierre,
+            Fecha_inicio_ciclo,
+            Fecha_fin_ciclo,
+            Total_ahorro_grupo,
+            Porcion_fondo_grupo,
+            0 AS Orden
+        FROM cierres_ciclo
+        UNION ALL
+        SELECT
+            'actual' AS Tipo,
+            Id_grupo,
+            NULL,
+            NULL,
+            Fecha_inicio_ciclo,
+            Fecha_fin_ciclo,
+            NULL,
+            NULL,
+            Id_reglamento AS Orden
+        FROM reglamento_grupo
+        WHERE Fecha_inicio_ciclo IS NOT NULL
+          AND Fecha_fin_ciclo IS NOT NULL
+        """
+    )
+
+    catalogo: dict[int, dict] = {}
+    for f in filas or []:
+        entrada = catalogo.setdefault(f["Id_grupo"], {"actual": None, "cierres": []})
+        if f["Tipo"] == "actual":
+            # Igual que el LIMIT 1 de antes: nos quedamos con el primer reglamento
+            if entrada["actual"] is None or f["Orden"] < entrada["actual"]["Orden"]:
+                entrada["actual"] = f
+        else:
+            entrada["cierres"].append(f)
+
+    # Historial del más reciente al más antiguo: por fin de ciclo (como el
+    # reporte de administración), sin fecha de fin al final, y luego por cierre
+    for entrada in catalogo.values():
+        entrada["cierres"].sort(
+            key=lambda c: (
+                c["Fecha_fin_ciclo"] is not None,
+                c["Fecha_fin_ciclo"],
+                c["Fecha_cierre"],
+                c["Id_cierre"],
+            ),
+            reverse=True,
+        )
+    return catalogo
+
+
+def catalogo_ciclos() -> dict[int, dict]:
+    """
+    Catálogo de ciclos de todos los grupos, compartido entre sesiones:
+    {Id_grupo: {"actual": fila | None, "cierres": [filas]}}
+    """
+    return memo_compartido(
+        "catalogo_ciclos", (ETIQUETA_CICLOS,), _cargar_catalogo, ttl=_CATALOGO_TTL_SEG
+    )
+
+
+def ciclo_actual(id_grupo: int) -> dict | None:
+    """Ciclo vigente según el reglamento del grupo (Fecha_inicio_ciclo / Fecha_fin_ciclo)."""
+    return catalogo_ciclos().get(id_grupo, {}).get("actual")
+
+
+def cierres_de_grupo(id_grupo: int) -> list[dict]:
+    """
+    Cierres de ciclo del grupo, ordenados por
+    Fecha_fin_ciclo DESC, Fecha_cierre DESC, Id_cierre DESC.
+    """
+    return catalogo_ciclos().get(id_grupo, {}).get("cierres", [])
@@ -0,0 +1,270 @@
+# modulos/reportes/conciliacion.py
+#
+# Conciliación de caja_reunion contra las tablas de origen, para todos los
+# grupos. Para cada caja guardada se recalcula lo mismo que la pantalla de
+# Caja (modulos/directiva/caja.py):
+#   Multas                multas_miembro pagadas en la fecha de la reunión
+#   Ahorros, Otras_actividades, Retiros_ahorros
+#                         ahorros_miembros de la reunión
+#   Pagos_prestamos       pagos_prestamo (capital + interés) con esa fecha
+#   Desembolsos_prestamos prestamos_miembro con Fecha_prestamo en esa fecha
+#   Total_entradas / Total_salidas (con los otros ingresos/gastos guardados)
+#   Saldo_apertura        Saldo_cierre de la caja anterior (0 si es la primera)
+#   Saldo_cierre          apertura + entradas - salidas
+# y se informa cada campo que no coincide.
+#
+# Nada se consulta por reunión: cada lote de grupos se resuelve con cinco
+# consultas agregadas (GROUP BY) y el cruce se hace en memoria. Los lotes
+# se reparten entre procesos; cada proceso abre sus propias conexiones.
+#
+# Uso (desde la raíz del repo):
+#   python -m modulos.reportes.conciliacion --procesos 4 --salida conciliacion.csv
+#   python -m modulos.reportes.conciliacion --grupo 12
+import argparse
+import csv
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from modulos.config.conexion import fetch_all
+from modulos.directiva.recalculo_caja import ORDEN_CAJA
+
+# Tolerancia para comparar montos DECIMAL
+_TOLERANCIA = 0.01
+
+# Grupos por lote (cada lote: cinco consultas)
+_GRUPOS_POR_LOTE = 200
+
+# Campos en el orden del reporte
+CAMPOS = [
+    "Saldo_apertura",
+    "Multas",
+    "Ahorros",
+    "Otras_actividades",
+    "Pagos_prestamos",
+    "Total_entradas",
+    "Retiros_ahorros",
+    "Desembolsos_prestamos",
+    "Total_salidas",
+    "Saldo_cierre",
+]
+
+ENCABEZADO = ["Id_grupo", "Id_caja", "Id_reunion", "Fecha", "Campo", "Guardado", "Calculado", "Diferencia"]
+
+
+def _sql_cajas(marcadores: str) -> str:
+    return f"""
+    SELECT
+        cr.*,
+        rg.Fecha,
+        LAG(cr.Saldo_cierre) OVER (
+            PARTITION BY cr.Id_grupo
+            ORDER BY {ORDEN_CAJA}
+        ) AS Cierre_anterior
+    FROM caja_reunion cr
+    JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+    WHERE cr.Id_grupo IN ({marcadores})
+    ORDER BY cr.Id_grupo, {ORDEN_CAJA}
+    """
+
+
+def _sql_origen(marcadores: str) -> dict[str, str]:
+    """Sumas de origen por (grupo, fecha) o (grupo, reunión)."""
+    return {
+        "multas": f"""
+            SELECT Id_grupo, Fecha_pago AS Clave, SUM(Monto) AS Multas
+            FROM multas_miembro
+            WHERE Id_grupo IN ({marcadores}) AND Pagada = 1
+            GROUP BY Id_grupo, Fecha_pago
+        """,
+        "ahorros": f"""
+            SELECT Id_grupo, Id_reunion AS Clave,
+                   SUM(Ahorro) AS Ahorros,
+                   SUM(Otras_actividades) AS Otras_actividades,
+                   SUM(Retiros) AS Retiros_ahorros
+            FROM ahorros_miembros
+            WHERE Id_grupo IN ({marcadores})
+            GROUP BY Id_grupo, Id_reunion
+        """,
+        "pagos": f"""
+            SELECT p.Id_grupo, pp.Fecha_programada AS Clave,
+                   SUM(pp.Capital_pagado + pp.Interes_pagado) AS Pagos_prestamos
+            FROM pagos_prestamo pp
+            JOIN prestamos_miembro p ON p.Id_prestamo = pp.Id_prestamo
+            WHERE p.Id_grupo IN ({marcadores})
+            GROUP BY p.Id_grupo, pp.Fecha_programada
+        """,
+        "desembolsos": f"""
+            SELECT Id_grupo, Fecha_prestamo AS Clave, SUM(Monto) AS Desembolsos_prestamos
+            FROM prestamos_miembro
+            WHERE Id_grupo IN ({marcadores})
+            GROUP BY Id_grupo, Fecha_prestamo
+        """,
+    }
+
+
+def _clave(valor) -> str:
+    # Las fechas pueden volver como date o como texto según el motor
+    return str(valor)[:10]
+
+
+def _num(valor) -> float:
+    return float(valor or 0)
+
+
+def sumas_origen(ids_grupo: list[int], leer=None) -> dict[str, dict]:
+    """
+    Sumas de multas, ahorros, pagos y desembolsos de los grupos indicados:
+    {"multas": {(grupo, fecha): fila}, "ahorros": {(grupo, reunión): fila}, ...}.
+    'leer(sql, params)' devuelve las filas; por defecto fetch_all (se puede
+    pasar uno que use el cursor de una transacción abierta).
+    """
+    if leer is None:
+        def leer(sql, params):
+            return fetch_all(sql, params, categoria="exportacion")
+
+    marcadores = ", ".join(["%s"] * len(ids_grupo))
+    return {
+        nombre: {(f["Id_grupo"], _clave(f["Clave"])): f for f in leer(sql, tuple(ids_grupo))}
+        for nombre, sql in _sql_origen(marcadores).items()
+    }
+
+
+def componentes_caja(
+    sumas: dict, id_grupo: int, id_reunion: int, fecha, otros_ingresos=0, otros_gastos=0
+) -> dict:
+    """
+    Montos de la caja de una reunión calculados desde las tablas de origen,
+    igual que la pantalla de Caja: de Multas a Total_salidas (sin saldos).
+    """
+    vacio: dict = {}
+    fecha = _clave(fecha)
+    ahorros = sumas["ahorros"].get((id_grupo, _clave(id_reunion)), vacio)
+    calc = {
+        "Multas": _num(sumas["multas"].get((id_grupo, fecha), vacio).get("Multas")),
+        "Ahorros": _num(ahorros.get("Ahorros")),
+        "Otras_actividades": _num(ahorros.get("Otras_actividades")),
+        "Pagos_prestamos": _num(
+            sumas["pagos"].get((id_grupo, fecha), vacio).get("Pagos_prestamos")
+        ),
+        "Otros_ingresos": _num(otros_ingresos),
+        "Retiros_ahorros": _num(ahorros.get("Retiros_ahorros")),
+        "Desembolsos_prestamos": _num(
+            sumas["desembolsos"].get((id_grupo, fecha), vacio).get("Desembolsos_prestamos")
+        ),
+        "Otros_gastos": _num(otros_gastos),
+    }
+    calc["Total_entradas"] = (
+        calc["Multas"] + calc["Ahorros"] + calc["Otras_actividades"]
+        + calc["Pagos_prestamos"] + calc["Otros_ingresos"]
+    )
+    calc["Total_salidas"] = (
+        calc["Retiros_ahorros"] + calc["Desembolsos_prestamos"] + calc["Otros_gastos"]
+    )
+    return calc
+
+
+def conciliar_grupos(ids_grupo: list[int]) -> list[dict]:
+    """
+    Recalcula las cajas de los grupos indicados y devuelve una fila por
+    campo que no coincide (ver ENCABEZADO).
+    """
+    if not ids_grupo:
+        return []
+    marcadores = ", ".join(["%s"] * len(ids_grupo))
+    sumas = sumas_origen(ids_grupo)
+
+    diferencias = []
+    for caja in fetch_all(_sql_cajas(marcadores), tuple(ids_grupo), categoria="exportacion"):
+        grupo, fecha = caja["Id_grupo"], _clave(caja["Fecha"])
+        calc = componentes_caja(
+            sumas, grupo, caja["Id_reunion"], fecha, caja["Otros_ingresos"], caja["Otros_gastos"]
+        )
+        calc["Saldo_apertura"] = _num(caja["Cierre_anterior"])
+        calc["Saldo_cierre"] = calc["Saldo_apertura"] + calc["Total_entradas"] - calc["Total_salidas"]
+
+        for campo in CAMPOS:
+            guardado = _num(caja[campo])
+            if abs(guardado - calc[campo]) > _TOLERANCIA:
+                diferencias.append(
+                    {
+                        "Id_grupo": grupo,
+                        "Id_caja": caja["Id_caja"],
+                        "Id_reunion": caja["Id_reunion"],
+                        "Fecha": fecha,
+                        "Campo": campo,
+                        "Guardado": round(guardado, 2),
+                        "Calculado": round(calc[campo], 2),
+                        "Diferencia": round(guardado - calc[campo], 2),
+                    }
+                )
+    return diferencias
+
+
+def conciliar(procesos: int = 4, id_grupo: int | None = None) -> dict:
+    """
+    Concilia todos los grupos con caja (o uno solo). Los grupos se reparten
+    en lotes de _GRUPOS_POR_LOTE entre 'procesos' procesos.
+    Devuelve {"grupos", "diferencias", "segundos"}.
+    """
+    inicio = time.perf_counter()
+    if id_grupo is not None:
+        ids = [id_grupo]
+    else:
+        ids = [
+            f["Id_grupo"]
+            for f in fetch_all("SELECT DISTINCT Id_grupo FROM caja_reunion ORDER BY Id_grupo")
+        ]
+    lotes = [ids[i:i + _GRUPOS_POR_LOTE] for i in range(0, len(ids), _GRUPOS_POR_LOTE)]
+
+    if procesos <= 1 or len(lotes) <= 1:
+        resultados = map(conciliar_grupos, lotes)
+        diferencias = [d for lote in resultados for d in lote]
+    else:
+        # "spawn": un proceso hijo no debe heredar las conexiones del pool del padre
+        with ProcessPoolExecutor(
+            max_workers=procesos, mp_context=multiprocessing.get_context("spawn")
+        ) as ejecutor:
+            diferencias = [d for lote in ejecutor.map(conciliar_grupos, lotes) for d in lote]
+
+    return {
+        "grupos": len(ids),
+        "diferencias": diferencias,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Concilia caja_reunion contra multas, ahorros y préstamos."
+    )
+    parser.add_argument("--grupo", type=int, help="Limitar a un grupo")
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--salida", help="CSV de diferencias (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+
+    r = conciliar(args.procesos, id_grupo=args.grupo)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8", newline="") as f:
+            escritor = csv.DictWriter(f, fieldnames=ENCABEZADO)
+            escritor.writeheader()
+            escritor.writerows(r["diferencias"])
+    else:
+        escritor = csv.DictWriter(sys.stdout, fieldnames=ENCABEZADO)
+        escritor.writeheader()
+        escritor.writerows(r["diferencias"])
+
+    cajas = len({d["Id_caja"] for d in r["diferencias"]})
+    print(
+        f"{r['grupos']} grupo(s) en {r['segundos']:.1f} s: "
+        f"{len(r['diferencias'])} diferencia(s) en {cajas} caja(s).",
+        file=sys.stderr,
+    )
+    if r["diferencias"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
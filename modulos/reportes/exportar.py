@@ -0,0 +1,234 @@
+# modulos/reportes/exportar.py
+import argparse
+import csv
+import datetime as dt
+import io
+import os
+import sys
+import tempfile
+import time
+
+import streamlit as st
+
+from modulos.config import catalogos
+from modulos.config.conexion import fetch_all, iter_lotes
+from modulos.config.resiliencia import ConsultaExcedida
+from modulos.reportes.libros import LIBROS, consulta_libro, encabezado
+
+
+# -------------------------------------------------------
+# Escritura en streaming
+# -------------------------------------------------------
+def generar_csv(
+    clave: str,
+    id_distrito: int,
+    fecha_ini: dt.date,
+    fecha_fin: dt.date,
+    dui_promotora: str | None = None,
+    filas_por_bloque: int = 1000,
+    categoria: str = "exportacion",
+):
+    """
+    Generador que produce el CSV de un libro en bloques de texto.
+    Lee con cursor sin buffer, así que la memoria no crece con el número de filas.
+    El primer bloque lleva BOM UTF-8 para que Excel abra bien los acentos.
+    'categoria' fija el límite de tiempo: "lote" desde la línea de comandos.
+    """
+    sql, params = consulta_libro(
+        clave,
+        id_distrito=id_distrito,
+        fecha_ini=fecha_ini,
+        fecha_fin=fecha_fin,
+        dui_promotora=dui_promotora,
+    )
+
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write("\ufeff")
+    escritor.writerow(encabezado(clave))
+
+    # Las filas llegan como tuplas en el mismo orden del encabezado
+    for _, filas in iter_lotes(
+        sql, params, tamano_lote=filas_por_bloque, replica=True, categoria=categoria
+    ):
+        escritor.writerows(filas)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+
+def escribir_csv(
+    archivo, clave: str, id_distrito: int, fecha_ini, fecha_fin, dui_promotora=None,
+    categoria: str = "exportacion",
+):
+    """Escribe el CSV del libro en un archivo de texto ya abierto."""
+    for bloque in generar_csv(
+        clave, id_distrito, fecha_ini, fecha_fin, dui_promotora, categoria=categoria
+    ):
+        archivo.write(bloque)
+
+
+# -------------------------------------------------------
+# Archivos de exportación web
+# El CSV se escribe en un archivo temporal y la sesión guarda solo su ruta:
+# se descarga desde el archivo y se borra al hacer clic en "Descargar".
+# Los que nadie descargó (sesión cerrada) se borran al generar otro.
+# -------------------------------------------------------
+_PREFIJO_EXPORTACION = "gapc_exportacion_"
+_EXPORTACION_TTL_SEG = 3600
+
+
+def _descartar_exportacion() -> None:
+    """Borra el archivo de la sesión (si hay) y olvida su ruta."""
+    archivo = st.session_state.pop("exp_archivo", None)
+    if archivo:
+        try:
+            os.remove(archivo[0])
+        except OSError:
+            pass
+
+
+def _limpiar_exportaciones_viejas() -> None:
+    """Borra los archivos de exportación de más de _EXPORTACION_TTL_SEG."""
+    carpeta = tempfile.gettempdir()
+    limite = time.time() - _EXPORTACION_TTL_SEG
+    for nombre in os.listdir(carpeta):
+        if not nombre.startswith(_PREFIJO_EXPORTACION):
+            continue
+        ruta = os.path.join(carpeta, nombre)
+        try:
+            if os.path.getmtime(ruta) < limite:
+                os.remove(ruta)
+        except OSError:
+            # Otro proceso lo borró primero
+            pass
+
+
+# -------------------------------------------------------
+# Sección de exportación (admin y promotora)
+# -------------------------------------------------------
+def _distritos_disponibles(dui_promotora: str | None):
+    if not dui_promotora:
+        return catalogos.distritos()
+    return fetch_all(
+        """
+        SELECT DISTINCT d.Id_distrito, d.Nombre
+        FROM distritos d
+        JOIN grupos g ON g.Id_distrito = d.Id_distrito
+        WHERE FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0
+        ORDER BY d.Nombre ASC
+        """,
+        (dui_promotora,),
+    )
+
+
+def seccion_exportar(dui_promotora: str | None = None):
+    """
+    Exporta caja, ahorros, préstamos, pagos y multas de un distrito
+    en un rango de fechas. Si se indica dui_promotora, solo incluye
+    los grupos de esa promotora.
+    """
+    st.subheader("Exportar libros para auditoría")
+
+    distritos = _distritos_disponibles(dui_promotora)
+    if not distritos:
+        st.info("No hay distritos con grupos para exportar.")
+        return
+
+    mapa_distritos = {f'{d["Nombre"]} (Id {d["Id_distrito"]})': d for d in distritos}
+    etiqueta_dist = st.selectbox(
+        "Distrito",
+        list(mapa_distritos.keys()),
+        key="exp_distrito",
+    )
+    dist_sel = mapa_distritos[etiqueta_dist]
+
+    mapa_libros = {libro["titulo"]: clave for clave, libro in LIBROS.items()}
+    etiqueta_libro = st.selectbox(
+        "Libro a exportar",
+        list(mapa_libros.keys()),
+        key="exp_libro",
+    )
+    clave = mapa_libros[etiqueta_libro]
+
+    hoy = dt.date.today()
+    col1, col2 = st.columns(2)
+    with col1:
+        fecha_ini = st.date_input("Desde", value=hoy.replace(month=1, day=1), key="exp_desde")
+    with col2:
+        fecha_fin = st.date_input("Hasta", value=hoy, key="exp_hasta")
+
+    if fecha_ini > fecha_fin:
+        st.warning("La fecha inicial no puede ser mayor que la final.")
+        return
+
+    if st.button("Generar archivo CSV", key="exp_generar"):
+        _descartar_exportacion()
+        _limpiar_exportaciones_viejas()
+
+        excedida = None
+        with st.spinner("Generando archivo..."):
+            descriptor, ruta = tempfile.mkstemp(prefix=_PREFIJO_EXPORTACION, suffix=".csv")
+            try:
+                with open(descriptor, "w", encoding="utf-8", newline="") as f:
+                    escribir_csv(
+                        f, clave, dist_sel["Id_distrito"], fecha_ini, fecha_fin, dui_promotora
+                    )
+            except ConsultaExcedida as e:
+                excedida = e
+            except BaseException:
+                os.remove(ruta)
+                raise
+
+        if excedida:
+            # Archivo a medias: se descarta
+            os.remove(ruta)
+            st.warning(str(excedida))
+            return
+
+        nombre = f"{clave}_distrito{dist_sel['Id_distrito']}_{fecha_ini}_{fecha_fin}.csv"
+        st.session_state["exp_archivo"] = (ruta, nombre)
+
+    archivo = st.session_state.get("exp_archivo")
+    if archivo and os.path.exists(archivo[0]):
+        ruta, nombre = archivo
+        st.caption(f"Archivo listo: {nombre} ({os.path.getsize(ruta) / 1024:.1f} KB)")
+        with open(ruta, "rb") as f:
+            st.download_button(
+                "Descargar CSV (se abre en Excel)",
+                data=f,
+                file_name=nombre,
+                mime="text/csv",
+                key="exp_descargar",
+                on_click=_descartar_exportacion,
+            )
+
+
+# -------------------------------------------------------
+# Línea de comandos (exportaciones nacionales sin pasar por el navegador)
+#   python -m modulos.reportes.exportar caja --distrito 3 \
+#       --desde 2025-01-01 --hasta 2025-12-31 --salida caja.csv
+# -------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta un libro de un distrito a CSV.")
+    parser.add_argument("libro", choices=list(LIBROS.keys()))
+    parser.add_argument("--distrito", type=int, required=True)
+    parser.add_argument("--desde", type=dt.date.fromisoformat, required=True)
+    parser.add_argument("--hasta", type=dt.date.fromisoformat, required=True)
+    parser.add_argument("--promotora", help="DUI de promotora para limitar a sus grupos")
+    parser.add_argument("--salida", help="Archivo destino (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+
+    # Sin el límite de las exportaciones web (ver GAPC_LIMITE_LOTE_SEG)
+    datos = (args.libro, args.distrito, args.desde, args.hasta, args.promotora)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8", newline="") as f:
+            escribir_csv(f, *datos, categoria="lote")
+    else:
+        escribir_csv(sys.stdout, *datos, categoria="lote")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# modulos/reportes/libros.py
+#
+# Definición de los "libros" (tablas de movimientos) que se pueden exportar.
+# Cada libro indica de dónde salen las filas, cuál es su fecha y su Id,
+# y siempre llega hasta 'grupos g' para poder filtrar por distrito.
+
+LIBROS = {
+    "caja": {
+        "titulo": "Caja por reunión (caja_reunion)",
+        "id": "cr.Id_caja",
+        "fecha": "rg.Fecha",
+        "columnas": [
+            "cr.Id_caja",
+            "g.Id_distrito",
+            "cr.Id_grupo",
+            "g.Nombre AS Grupo",
+            "cr.Id_reunion",
+            "rg.Fecha",
+            "rg.Numero_reunion",
+            "cr.Saldo_apertura",
+            "cr.Multas",
+            "cr.Ahorros",
+            "cr.Otras_actividades",
+            "cr.Pagos_prestamos",
+            "cr.Otros_ingresos",
+            "cr.Total_entradas",
+            "cr.Retiros_ahorros",
+            "cr.Desembolsos_prestamos",
+            "cr.Otros_gastos",
+            "cr.Total_salidas",
+            "cr.Saldo_cierre",
+        ],
+        "origen": """
+            FROM caja_reunion cr
+            JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+            JOIN grupos g ON g.Id_grupo = cr.Id_grupo
+        """,
+    },
+    "ahorros": {
+        "titulo": "Ahorros por miembro (ahorros_miembros)",
+        "id": "a.Id_ahorro",
+        "fecha": "rg.Fecha",
+        "columnas": [
+            "a.Id_ahorro",
+            "g.Id_distrito",
+            "a.Id_grupo",
+            "g.Nombre AS Grupo",
+            "a.Id_reunion",
+            "rg.Fecha",
+            "a.Id_miembro",
+            "m.Nombre AS Miembro",
+            "a.Saldo_inicial",
+            "a.Ahorro",
+            "a.Otras_actividades",
+            "a.Retiros",
+            "a.Saldo_final",
+        ],
+        "origen": """
+            FROM ahorros_miembros a
+            JOIN reuniones_grupo rg ON rg.Id_reunion = a.Id_reunion
+            JOIN miembros m ON m.Id_miembro = a.Id_miembro
+            JOIN grupos g ON g.Id_grupo = a.Id_grupo
+        """,
+    },
+    "prestamos": {
+        "titulo": "Préstamos (prestamos_miembro)",
+        "id": "p.Id_prestamo",
+        "fecha": "p.Fecha_prestamo",
+        "columnas": [
+            "p.Id_prestamo",
+            "g.Id_distrito",
+            "p.Id_grupo",
+            "g.Nombre AS Grupo",
+            "p.Id_miembro",
+            "m.Nombre AS Miembro",
+            "p.Fecha_prestamo",
+            "p.Fecha_primer_pago",
+            "p.Meses_plazo",
+            "p.Monto",
+            "p.Tasa_mensual",
+            "p.Capital_total",
+            "p.Interes_total",
+            "p.Total_pagar",
+        ],
+        "origen": """
+            FROM prestamos_miembro p
+            JOIN miembros m ON m.Id_miembro = p.Id_miembro
+            JOIN grupos g ON g.Id_grupo = p.Id_grupo
+        """,
+    },
+    "pagos": {
+        "titulo": "Pagos de préstamos (pagos_prestamo)",
+        "id": "pp.Id_pago",
+        "fecha": "pp.Fecha_programada",
+        "columnas": [
+            "pp.Id_pago",
+            "g.Id_distrito",
+            "p.Id_grupo",
+            "g.Nombre AS Grupo",
+            "pp.Id_prestamo",
+            "p.Id_miembro",
+            "pp.Numero_cuota",
+            "pp.Fecha_programada",
+            "pp.Capital_programado",
+            "pp.Interes_programado",
+            "pp.Capital_pagado",
+            "pp.Interes_pagado",
+        ],
+        "origen": """
+            FROM pagos_prestamo pp
+            JOIN prestamos_miembro p ON p.Id_prestamo = pp.Id_prestamo
+            JOIN grupos g ON g.Id_grupo = p.Id_grupo
+        """,
+    },
+    "multas": {
+        "titulo": "Multas (multas_miembro)",
+        "id": "mm.Id_multa",
+        "fecha": "mm.Fecha_multa",
+        "columnas": [
+            "mm.Id_multa",
+            "g.Id_distrito",
+            "mm.Id_grupo",
+            "g.Nombre AS Grupo",
+            "mm.Id_miembro",
+            "m.Nombre AS Miembro",
+            "mm.Fecha_multa",
+            "mm.Monto",
+            "mm.Pagada",
+            "mm.Fecha_pago",
+        ],
+        "origen": """
+            FROM multas_miembro mm
+            JOIN miembros m ON m.Id_miembro = mm.Id_miembro
+            JOIN grupos g ON g.Id_grupo = mm.Id_grupo
+        """,
+    },
+    "asistencia": {
+        "titulo": "Asistencia (asistencia_miembro)",
+        "id": "am.Id_asistencia",
+        "fecha": "rg.Fecha",
+        "columnas": [
+            "am.Id_asistencia",
+            "g.Id_distrito",
+            "rg.Id_grupo",
+            "g.Nombre AS Grupo",
+            "am.Id_reunion",
+            "rg.Fecha",
+            "am.Id_miembro",
+            "am.Presente",
+        ],
+        "origen": """
+            FROM asistencia_miembro am
+            JOIN reuniones_grupo rg ON rg.Id_reunion = am.Id_reunion
+            JOIN grupos g ON g.Id_grupo = rg.Id_grupo
+        """,
+    },
+    "cierres": {
+        "titulo": "Cierres de ciclo (cierres_ciclo)",
+        "id": "cc.Id_cierre",
+        "fecha": "cc.Fecha_cierre",
+        "columnas": [
+            "cc.Id_cierre",
+            "g.Id_distrito",
+            "cc.Id_grupo",
+            "g.Nombre AS Grupo",
+            "cc.Fecha_cierre",
+            "cc.Fecha_inicio_ciclo",
+            "cc.Fecha_fin_ciclo",
+            "cc.Total_ahorro_grupo",
+            "cc.Total_fondo_grupo",
+            "cc.Porcion_fondo_grupo",
+        ],
+        "origen": """
+            FROM cierres_ciclo cc
+            JOIN grupos g ON g.Id_grupo = cc.Id_grupo
+        """,
+    },
+}
+
+
+def encabezado(clave: str) -> list[str]:
+    """Nombres de columna del libro, tal como vienen en cada fila."""
+    nombres = []
+    for col in LIBROS[clave]["columnas"]:
+        if " AS " in col:
+            nombres.append(col.split(" AS ")[-1].strip())
+        else:
+            nombres.append(col.split(".")[-1].strip())
+    return nombres
+
+
+def consulta_libro(
+    clave: str,
+    id_distrito: int | None = None,
+    fecha_ini=None,
+    fecha_fin=None,
+    dui_promotora: str | None = None,
+    desde_id: int | None = None,
+) -> tuple[str, tuple]:
+    """
+    Arma el SELECT de un libro con los filtros indicados.
+    - id_distrito: solo grupos de ese distrito
+    - fecha_ini / fecha_fin: rango (inclusive) sobre la fecha del libro
+    - dui_promotora: solo grupos donde aparece ese DUI en DUIs_promotoras
+    - desde_id: solo filas con Id mayor (para extracciones incrementales)
+    Las filas salen ordenadas por Id.
+    """
+    libro = LIBROS[clave]
+    condiciones = []
+    params: list = []
+
+    if id_distrito is not None:
+        condiciones.append("g.Id_distrito = %s")
+        params.append(id_distrito)
+    if fecha_ini is not None and fecha_fin is not None:
+        condiciones.append(f"{libro['fecha']} BETWEEN %s AND %s")
+        params.extend([fecha_ini, fecha_fin])
+    if dui_promotora:
+        condiciones.append("FIND_IN_SET(%s, REPLACE(g.DUIs_promotoras, ' ', '')) > 0")
+        params.append(dui_promotora)
+    if desde_id is not None:
+        condiciones.append(f"{libro['id']} > %s")
+        params.append(desde_id)
+
+    where = ("WHERE " + "\n  AND ".join(condiciones)) if condiciones else ""
+    sql = f"""
+    SELECT
+        {", ".join(libro["columnas"])}
+    {libro["origen"]}
+    {where}
+    ORDER BY {libro["id"]}
+    """
+    return sql, tuple(params)
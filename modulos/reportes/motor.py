@@ -0,0 +1,115 @@
+# modulos/reportes/motor.py
+#
+# pandas se importa dentro de serie_caja: importar este módulo (por ejemplo
+# para invalidar_caja) no carga pandas hasta que se arma un reporte.
+from typing import TYPE_CHECKING
+
+from modulos.config.conexion import fetch_columnas
+from modulos.config.cache import memo_sesion, invalidar, usar_replica
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_INGRESOS = [
+    "Multas",
+    "Ahorros",
+    "Otras_actividades",
+    "Pagos_prestamos",
+    "Otros_ingresos",
+]
+_EGRESOS = ["Retiros_ahorros", "Desembolsos_prestamos", "Otros_gastos"]
+
+_COLUMNAS_RESULTADO = [
+    "Id_grupo",
+    "Fecha",
+    "Numero_reunion",
+    "Reunión",
+    "Ingresos",
+    "Egresos",
+    "Neto",
+    "Saldo_acumulado",
+    "Saldo_cierre",
+]
+
+# Respaldo por si la caja se guardó desde otro servidor
+_REPORTE_TTL_SEG = 300
+
+
+def etiqueta_caja(id_grupo: int) -> str:
+    return f"caja:{id_grupo}"
+
+
+def invalidar_caja(id_grupo: int) -> None:
+    """Llamar después de guardar la caja de una reunión del grupo."""
+    invalidar(etiqueta_caja(id_grupo))
+
+
+def serie_caja(
+    ids_grupo: list[int], fecha_ini, fecha_fin, replica: bool = True
+) -> "pd.DataFrame":
+    """
+    Carga la caja de uno o varios grupos en el rango [fecha_ini, fecha_fin]
+    directo a un DataFrame (una fila por reunión) y calcula por columnas:
+      - Ingresos / Egresos: suma de los rubros de entrada / salida
+      - Neto: ingresos - egresos de la reunión
+      - Saldo_acumulado: suma acumulada del neto dentro de cada grupo
+    También trae Saldo_cierre tal como quedó guardado y una etiqueta
+    "Reunión" para el eje X. replica=False lee de la primaria.
+    """
+    import pandas as pd
+
+    marcas = ", ".join(["%s"] * len(ids_grupo))
+    columnas = fetch_columnas(
+        f"""
+        SELECT
+            cr.Id_grupo,
+            DATE(rg.Fecha) AS Fecha,
+            rg.Numero_reunion,
+            cr.Multas,
+            cr.Ahorros,
+            cr.Otras_actividades,
+            cr.Pagos_prestamos,
+            cr.Otros_ingresos,
+            cr.Retiros_ahorros,
+            cr.Desembolsos_prestamos,
+            cr.Otros_gastos,
+            cr.Saldo_cierre
+        FROM caja_reunion cr
+        JOIN reuniones_grupo rg ON rg.Id_reunion = cr.Id_reunion
+        WHERE cr.Id_grupo IN ({marcas})
+          AND rg.Fecha BETWEEN %s AND %s
+        ORDER BY cr.Id_grupo, rg.Fecha, rg.Numero_reunion
+        """,
+        (*ids_grupo, fecha_ini, fecha_fin),
+        numericas=tuple(_INGRESOS + _EGRESOS + ["Saldo_cierre"]),
+        replica=replica,
+        categoria="reporte",
+    )
+    if not columnas:
+        return pd.DataFrame(columns=_COLUMNAS_RESULTADO)
+
+    df = pd.DataFrame(columnas)
+    df["Ingresos"] = df[_INGRESOS].sum(axis=1)
+    df["Egresos"] = df[_EGRESOS].sum(axis=1)
+    df["Neto"] = df["Ingresos"] - df["Egresos"]
+    df["Saldo_acumulado"] = df.groupby("Id_grupo")["Neto"].cumsum()
+    df["Reunión"] = (
+        df["Fecha"].astype(str) + " (Reu " + df["Numero_reunion"].astype(str) + ")"
+    )
+    return df[_COLUMNAS_RESULTADO]
+
+
+def reporte_caja(id_grupo: int, fecha_ini, fecha_fin) -> "pd.DataFrame":
+    """
+    Serie de caja de un grupo para un ciclo, cacheada en la sesión para que
+    los tres gráficos y los reruns de la página usen el mismo resultado.
+    Se invalida al guardar la caja del grupo; justo después de guardar se
+    lee de la primaria, porque la réplica puede no tener aún la caja nueva.
+    """
+    etiqueta = etiqueta_caja(id_grupo)
+    return memo_sesion(
+        f"reporte_caja:{id_grupo}:{fecha_ini}:{fecha_fin}",
+        (etiqueta,),
+        lambda: serie_caja([id_grupo], fecha_ini, fecha_fin, replica=usar_replica(etiqueta)),
+        ttl=_REPORTE_TTL_SEG,
+    )
@@ -0,0 +1,205 @@
+# modulos/reportes/snapshot.py
+#
+# Copia incremental de los libros a archivos Parquet particionados, para que
+# los análisis pesados lean archivos locales y no la base de datos en línea:
+#
+#   <destino>/<libro>/distrito=<Id_distrito>/mes=<AAAA-MM>/part-<id_ini>-<id_fin>.parquet
+#
+# Uso:
+#   python -m modulos.reportes.snapshot --destino ./snapshots
+#   python -m modulos.reportes.snapshot --destino ./snapshots --libros caja pagos --completo
+import argparse
+import datetime as dt
+import json
+import os
+import shutil
+import time
+from decimal import Decimal
+
+from modulos.config.conexion import iter_rows
+from modulos.reportes.libros import LIBROS, consulta_libro, encabezado
+
+_ARCHIVO_ESTADO = "_estado.json"
+
+# Tipo de cada columna según su nombre (ver _tipo_columna); el resto son montos
+_COLUMNAS_TEXTO = {"Grupo", "Miembro"}
+_COLUMNAS_ENTERAS = {"Meses_plazo", "Pagada", "Presente", "Cuotas_vencidas"}
+
+
+def _leer_estado(destino: str) -> dict:
+    ruta = os.path.join(destino, _ARCHIVO_ESTADO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _guardar_estado(destino: str, estado: dict) -> None:
+    """Escribe el estado de forma atómica (archivo temporal + rename)."""
+    ruta = os.path.join(destino, _ARCHIVO_ESTADO)
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=2, sort_keys=True)
+    os.replace(tmp, ruta)
+
+
+def _mes(fecha) -> str:
+    if fecha is None:
+        return "sin_fecha"
+    return f"{fecha.year:04d}-{fecha.month:02d}"
+
+
+def _tipo_columna(nombre: str) -> str:
+    if nombre in _COLUMNAS_TEXTO:
+        return "texto"
+    if nombre.startswith(("Id_", "Numero_")) or nombre in _COLUMNAS_ENTERAS:
+        return "entero"
+    if nombre.startswith("Fecha"):
+        return "fecha"
+    return "monto"
+
+
+def _esquema(clave: str):
+    """
+    Esquema fijo del libro. Sin él, pyarrow deduce los tipos de cada archivo
+    por separado y una columna que en un lote viene toda en NULL (Fecha_pago,
+    por ejemplo) queda como 'null': los archivos del mismo libro ya no se
+    pueden leer juntos como un dataset.
+    """
+    import pyarrow as pa
+
+    tipos = {"texto": pa.string(), "entero": pa.int64(), "fecha": pa.date32(), "monto": pa.float64()}
+    return pa.schema([(nombre, tipos[_tipo_columna(nombre)]) for nombre in encabezado(clave)])
+
+
+def _valor(tipo: str, valor):
+    # DECIMAL de MySQL -> float; DATETIME -> fecha (el esquema usa date32)
+    if valor is None:
+        return None
+    if tipo == "monto" and isinstance(valor, Decimal):
+        return float(valor)
+    if tipo == "fecha" and isinstance(valor, dt.datetime):
+        return valor.date()
+    return valor
+
+
+def _tabla(esquema, filas: list[dict]):
+    import pyarrow as pa
+
+    tipos = [(campo.name, _tipo_columna(campo.name)) for campo in esquema]
+    return pa.Table.from_pylist(
+        [{nombre: _valor(tipo, f.get(nombre)) for nombre, tipo in tipos} for f in filas],
+        schema=esquema,
+    )
+
+
+def _escribir_lote(destino: str, clave: str, filas: list[dict]) -> None:
+    """Reparte el lote por distrito y mes y escribe un archivo Parquet por partición."""
+    import pyarrow.parquet as pq
+
+    libro = LIBROS[clave]
+    col_id = libro["id"].split(".")[-1]
+    col_fecha = libro["fecha"].split(".")[-1]
+    esquema = _esquema(clave)
+
+    particiones: dict[tuple, list[dict]] = {}
+    for fila in filas:
+        llave = (fila["Id_distrito"], _mes(fila[col_fecha]))
+        particiones.setdefault(llave, []).append(fila)
+
+    for (id_distrito, mes), filas_p in particiones.items():
+        carpeta = os.path.join(destino, clave, f"distrito={id_distrito}", f"mes={mes}")
+        os.makedirs(carpeta, exist_ok=True)
+        nombre = f"part-{filas_p[0][col_id]}-{filas_p[-1][col_id]}.parquet"
+        pq.write_table(_tabla(esquema, filas_p), os.path.join(carpeta, nombre))
+
+
+def extraer_libro(destino: str, clave: str, desde_id: int, filas_por_lote: int = 50_000):
+    """
+    Copia las filas del libro con Id mayor que desde_id.
+    Devuelve (filas_copiadas, nuevo_max_id). El estado se guarda después de
+    cada lote, así que si el proceso se corta solo se repite el último lote.
+    """
+    libro = LIBROS[clave]
+    col_id = libro["id"].split(".")[-1]
+    sql, params = consulta_libro(clave, desde_id=desde_id)
+
+    total = 0
+    max_id = desde_id
+    lote: list[dict] = []
+
+    def _cerrar_lote():
+        nonlocal total, max_id
+        _escribir_lote(destino, clave, lote)
+        total += len(lote)
+        max_id = lote[-1][col_id]
+        estado = _leer_estado(destino)
+        estado[clave] = max_id
+        _guardar_estado(destino, estado)
+        lote.clear()
+
+    for fila in iter_rows(sql, params, tamano_lote=5000, replica=True, categoria="lote"):
+        lote.append(fila)
+        if len(lote) >= filas_por_lote:
+            _cerrar_lote()
+    if lote:
+        _cerrar_lote()
+
+    return total, max_id
+
+
+def ejecutar_snapshot(destino: str, libros: list[str] | None = None, completo: bool = False):
+    """
+    Corre la copia incremental de los libros indicados (por defecto, todos).
+    Solo se copian filas nuevas (Id mayor al último copiado); las filas que se
+    modifican después de copiadas no se actualizan. Con completo=True se borra
+    la copia del libro y se vuelve a extraer desde cero.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "Para generar snapshots Parquet se necesita 'pyarrow' "
+            "(está en requirements.txt: pip install -r requirements.txt)."
+        )
+
+    os.makedirs(destino, exist_ok=True)
+    resumen = {}
+
+    for clave in libros or list(LIBROS.keys()):
+        if completo:
+            shutil.rmtree(os.path.join(destino, clave), ignore_errors=True)
+            estado = _leer_estado(destino)
+            estado.pop(clave, None)
+            _guardar_estado(destino, estado)
+
+        desde_id = _leer_estado(destino).get(clave, 0)
+        inicio = time.perf_counter()
+        filas, max_id = extraer_libro(destino, clave, desde_id)
+        resumen[clave] = {
+            "filas": filas,
+            "max_id": max_id,
+            "segundos": round(time.perf_counter() - inicio, 2),
+        }
+
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Copia incremental de los libros a Parquet por distrito y mes."
+    )
+    parser.add_argument("--destino", required=True, help="Carpeta de los snapshots")
+    parser.add_argument("--libros", nargs="*", choices=list(LIBROS.keys()))
+    parser.add_argument(
+        "--completo", action="store_true", help="Borra y vuelve a extraer desde cero"
+    )
+    args = parser.parse_args(argv)
+
+    resumen = ejecutar_snapshot(args.destino, args.libros, args.completo)
+    for clave, r in resumen.items():
+        print(f"{clave}: {r['filas']} filas nuevas (max Id {r['max_id']}) en {r['segundos']} s")
+
+
+if __name__ == "__main__":
+    main()
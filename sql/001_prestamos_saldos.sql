@@ -0,0 +1,35 @@
+-- sql/001_prestamos_saldos.sql
+-- Saldos desnormalizados por préstamo. Se mantienen al guardar pagos
+-- (modulos/directiva/saldos.py) y se verifican con:
+--   python -m modulos.directiva.saldos --corregir
+
+ALTER TABLE prestamos_miembro
+    ADD COLUMN Saldo_pendiente DECIMAL(12,2) NOT NULL DEFAULT 0,
+    ADD COLUMN Cuotas_vencidas INT NOT NULL DEFAULT 0,
+    ADD COLUMN Ultimo_pago DATE NULL;
+
+CREATE INDEX idx_prestamos_grupo_saldo
+    ON prestamos_miembro (Id_grupo, Saldo_pendiente);
+
+-- Carga inicial desde pagos_prestamo
+UPDATE prestamos_miembro
+SET
+    Saldo_pendiente = Total_pagar - COALESCE((
+        SELECT SUM(pp.Capital_pagado + pp.Interes_pagado)
+        FROM pagos_prestamo pp
+        WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+    ), 0),
+    Cuotas_vencidas = (
+        SELECT COUNT(*)
+        FROM pagos_prestamo pp
+        WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+          AND pp.Fecha_programada < CURDATE()
+          AND pp.Capital_pagado + pp.Interes_pagado
+              < pp.Capital_programado + pp.Interes_programado - 0.01
+    ),
+    Ultimo_pago = (
+        SELECT MAX(pp.Fecha_programada)
+        FROM pagos_prestamo pp
+        WHERE pp.Id_prestamo = prestamos_miembro.Id_prestamo
+          AND pp.Capital_pagado + pp.Interes_pagado > 0
+    );
@@ -0,0 +1,201 @@
+-- sql/esquema_sqlite.sql
+-- Esquema de la base MySQL traducido a SQLite, para desarrollo local y
+-- pruebas de carga (GAPC_DB_BACKEND=sqlite). DECIMAL -> REAL y
+-- AUTO_INCREMENT -> INTEGER PRIMARY KEY. Incluye sql/001_prestamos_saldos.sql.
+
+CREATE TABLE IF NOT EXISTS rol (
+    Id_rol        INTEGER PRIMARY KEY,
+    `Tipo de rol` TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Usuario (
+    Id_usuario INTEGER PRIMARY KEY,
+    Nombre     TEXT NOT NULL,
+    DUI        TEXT NOT NULL,
+    Contraseña TEXT NOT NULL,
+    Id_rol     INTEGER NOT NULL REFERENCES rol (Id_rol)
+);
+CREATE INDEX IF NOT EXISTS idx_usuario_dui ON Usuario (DUI);
+
+CREATE TABLE IF NOT EXISTS distritos (
+    Id_distrito INTEGER PRIMARY KEY,
+    Nombre      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS promotora (
+    Id_promotora INTEGER PRIMARY KEY,
+    Nombre       TEXT NOT NULL,
+    DUI          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_promotora_dui ON promotora (DUI);
+
+CREATE TABLE IF NOT EXISTS grupos (
+    Id_grupo        INTEGER PRIMARY KEY,
+    Nombre          TEXT NOT NULL,
+    Id_distrito     INTEGER NOT NULL REFERENCES distritos (Id_distrito),
+    Estado          TEXT,
+    Creado_en       DATE,
+    DUIs_promotoras TEXT,
+    Id_promotora    INTEGER REFERENCES promotora (Id_promotora)
+);
+CREATE INDEX IF NOT EXISTS idx_grupos_distrito ON grupos (Id_distrito);
+
+CREATE TABLE IF NOT EXISTS directiva (
+    Id_directiva INTEGER PRIMARY KEY,
+    Nombre       TEXT NOT NULL,
+    DUI          TEXT NOT NULL,
+    Id_grupo     INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Creado_en    DATE
+);
+CREATE INDEX IF NOT EXISTS idx_directiva_dui ON directiva (DUI);
+
+CREATE TABLE IF NOT EXISTS reglamento_grupo (
+    Id_reglamento        INTEGER PRIMARY KEY,
+    Id_grupo             INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Nombre_comunidad     TEXT,
+    Fecha_formacion      DATE,
+    Reunion_dia          TEXT,
+    Reunion_hora         TEXT,
+    Reunion_lugar        TEXT,
+    Reunion_frecuencia   TEXT,
+    Monto_multa          REAL,
+    Ahorro_minimo        REAL,
+    Condiciones_prestamo TEXT,
+    Fecha_inicio_ciclo   DATE,
+    Fecha_fin_ciclo      DATE,
+    Meta_social          TEXT,
+    Interes_por_10       REAL,
+    Prestamo_maximo      REAL,
+    Plazo_maximo_meses   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_reglamento_grupo ON reglamento_grupo (Id_grupo);
+
+CREATE TABLE IF NOT EXISTS miembros (
+    Id_miembro INTEGER PRIMARY KEY,
+    Id_grupo   INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Nombre     TEXT NOT NULL,
+    DUI        TEXT,
+    Cargo      TEXT,
+    Sexo       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_miembros_grupo ON miembros (Id_grupo);
+
+CREATE TABLE IF NOT EXISTS reuniones_grupo (
+    Id_reunion     INTEGER PRIMARY KEY,
+    Id_grupo       INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Fecha          DATE NOT NULL,
+    Numero_reunion INTEGER,
+    Tema           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reuniones_grupo_fecha ON reuniones_grupo (Id_grupo, Fecha);
+
+CREATE TABLE IF NOT EXISTS asistencia_miembro (
+    Id_asistencia INTEGER PRIMARY KEY,
+    Id_reunion    INTEGER NOT NULL REFERENCES reuniones_grupo (Id_reunion),
+    Id_miembro    INTEGER NOT NULL REFERENCES miembros (Id_miembro),
+    Presente      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_asistencia_reunion ON asistencia_miembro (Id_reunion, Id_miembro);
+
+CREATE TABLE IF NOT EXISTS multas_miembro (
+    Id_multa    INTEGER PRIMARY KEY,
+    Id_grupo    INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Id_miembro  INTEGER NOT NULL REFERENCES miembros (Id_miembro),
+    Fecha_multa DATE,
+    Monto       REAL NOT NULL DEFAULT 0,
+    Pagada      INTEGER NOT NULL DEFAULT 0,
+    Fecha_pago  DATE
+);
+CREATE INDEX IF NOT EXISTS idx_multas_grupo ON multas_miembro (Id_grupo, Pagada);
+
+CREATE TABLE IF NOT EXISTS ahorros_miembros (
+    Id_ahorro         INTEGER PRIMARY KEY,
+    Id_grupo          INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Id_reunion        INTEGER NOT NULL REFERENCES reuniones_grupo (Id_reunion),
+    Id_miembro        INTEGER NOT NULL REFERENCES miembros (Id_miembro),
+    Saldo_inicial     REAL NOT NULL DEFAULT 0,
+    Ahorro            REAL NOT NULL DEFAULT 0,
+    Otras_actividades REAL NOT NULL DEFAULT 0,
+    Retiros           REAL NOT NULL DEFAULT 0,
+    Saldo_final       REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_ahorros_grupo_reunion ON ahorros_miembros (Id_grupo, Id_reunion);
+CREATE INDEX IF NOT EXISTS idx_ahorros_miembro ON ahorros_miembros (Id_miembro);
+
+CREATE TABLE IF NOT EXISTS caja_reunion (
+    Id_caja               INTEGER PRIMARY KEY,
+    Id_grupo              INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Id_reunion            INTEGER NOT NULL REFERENCES reuniones_grupo (Id_reunion),
+    Saldo_apertura        REAL NOT NULL DEFAULT 0,
+    Multas                REAL NOT NULL DEFAULT 0,
+    Ahorros               REAL NOT NULL DEFAULT 0,
+    Otras_actividades     REAL NOT NULL DEFAULT 0,
+    Pagos_prestamos       REAL NOT NULL DEFAULT 0,
+    Otros_ingresos        REAL NOT NULL DEFAULT 0,
+    Total_entradas        REAL NOT NULL DEFAULT 0,
+    Retiros_ahorros       REAL NOT NULL DEFAULT 0,
+    Desembolsos_prestamos REAL NOT NULL DEFAULT 0,
+    Otros_gastos          REAL NOT NULL DEFAULT 0,
+    Total_salidas         REAL NOT NULL DEFAULT 0,
+    Saldo_cierre          REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_caja_grupo_reunion ON caja_reunion (Id_grupo, Id_reunion);
+
+CREATE TABLE IF NOT EXISTS prestamos_miembro (
+    Id_prestamo       INTEGER PRIMARY KEY,
+    Id_grupo          INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Id_miembro        INTEGER NOT NULL REFERENCES miembros (Id_miembro),
+    Fecha_prestamo    DATE NOT NULL,
+    Fecha_primer_pago DATE,
+    Meses_plazo       INTEGER NOT NULL,
+    Monto             REAL NOT NULL,
+    Tasa_mensual      REAL NOT NULL,
+    Capital_total     REAL NOT NULL,
+    Interes_total     REAL NOT NULL,
+    Total_pagar       REAL NOT NULL,
+    Saldo_pendiente   REAL NOT NULL DEFAULT 0,
+    Cuotas_vencidas   INTEGER NOT NULL DEFAULT 0,
+    Ultimo_pago       DATE
+);
+CREATE INDEX IF NOT EXISTS idx_prestamos_grupo_saldo ON prestamos_miembro (Id_grupo, Saldo_pendiente);
+CREATE INDEX IF NOT EXISTS idx_prestamos_miembro ON prestamos_miembro (Id_miembro);
+
+CREATE TABLE IF NOT EXISTS pagos_prestamo (
+    Id_pago            INTEGER PRIMARY KEY,
+    Id_prestamo        INTEGER NOT NULL REFERENCES prestamos_miembro (Id_prestamo),
+    Numero_cuota       INTEGER NOT NULL,
+    Fecha_programada   DATE NOT NULL,
+    Capital_programado REAL NOT NULL DEFAULT 0,
+    Interes_programado REAL NOT NULL DEFAULT 0,
+    Capital_pagado     REAL NOT NULL DEFAULT 0,
+    Interes_pagado     REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_pagos_prestamo ON pagos_prestamo (Id_prestamo, Numero_cuota);
+
+CREATE TABLE IF NOT EXISTS cierres_ciclo (
+    Id_cierre           INTEGER PRIMARY KEY,
+    Id_grupo            INTEGER NOT NULL REFERENCES grupos (Id_grupo),
+    Fecha_cierre        DATE NOT NULL,
+    Fecha_inicio_ciclo  DATE,
+    Fecha_fin_ciclo     DATE,
+    Total_ahorro_grupo  REAL NOT NULL DEFAULT 0,
+    Total_fondo_grupo   REAL NOT NULL DEFAULT 0,
+    Porcion_fondo_grupo REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_cierres_grupo ON cierres_ciclo (Id_grupo);
+
+CREATE TABLE IF NOT EXISTS cierres_ciclo_miembros (
+    Id_cierre_miembro     INTEGER PRIMARY KEY,
+    Id_cierre             INTEGER NOT NULL REFERENCES cierres_ciclo (Id_cierre),
+    Id_miembro            INTEGER NOT NULL REFERENCES miembros (Id_miembro),
+    Total_ahorrado_ciclo  REAL NOT NULL DEFAULT 0,
+    Total_correspondiente REAL NOT NULL DEFAULT 0,
+    Retiro_cierre         REAL NOT NULL DEFAULT 0,
+    Saldo_siguiente_ciclo REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_cierres_miembros ON cierres_ciclo_miembros (Id_cierre);
+
+INSERT OR IGNORE INTO rol (Id_rol, `Tipo de rol`) VALUES
+    (1, 'ADMINISTRADOR'),
+    (2, 'PROMOTORA'),
+    (3, 'DIRECTIVA');